@@ -0,0 +1,67 @@
+"""
+Response Classes
+JSON responses encoded with orjson, and streaming responses that leave the request body to the endpoint or clean up after themselves
+"""
+from typing import Any, Callable, Mapping, Optional
+
+import orjson
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.background import BackgroundTask
+from starlette.types import Receive, Scope, Send
+
+
+class OrjsonResponse(JSONResponse):
+    """
+    JSON response encoded with orjson
+    
+    Several times faster than json.dumps on large bodies such as batch
+    results that echo long input texts.
+    """
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+class DuplexStreamingResponse(StreamingResponse):
+    """
+    Streaming response that may start while the request body is still being read
+    
+    StreamingResponse listens for the client disconnecting by reading the
+    request's receive channel, which would swallow body chunks an endpoint
+    is still consuming. This class only sends; the endpoint that reads the
+    body is responsible for noticing the disconnect.
+    """
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+class ClosingStreamingResponse(StreamingResponse):
+    """
+    Streaming response that runs a callback once it is over, however it ended
+    
+    The finally block of a body generator only runs once the body is being
+    iterated, so a client that disconnects before the first chunk would leave
+    whatever the endpoint reserved for the stream held. on_close runs after
+    the response was sent, failed or was abandoned.
+    """
+    
+    def __init__(
+        self,
+        content: Any,
+        on_close: Callable[[], None],
+        status_code: int = 200,
+        headers: Optional[Mapping[str, str]] = None,
+        media_type: Optional[str] = None,
+        background: Optional[BackgroundTask] = None
+    ):
+        super().__init__(content, status_code, headers, media_type, background)
+        self.on_close = on_close
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            self.on_close()
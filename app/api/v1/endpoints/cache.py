@@ -0,0 +1,41 @@
+"""
+Summary Cache Endpoints
+"""
+from fastapi import APIRouter, status
+from app.models.schemas import CacheStatsResponse, NearDuplicateStatsResponse
+from app.services.cache import summary_cache
+from app.services.dedup import near_duplicate_index
+from app.core.config import settings
+
+router = APIRouter(prefix="/cache", tags=["Cache"])
+
+
+@router.get(
+    "/stats",
+    response_model=CacheStatsResponse,
+    summary="สถิติของ cache",
+    description="จำนวน hit/miss และขนาดของ summary cache และ near-duplicate index สำหรับปรับขนาด cache"
+)
+async def cache_stats() -> CacheStatsResponse:
+    """
+    สถิติของ summary cache
+    """
+    return CacheStatsResponse(
+        enabled=settings.SUMMARY_CACHE_ENABLED,
+        **summary_cache.stats(),
+        near_duplicates=NearDuplicateStatsResponse(enabled=settings.DEDUP_ENABLED, **near_duplicate_index.stats())
+    )
+
+
+@router.delete(
+    "/",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="ล้าง cache",
+    description="ลบผลสรุปทั้งหมดที่เก็บไว้ใน cache และ near-duplicate index"
+)
+async def clear_cache():
+    """
+    ล้าง summary cache และ near-duplicate index ทั้งหมด
+    """
+    summary_cache.clear()
+    near_duplicate_index.clear()
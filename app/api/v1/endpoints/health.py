@@ -1,9 +1,12 @@
 """
 Health Check Endpoints
 """
-from fastapi import APIRouter
-from app.models.schemas import HealthResponse
+from fastapi import APIRouter, Response, status
+from app.models.schemas import HealthResponse, ModelStatus, ReadinessResponse
 from app.services.summarizer import summarizer_service
+from app.services.model_registry import model_registry
+from app.services.routing import model_router
+from app.services.warmup import startup_warmup
 from app.core.config import settings
 
 router = APIRouter(tags=["Health"])
@@ -23,14 +26,51 @@ async def health_check() -> HealthResponse:
         - status: สถานะของ API
         - model_loaded: สถานะการโหลดโมเดล
         - version: เวอร์ชันของ API
+        - models: สถานะของแต่ละโมเดล (unloaded/loading/ready) พร้อมภาษา ขนาด input และต้นทุน
     """
     return HealthResponse(
         status="healthy",
         model_loaded=summarizer_service.is_loaded,
-        version=settings.APP_VERSION
+        version=settings.APP_VERSION,
+        models=[
+            ModelStatus(
+                **status,
+                languages=list(spec.languages),
+                max_input_tokens=spec.max_input_tokens,
+                cost=spec.cost
+            )
+            for status in model_registry.status(summarizer_service.model_names)
+            for spec in [model_router.spec(status["name"])]
+        ]
     )
 
 
+@router.get(
+    "/ready",
+    response_model=ReadinessResponse,
+    responses={
+        503: {"model": ReadinessResponse, "description": "Warming Up / Warm-up Failed / Shutting Down"}
+    },
+    summary="ตรวจสอบความพร้อมรับ traffic",
+    description="ตอบ 200 เมื่อโหลดและ warm-up โมเดลเสร็จแล้วเท่านั้น (สำหรับ load balancer)"
+)
+async def readiness_check(response: Response) -> ReadinessResponse:
+    """
+    ตรวจสอบว่าพร้อมรับ traffic หรือยัง
+    
+    /health บอกว่า process ยังทำงานอยู่ ส่วน /ready ตอบ 503 ระหว่าง warm-up,
+    เมื่อ warm-up ล้มเหลว และระหว่าง shutdown
+    
+    Returns:
+        - ready: พร้อมรับ traffic หรือไม่
+        - state: สถานะของ warm-up (warming_up/ready/failed/stopping)
+        - steps: เวลาที่ใช้ในแต่ละขั้นตอนของ warm-up
+    """
+    if not startup_warmup.ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return ReadinessResponse(**startup_warmup.status())
+
+
 @router.get(
     "/",
     summary="Root endpoint",
@@ -0,0 +1,121 @@
+"""
+Background Job Endpoints
+"""
+from fastapi import APIRouter, HTTPException, Query, status
+from app.models.schemas import SummarizeRequest, JobResponse, JobResultsPage, BatchItemResult, ErrorResponse
+from app.api.v1.endpoints.summarize import build_response
+from app.services.jobs import job_manager
+from app.core.config import settings
+import asyncio
+from typing import Optional
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"])
+
+
+def _items(rows: list[dict]) -> list[BatchItemResult]:
+    """Convert stored job results into API items"""
+    return [
+        BatchItemResult(
+            index=row["index"],
+            result=build_response(row["text"], row["result"]) if row["result"] is not None else None,
+            error=row["error"]
+        )
+        for row in rows
+    ]
+
+
+async def _job_response(job: dict) -> JobResponse:
+    """Build the status response of a stored job"""
+    finished = job["completed"] + job["failed"]
+    results = await asyncio.to_thread(job_manager.store.results, job["id"], 0, settings.JOBS_RESULTS_PAGE_SIZE)
+    return JobResponse(
+        job_id=job["id"],
+        status=job["status"],
+        total=job["total"],
+        completed=job["completed"],
+        failed=job["failed"],
+        progress=round(finished / job["total"], 4) if job["total"] else 1.0,
+        created_at=job["created"],
+        updated_at=job["updated"],
+        error=job["error"],
+        results=_items(results)
+    )
+
+
+@router.post(
+    "/",
+    response_model=JobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    responses={
+        400: {"model": ErrorResponse, "description": "Bad Request"}
+    },
+    summary="สร้างงานสรุปข้อความแบบ background",
+    description="รับข้อความหลายรายการและคืนรหัสงานทันที งานจะถูกประมวลผลเป็นชุดๆ ใน background"
+)
+async def create_job(requests: list[SummarizeRequest]) -> JobResponse:
+    """
+    สร้างงานสรุปข้อความจำนวนมาก
+    
+    ใช้ `GET /jobs/{job_id}` เพื่อดูความคืบหน้า และ `GET /jobs/{job_id}/results` เพื่อดึงผลลัพธ์ทีละหน้า
+    """
+    if not requests:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="A job needs at least one item")
+    if len(requests) > settings.JOBS_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"A job can hold at most {settings.JOBS_MAX_ITEMS} items"
+        )
+    
+    job_id = await job_manager.submit([req.model_dump() for req in requests])
+    return await _job_response(await asyncio.to_thread(job_manager.store.get, job_id))
+
+
+@router.get(
+    "/{job_id}",
+    response_model=JobResponse,
+    responses={
+        404: {"model": ErrorResponse, "description": "Job Not Found"}
+    },
+    summary="สถานะของงาน",
+    description="ความคืบหน้าของงานและผลลัพธ์ที่เสร็จแล้วหน้าแรก"
+)
+async def get_job(job_id: str) -> JobResponse:
+    """
+    ดูสถานะและความคืบหน้าของงาน
+    """
+    job = await asyncio.to_thread(job_manager.store.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Job {job_id} not found")
+    return await _job_response(job)
+
+
+@router.get(
+    "/{job_id}/results",
+    response_model=JobResultsPage,
+    responses={
+        404: {"model": ErrorResponse, "description": "Job Not Found"}
+    },
+    summary="ผลลัพธ์ของงาน",
+    description="ผลลัพธ์ที่เสร็จแล้วเรียงตามลำดับ แบ่งหน้าด้วย offset/limit"
+)
+async def get_job_results(
+    job_id: str,
+    offset: int = Query(default=0, ge=0, description="ตำแหน่งเริ่มต้น"),
+    limit: Optional[int] = Query(default=None, ge=1, description="จำนวนรายการต่อหน้า (สูงสุด JOBS_RESULTS_PAGE_SIZE)")
+) -> JobResultsPage:
+    """
+    ดึงผลลัพธ์ของงานทีละหน้า
+    """
+    if await asyncio.to_thread(job_manager.store.get, job_id) is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Job {job_id} not found")
+    
+    limit = min(limit or settings.JOBS_RESULTS_PAGE_SIZE, settings.JOBS_RESULTS_PAGE_SIZE)
+    # Fetch one extra row to know whether another page exists
+    rows = await asyncio.to_thread(job_manager.store.results, job_id, offset, limit + 1)
+    return JobResultsPage(
+        job_id=job_id,
+        offset=offset,
+        limit=limit,
+        items=_items(rows[:limit]),
+        next_offset=offset + limit if len(rows) > limit else None
+    )
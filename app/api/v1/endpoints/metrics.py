@@ -0,0 +1,24 @@
+"""
+Metrics Endpoint
+"""
+from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import PlainTextResponse
+from app.services.metrics import metrics
+from app.core.config import settings
+
+router = APIRouter(tags=["Metrics"])
+
+
+@router.get(
+    "/metrics",
+    response_class=PlainTextResponse,
+    summary="Prometheus metrics",
+    description="เวลาของแต่ละขั้นตอนการสรุป จำนวน token ขนาดคิว และสถิติ cache ในรูปแบบ Prometheus"
+)
+async def get_metrics() -> PlainTextResponse:
+    """
+    Metrics ในรูปแบบ Prometheus text exposition
+    """
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Metrics are disabled")
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
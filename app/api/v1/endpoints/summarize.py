@@ -1,57 +1,154 @@
 """
 Summarization Endpoints
 """
-from fastapi import APIRouter, HTTPException, status
-from app.models.schemas import SummarizeRequest, SummarizeResponse, ErrorResponse
-from app.services.summarizer import summarizer_service
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from app.api.responses import ClosingStreamingResponse, DuplexStreamingResponse, OrjsonResponse
+from app.core.config import settings
+from app.models.schemas import (
+    SummarizeRequest,
+    SummarizeResponse,
+    PartialSummarizeResponse,
+    BatchItemResult,
+    PartialBatchItemResult,
+    ErrorResponse
+)
+from app.services.batcher import batch_scheduler
+from app.services.executor import inference_executor, InferenceQueueFullError, InferenceTimeoutError
+from app.services.admission import admission_controller
+from app.services.bulk import bulk_summarizer
+from app.services.routing import model_router
+from app.services.metrics import STAGE_SECONDS
+import asyncio
 import logging
+import orjson
+import threading
+from typing import Optional, Union
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/summarize", tags=["Summarization"])
+# orjson encodes the (possibly large) summarize responses several times faster than json
+router = APIRouter(prefix="/summarize", tags=["Summarization"], default_response_class=OrjsonResponse)
+
+
+def build_response(text: str, result: dict) -> SummarizeResponse:
+    """Build the API response from a service result"""
+    with STAGE_SECONDS.time(stage="response", language=result["language"]):
+        # Calculate compression ratio
+        original_length = len(text)
+        summary_length = len(result["summary"])
+        compression_ratio = round(1 - (summary_length / original_length), 2)
+        
+        return SummarizeResponse(
+            original_text=text,
+            summary=result["summary"],
+            original_length=original_length,
+            summary_length=summary_length,
+            compression_ratio=compression_ratio,
+            language=result["language"],
+            model=result.get("model"),
+            input_tokens=result.get("input_tokens"),
+            output_tokens=result.get("output_tokens"),
+            truncated=result.get("truncated"),
+            pruned_sentences=result.get("pruned_sentences"),
+            pruned_tokens=result.get("pruned_tokens"),
+            duplicate_score=result.get("duplicate_score"),
+            chunks=result.get("chunks"),
+            levels=result.get("levels"),
+            profile=result.get("profile")
+        )
+
+
+def response_fields(
+    include_original: bool = Query(
+        default=True,
+        description="ส่ง original_text กลับมาด้วยหรือไม่ (false ลดขนาด response สำหรับข้อความยาว)"
+    ),
+    fields: Optional[str] = Query(
+        default=None,
+        description="ฟิลด์ของผลสรุปที่ต้องการ คั่นด้วย comma เช่น summary,language (ว่าง = ทุกฟิลด์)"
+    )
+) -> Optional[set[str]]:
+    """
+    Response fields selected by the include_original and fields query parameters
+    
+    Returns:
+        Names of the SummarizeResponse fields to send, or None for all of them
+    
+    Raises:
+        HTTPException: 400 if fields names an unknown field
+    """
+    selected = None
+    if fields:
+        selected = {name.strip() for name in fields.split(",") if name.strip()}
+        unknown = selected - SummarizeResponse.model_fields.keys()
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown response fields: {', '.join(sorted(unknown))}; "
+                       f"expected any of {', '.join(SummarizeResponse.model_fields)}"
+            )
+    if not include_original:
+        selected = (selected if selected is not None else set(SummarizeResponse.model_fields)) - {"original_text"}
+    return selected
 
 
 @router.post(
     "/",
-    response_model=SummarizeResponse,
+    # Full by default; include_original=false / fields=... leave fields out
+    response_model=Union[SummarizeResponse, PartialSummarizeResponse],
     responses={
         400: {"model": ErrorResponse, "description": "Bad Request"},
-        500: {"model": ErrorResponse, "description": "Internal Server Error"}
+        429: {"model": ErrorResponse, "description": "Too Many Requests Waiting"},
+        500: {"model": ErrorResponse, "description": "Internal Server Error"},
+        503: {"model": ErrorResponse, "description": "Inference Queue Full / At Capacity"},
+        504: {"model": ErrorResponse, "description": "Inference Timeout"}
     },
     summary="สรุปข้อความ",
     description="รับข้อความและสรุปด้วย AI Model"
 )
-async def summarize_text(request: SummarizeRequest) -> SummarizeResponse:
+async def summarize_text(
+    request: SummarizeRequest,
+    fields: Optional[set[str]] = Depends(response_fields)
+) -> OrjsonResponse:
     """
     สรุปข้อความด้วย AI
     
     - **text**: ข้อความที่ต้องการสรุป
     - **max_length**: ความยาวสูงสุดของข้อความสรุป (default: 150)
     - **min_length**: ความยาวต่ำสุดของข้อความสรุป (default: 30)
+    - **long_document**: สรุปข้อความยาวแบบ map-reduce แทนการตัดทิ้ง
+    - **profile**: fast (greedy), balanced, quality (ค่าเดิมของโมเดล) หรือ assisted (ใช้ draft model ช่วย)
+    - **tier**: ระดับบริการสำหรับเลือกโมเดลตาม MODEL_ROUTES (เช่น fast ใช้โมเดลเล็ก, quality ใช้โมเดลใหญ่)
+    - **include_original** / **fields** (query): ตัด original_text หรือเลือกเฉพาะบางฟิลด์ของ response
     """
     try:
-        # Summarize the text
-        result = summarizer_service.summarize(
+        # Summarize the text (queued into a micro-batch per language)
+        result = await batch_scheduler.summarize(
             text=request.text,
             max_length=request.max_length,
             min_length=request.min_length,
-            language=request.language
+            language=request.language,
+            long_document=request.long_document,
+            profile=request.profile,
+            tier=request.tier
         )
         
-        # Calculate compression ratio
-        original_length = len(request.text)
-        summary_length = len(result["summary"])
-        compression_ratio = round(1 - (summary_length / original_length), 2)
+        # Returning the response directly skips FastAPI's second validation pass
+        return OrjsonResponse(build_response(request.text, result).model_dump(include=fields))
         
-        return SummarizeResponse(
-            original_text=request.text,
-            summary=result["summary"],
-            original_length=original_length,
-            summary_length=summary_length,
-            compression_ratio=compression_ratio,
-            language=result["language"]
+    except InferenceQueueFullError as e:
+        logger.warning(f"Rejecting request: {e}")
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)}
+        )
+    except InferenceTimeoutError as e:
+        logger.error(f"Inference timeout: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail=str(e)
         )
-        
     except Exception as e:
         logger.error(f"Error summarizing text: {e}")
         raise HTTPException(
@@ -60,43 +157,255 @@ async def summarize_text(request: SummarizeRequest) -> SummarizeResponse:
         )
 
 
+def _sse_event(event: str, data: dict) -> bytes:
+    """Format one Server-Sent Event (orjson, like the other responses of this module)"""
+    return b"event: " + event.encode() + b"\ndata: " + orjson.dumps(data) + b"\n\n"
+
+
+class _StreamSlot:
+    """
+    Inference executor slot and admission budget held by one streaming request
+    
+    Taken before the response starts, so a full queue or budget still answers
+    429/503. Both go back once: when the generation finishes (its thread may
+    outlive the client until it next checks the stop event), or when the
+    response ends without a generation having started, e.g. when the client
+    disconnects before the body is read.
+    """
+    
+    def __init__(self, charged: int):
+        inference_executor.reserve()
+        self.charged = charged
+        self.generation: Optional[asyncio.Future] = None
+        self._held = True
+    
+    def hand_to(self, generation: asyncio.Future):
+        """Let a generation hold the slot until it finishes"""
+        self.generation = generation
+        generation.add_done_callback(
+            lambda done: self.release(completed=not done.cancelled() and done.exception() is None)
+        )
+    
+    def release(self, completed: bool = False):
+        """Give the slot and budget back (only the first call counts)"""
+        if self._held:
+            self._held = False
+            inference_executor.release()
+            admission_controller.release(self.charged, completed=completed)
+    
+    def close(self):
+        """Response over - give the slot back unless a generation still holds it"""
+        if self.generation is None:
+            self.release()
+
+
 @router.post(
-    "/batch",
-    response_model=list[SummarizeResponse],
-    summary="สรุปข้อความหลายรายการ",
-    description="รับข้อความหลายรายการและสรุปทั้งหมด"
+    "/stream",
+    response_class=ClosingStreamingResponse,
+    responses={
+        200: {"content": {"text/event-stream": {}}, "description": "Server-Sent Events"},
+        429: {"model": ErrorResponse, "description": "Too Many Requests Waiting"},
+        503: {"model": ErrorResponse, "description": "Inference Queue Full / At Capacity"}
+    },
+    summary="สรุปข้อความแบบ streaming",
+    description="ส่งข้อความสรุปทีละส่วนผ่าน Server-Sent Events ระหว่างที่โมเดลกำลังสร้างข้อความ"
 )
-async def summarize_batch(requests: list[SummarizeRequest]) -> list[SummarizeResponse]:
+async def summarize_stream(request: SummarizeRequest) -> ClosingStreamingResponse:
     """
-    สรุปข้อความหลายรายการพร้อมกัน
+    สรุปข้อความแบบ streaming (Server-Sent Events)
+    
+    - **event: token** - ข้อความสรุปส่วนใหม่ `{"text": "..."}`
+    - **event: done** - ผลลัพธ์สุดท้ายพร้อมความยาว จำนวน token อัตราการบีบอัด และภาษา
+    - **event: error** - เกิดข้อผิดพลาดระหว่างสรุป `{"detail": "..."}`
+    
+    Streaming ใช้ greedy decoding เสมอ จึงไม่ใช้ค่า profile
     """
-    results = []
-    for req in requests:
+    cost = admission_controller.estimate(request.text, request.language, request.max_length)
+    try:
+        charged = await admission_controller.acquire(cost)
+        try:
+            slot = _StreamSlot(charged)
+        except InferenceQueueFullError:
+            admission_controller.release(charged, completed=False)
+            raise
+    except InferenceQueueFullError as e:
+        logger.warning(f"Rejecting request: {e}")
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)}
+        )
+    
+    async def events():
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        stop_event = threading.Event()
+        
+        def on_text(piece: str):
+            loop.call_soon_threadsafe(queue.put_nowait, piece)
+        
         try:
-            result = summarizer_service.summarize(
-                text=req.text,
-                max_length=req.max_length,
-                min_length=req.min_length,
-                language=req.language
+            language = request.language
+            if language is None:
+                language = await batch_scheduler.detect_language(request.text)
+            
+            model = model_router.route(
+                language, admission_controller.input_tokens(request.text, language), request.tier
             )
+            generation = asyncio.ensure_future(inference_executor.stream(
+                request.text,
+                request.max_length,
+                request.min_length,
+                language,
+                on_text,
+                stop_event,
+                model
+            ))
+            slot.hand_to(generation)
+            generation.add_done_callback(lambda _: loop.call_soon_threadsafe(queue.put_nowait, None))
             
-            original_length = len(req.text)
-            summary_length = len(result["summary"])
-            compression_ratio = round(1 - (summary_length / original_length), 2)
+            # Same limit as InferenceExecutor.wait, but never across a yield to the client
+            deadline = loop.time() + settings.INFERENCE_TIMEOUT_S
+            while True:
+                try:
+                    async with asyncio.timeout_at(deadline):
+                        piece = await queue.get()
+                except TimeoutError:
+                    raise InferenceTimeoutError(f"Inference did not finish within {settings.INFERENCE_TIMEOUT_S}s") from None
+                if piece is None:
+                    break
+                yield _sse_event("token", {"text": piece})
             
-            results.append(SummarizeResponse(
-                original_text=req.text,
-                summary=result["summary"],
-                original_length=original_length,
-                summary_length=summary_length,
-                compression_ratio=compression_ratio,
-                language=result["language"]
-            ))
+            final = build_response(request.text, generation.result())
+            yield _sse_event("done", final.model_dump(exclude={"original_text"}))
+        
+        except asyncio.CancelledError:
+            # Client went away - stop generating tokens nobody will read
+            stop_event.set()
+            raise
+        except InferenceTimeoutError as e:
+            logger.error(f"Inference timeout: {e}")
+            yield _sse_event("error", {"detail": str(e)})
         except Exception as e:
-            logger.error(f"Error in batch summarization: {e}")
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Error summarizing text: {str(e)}"
-            )
+            logger.error(f"Error streaming summary: {e}")
+            yield _sse_event("error", {"detail": f"Error summarizing text: {str(e)}"})
+        finally:
+            # Slot and budget go back when the generation thread has actually stopped (see _StreamSlot)
+            stop_event.set()
+    
+    return ClosingStreamingResponse(
+        events(),
+        on_close=slot.close,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.post(
+    "/batch",
+    response_model=Union[list[BatchItemResult], list[PartialBatchItemResult]],
+    responses={
+        400: {"model": ErrorResponse, "description": "Unknown Response Field"},
+        429: {"model": ErrorResponse, "description": "Too Many Requests Waiting"},
+        503: {"model": ErrorResponse, "description": "Inference Queue Full / At Capacity"}
+    },
+    summary="สรุปข้อความหลายรายการ",
+    description="รับข้อความหลายรายการและสรุปทั้งหมด (จัดกลุ่มตามภาษาและความยาว)"
+)
+async def summarize_batch(
+    requests: list[SummarizeRequest],
+    fields: Optional[set[str]] = Depends(response_fields)
+) -> OrjsonResponse:
+    """
+    สรุปข้อความหลายรายการพร้อมกัน
+    
+    ผลลัพธ์เรียงตามลำดับเดิม รายการที่ล้มเหลวจะมี error แทน result
+    ใช้ include_original=false หรือ fields เพื่อลดขนาด response ของ batch ใหญ่
+    """
+    try:
+        outputs = await batch_scheduler.summarize_batch([
+            {
+                "text": req.text,
+                "max_length": req.max_length,
+                "min_length": req.min_length,
+                "language": req.language,
+                "long_document": req.long_document,
+                "profile": req.profile,
+                "tier": req.tier
+            }
+            for req in requests
+        ])
+    except InferenceQueueFullError as e:
+        logger.warning(f"Rejecting batch of {len(requests)}: {e}")
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)}
+        )
+    
+    results = []
+    for index, (req, output) in enumerate(zip(requests, outputs)):
+        if isinstance(output, Exception):
+            logger.error(f"Error in batch summarization (item {index}): {output}")
+            results.append({"index": index, "result": None, "error": f"Error summarizing text: {str(output)}"})
+        else:
+            results.append({
+                "index": index,
+                "result": build_response(req.text, output).model_dump(include=fields),
+                "error": None
+            })
+    
+    return OrjsonResponse(results)
+
+
+@router.post(
+    "/bulk",
+    response_class=DuplexStreamingResponse,
+    responses={
+        200: {"content": {"application/x-ndjson": {}}, "description": "One JSON result per line, in completion order"},
+        400: {"model": ErrorResponse, "description": "Unknown Response Field"}
+    },
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/x-ndjson": {"schema": {"$ref": "#/components/schemas/SummarizeRequest"}}},
+            "description": "SummarizeRequest หนึ่งรายการต่อบรรทัด (ใส่ id เพื่อระบุรายการได้)"
+        }
+    },
+    summary="สรุปข้อความจำนวนมากแบบ NDJSON streaming",
+    description="อัปโหลด NDJSON แบบ streaming และรับผลเป็น NDJSON ตามลำดับที่สรุปเสร็จ"
+)
+async def summarize_bulk(
+    request: Request,
+    fields: Optional[set[str]] = Depends(response_fields)
+) -> DuplexStreamingResponse:
+    """
+    สรุปข้อความจำนวนมากจาก request body แบบ NDJSON
+    
+    เริ่มสรุปตั้งแต่บรรทัดแรกที่อัปโหลดมาถึง และส่งผลกลับทีละบรรทัดตามลำดับที่เสร็จ
+    (ไม่ใช่ลำดับใน request) ใช้หน่วยความจำคงที่ไม่ว่า upload จะมีกี่รายการ
+    client ควรอ่าน response ไปพร้อมกับอัปโหลด เพราะ server จะหยุดอ่าน upload
+    เมื่อมีรายการค้างครบ BULK_MAX_IN_FLIGHT
+    
+    - **request line**: `{"id": "a1", "text": "...", "max_length": 150, ...}`
+    - **result line**: `{"id": "a1", "index": 0, "result": {...}}` หรือ `{"id": "a1", "index": 0, "error": "..."}`
+    - **last line**: `{"done": true, "items": 100, "failed": 2}`
+    """
+    async def wait_for_disconnect():
+        while (await request.receive())["type"] != "http.disconnect":
+            pass
+    
+    async def lines():
+        items = failed = 0
+        async for outcome in bulk_summarizer.run(request.stream(), wait_for_disconnect):
+            items += 1
+            line = {"id": outcome.id, "index": outcome.index}
+            if outcome.error is not None:
+                failed += 1
+                line["error"] = outcome.error
+            else:
+                line["result"] = build_response(outcome.text, outcome.result).model_dump(include=fields)
+            yield orjson.dumps(line) + b"\n"
+        yield orjson.dumps({"done": True, "items": items, "failed": failed}) + b"\n"
     
-    return results
+    return DuplexStreamingResponse(lines(), media_type="application/x-ndjson")
@@ -2,10 +2,12 @@
 API v1 Router - รวม routes ทั้งหมด
 """
 from fastapi import APIRouter
-from app.api.v1.endpoints import summarize, health
+from app.api.v1.endpoints import summarize, health, cache, jobs
 
 api_router = APIRouter()
 
 # Include routers
 api_router.include_router(health.router)
 api_router.include_router(summarize.router)
+api_router.include_router(cache.router)
+api_router.include_router(jobs.router)
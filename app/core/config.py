@@ -23,6 +23,121 @@ class Settings(BaseSettings):
     MAX_INPUT_LENGTH: int = 1024
     MAX_OUTPUT_LENGTH: int = 150
     MIN_OUTPUT_LENGTH: int = 30
+    MODEL_BACKEND: str = "pytorch"  # "pytorch", "quantized" or "onnx"
+    MODEL_BACKENDS: dict[str, str] = {}  # per-model override, e.g. {"facebook/bart-large-cnn": "onnx"}
+    ONNX_CACHE_DIR: str = ".onnx_cache"
+    MODEL_WARMUP_LANGUAGES: list[str] = []  # e.g. ["en"] to load at startup
+    MODEL_IDLE_TIMEOUT_S: float = 0  # 0 keeps models loaded forever
+    MODEL_EVICTION_INTERVAL_S: float = 60
+    
+    # Model routing (more models per language; MODEL_NAME_EN / MODEL_NAME_TH stay each language's default)
+    MODELS: dict[str, dict] = {}  # e.g. {"sshleifer/distilbart-cnn-12-6": {"languages": ["en"], "max_input_tokens": 1024, "cost": 0.4}}
+    MODEL_ROUTES: list[dict] = []  # first match wins, e.g. [{"model": "...", "languages": ["en"], "tiers": ["fast"], "max_input_tokens": 512}]
+    MODEL_TIERS: list[str] = ["fast", "standard", "quality"]
+    MODEL_DEFAULT_TIER: str = "standard"  # tier of requests that do not ask for one
+    
+    # Startup warm-up (/ready answers 503 until the MODEL_WARMUP_LANGUAGES models are loaded and warmed)
+    WARMUP_INPUT_TOKENS: list[int] = [64, 256, 1024]  # one warm-up generation per input length, [] only loads
+    WARMUP_MAX_LENGTH: int = 32  # summary length of warm-up generations
+    TORCH_NUM_THREADS: int = 0  # intra-op threads per inference worker, 0 = its share of the cores (torch's default with one worker)
+    TORCH_INTEROP_THREADS: int = 0  # 0 keeps torch's default
+    
+    # Generation profiles (generate() arguments applied on top of each model's generation config)
+    GENERATION_PROFILE: str = "quality"  # used when a request does not pick one
+    GENERATION_PROFILES: dict[str, dict] = {
+        "fast": {"num_beams": 1, "no_repeat_ngram_size": 3},
+        "balanced": {"num_beams": 2, "no_repeat_ngram_size": 3, "early_stopping": True},
+        "quality": {},  # the model's own settings (4 beams for bart-large-cnn)
+        "assisted": {"num_beams": 1, "no_repeat_ngram_size": 3, "assistant": True}
+    }
+    # main model -> draft model sharing its tokenizer, e.g. {"facebook/bart-large-cnn": "sshleifer/distilbart-cnn-6-6"}
+    ASSISTANT_MODELS: dict[str, str] = {}
+    
+    # Language detection (Thai-script ratio of a prefix; langdetect only in between)
+    LANGUAGE_SAMPLE_CHARS: int = 1000
+    LANGUAGE_THAI_THRESHOLD: float = 0.6  # ratio at or above -> 'th'
+    LANGUAGE_ENGLISH_THRESHOLD: float = 0.3  # ratio at or below -> 'en'
+    
+    # Long documents (hierarchical map-reduce instead of truncation)
+    LONG_DOC_ENABLED: bool = False  # default of requests that leave long_document unset
+    LONG_DOC_CHUNK_TOKENS: int = 768
+    LONG_DOC_CHUNK_OVERLAP: int = 64
+    LONG_DOC_MAX_DEPTH: int = 3
+    LONG_DOC_BATCH_SIZE: int = 8
+    LONG_DOC_TIMEOUT_S: float = 600.0
+    
+    # Extractive pre-filter (inputs over the budget keep only their most central sentences before generation)
+    EXTRACTIVE_ENABLED: bool = False
+    EXTRACTIVE_TOKEN_BUDGET: int = 0  # 0 uses the model input limit (MAX_INPUT_LENGTH)
+    
+    # Micro-batching
+    BATCHING_ENABLED: bool = True
+    BATCH_MAX_SIZE: int = 8
+    BATCH_MAX_WAIT_MS: int = 10
+    BATCH_SUB_BATCH_SIZE: int = 16
+    BATCH_LENGTH_BUCKETS: list[int] = [512, 2048]  # character boundaries
+    
+    # Request coalescing (identical concurrent summarize calls share one generation)
+    COALESCING_ENABLED: bool = True
+    
+    # Summary cache
+    SUMMARY_CACHE_ENABLED: bool = True
+    SUMMARY_CACHE_MAX_ENTRIES: int = 1024
+    SUMMARY_CACHE_TTL_S: float = 86400
+    SUMMARY_CACHE_DISK_PATH: str = ""  # sqlite file, empty disables the disk tier
+    SUMMARY_CACHE_DISK_MAX_ENTRIES: int = 100000
+    
+    # Near-duplicate reuse (MinHash/LSH over character shingles; a close enough copy gets the stored summary)
+    DEDUP_ENABLED: bool = False
+    DEDUP_THRESHOLD: float = 0.85  # estimated Jaccard similarity of shingle sets
+    DEDUP_NUM_PERM: int = 128
+    DEDUP_SHINGLE_SIZE: int = 5  # characters
+    DEDUP_MAX_ENTRIES: int = 10000
+    DEDUP_MIN_CHARS: int = 200  # shorter texts always run generation
+    
+    # Inference executor
+    INFERENCE_EXECUTOR: str = "thread"  # "thread", "process" or "remote" (model host)
+    INFERENCE_WORKERS: int = 1
+    INFERENCE_TIMEOUT_S: float = 120.0
+    INFERENCE_QUEUE_LIMIT: int = 64
+    INFERENCE_RETRY_AFTER_S: int = 5
+    
+    # CPU placement (inference workers sharing the cores instead of oversubscribing them)
+    INFERENCE_CPU_AFFINITY: bool = False  # pin each thread or process worker to its own cores
+    INFERENCE_CPU_SETS: list[str] = []  # e.g. ["0-3", "4-7"], one per worker; [] splits the available cores evenly
+    TOKENIZERS_PARALLELISM: str = "auto"  # "true", "false" or "auto" (off when batching or with several workers)
+    
+    # Admission control (budget of estimated input + output tokens in flight)
+    ADMISSION_TOKEN_BUDGET: int = 8192  # 0 disables admission control
+    ADMISSION_FAST_LANE_TOKENS: int = 512  # requests at or below this cost skip the queue of long ones
+    ADMISSION_FAST_LANE_RESERVED: int = 1024  # part of the budget only the fast lane may use
+    ADMISSION_MAX_WAIT_S: float = 30.0
+    ADMISSION_MAX_QUEUED: int = 256  # waiting requests per lane before answering 429
+    ADMISSION_CHARS_PER_TOKEN: dict[str, float] = {"en": 4.0, "th": 3.0}
+    ADMISSION_DEFAULT_TOKENS_PER_S: float = 200.0  # throughput assumed until requests finish
+    
+    # Model host (INFERENCE_EXECUTOR=remote - one process holds the models for all HTTP workers)
+    MODEL_HOST_ADDRESS: str = "/tmp/fastapi-summarize-model-host.sock"  # unix socket path or "host:port"
+    MODEL_HOST_AUTHKEY: str = ""
+    MODEL_HOST_CONNECT_TIMEOUT_S: float = 60.0
+    WEB_WORKERS: int = 1  # uvicorn workers started by run.py
+    
+    # Bulk NDJSON endpoint (/summarize/bulk)
+    BULK_MAX_IN_FLIGHT: int = 32  # items summarizing at once; the upload is not read further until one finishes
+    BULK_MAX_LINE_BYTES: int = 1_000_000
+    BULK_MAX_RETRIES: int = 3  # retries of an item shed by admission control, after its Retry-After
+    
+    # Background jobs
+    JOBS_DB_PATH: str = "jobs.db"
+    JOBS_WORKERS: int = 1
+    JOBS_CHUNK_SIZE: int = 16
+    JOBS_MAX_RETRIES: int = 10  # rejections of one chunk in a row, each after its Retry-After, before its items fail
+    JOBS_LEASE_S: float = 300.0  # a running job whose owner saved nothing for this long is taken over by another worker
+    JOBS_MAX_ITEMS: int = 10000
+    JOBS_RESULTS_PAGE_SIZE: int = 100
+    
+    # Metrics
+    METRICS_ENABLED: bool = True
     
     class Config:
         env_file = ".env"
@@ -0,0 +1,232 @@
+"""
+Pydantic Schemas for Request/Response
+"""
+from pydantic import BaseModel, Field, create_model, field_validator
+from typing import Literal, Optional
+from app.core.config import settings
+
+
+class SummarizeRequest(BaseModel):
+    """Request schema for text summarization"""
+    
+    text: str = Field(
+        ...,
+        min_length=10,
+        description="ข้อความที่ต้องการสรุป"
+    )
+    max_length: Optional[int] = Field(
+        default=150,
+        ge=10,
+        le=1000,
+        description="ความยาวสูงสุดของข้อความสรุป"
+    )
+    min_length: Optional[int] = Field(
+        default=30,
+        ge=1,
+        le=500,
+        description="ความยาวต่ำสุดของข้อความสรุป"
+    )
+    language: Optional[Literal["en", "th"]] = Field(
+        default=None,
+        description="ภาษาของข้อความ ('en', 'th' หรือ null เพื่อตรวจจับอัตโนมัติ)"
+    )
+    long_document: Optional[bool] = Field(
+        default=None,
+        description="แบ่งข้อความยาวเป็นส่วนๆ แล้วสรุปแบบลำดับชั้นแทนการตัดทิ้ง (null = ใช้ค่าจาก LONG_DOC_ENABLED)"
+    )
+    profile: Optional[str] = Field(
+        default=None,
+        description="โปรไฟล์การสร้างข้อความ: fast, balanced, quality หรือ assisted (null = ใช้ค่าจาก GENERATION_PROFILE)"
+    )
+    tier: Optional[str] = Field(
+        default=None,
+        description="ระดับบริการที่ใช้เลือกโมเดลตาม MODEL_ROUTES เช่น fast, standard หรือ quality (null = ใช้ค่าจาก MODEL_DEFAULT_TIER)"
+    )
+    
+    @field_validator("profile")
+    @classmethod
+    def check_profile(cls, value: Optional[str]) -> Optional[str]:
+        """Only profiles configured in GENERATION_PROFILES are accepted"""
+        if value is not None and value not in settings.GENERATION_PROFILES:
+            raise ValueError(f"Unknown generation profile, expected one of {sorted(settings.GENERATION_PROFILES)}")
+        return value
+    
+    @field_validator("tier")
+    @classmethod
+    def check_tier(cls, value: Optional[str]) -> Optional[str]:
+        """Only tiers configured in MODEL_TIERS are accepted"""
+        if value is not None and value not in settings.MODEL_TIERS:
+            raise ValueError(f"Unknown tier, expected one of {settings.MODEL_TIERS}")
+        return value
+
+
+class SummarizeResponse(BaseModel):
+    """Response schema for text summarization"""
+    
+    original_text: str = Field(..., description="ข้อความต้นฉบับ")
+    summary: str = Field(..., description="ข้อความสรุป")
+    original_length: int = Field(..., description="ความยาวข้อความต้นฉบับ (ตัวอักษร)")
+    summary_length: int = Field(..., description="ความยาวข้อความสรุป (ตัวอักษร)")
+    input_tokens: Optional[int] = Field(
+        default=None,
+        description="จำนวน token ที่โมเดลอ่านจริง (หลังตัดที่ MAX_INPUT_LENGTH, โหมดเอกสารยาวนับทั้งเอกสาร)"
+    )
+    output_tokens: Optional[int] = Field(default=None, description="จำนวน token ที่โมเดลสร้าง")
+    truncated: Optional[bool] = Field(default=None, description="ข้อความถูกตัดที่ MAX_INPUT_LENGTH token หรือไม่")
+    pruned_sentences: Optional[int] = Field(
+        default=None,
+        description="จำนวนประโยคที่ extractive pre-filter ตัดออกก่อนส่งเข้าโมเดล (null = ไม่ได้ใช้)"
+    )
+    pruned_tokens: Optional[int] = Field(default=None, description="จำนวน token ที่ extractive pre-filter ตัดออก")
+    duplicate_score: Optional[float] = Field(
+        default=None,
+        description="ความคล้าย (Jaccard โดยประมาณ) กับข้อความที่เคยสรุปแล้วและนำผลสรุปมาใช้ซ้ำ (null = สรุปใหม่)"
+    )
+    compression_ratio: float = Field(..., description="อัตราการบีบอัด")
+    language: str = Field(..., description="ภาษาที่ตรวจพบ ('en' หรือ 'th')")
+    model: Optional[str] = Field(default=None, description="โมเดลที่ใช้สรุป (เลือกตาม MODEL_ROUTES)")
+    chunks: Optional[int] = Field(default=None, description="จำนวนส่วนที่แบ่งในโหมดเอกสารยาว")
+    levels: Optional[int] = Field(default=None, description="จำนวนรอบการสรุปในโหมดเอกสารยาว")
+    profile: Optional[str] = Field(
+        default=None,
+        description="โปรไฟล์การสร้างข้อความที่ใช้จริง (assisted จะเป็น fast ถ้าไม่มี draft model)"
+    )
+
+
+# What clients receive with include_original=false or fields=...: any SummarizeResponse field may be missing
+PartialSummarizeResponse = create_model(
+    "PartialSummarizeResponse",
+    __doc__="SummarizeResponse reduced to the fields picked with include_original / fields",
+    **{
+        name: (Optional[field.annotation], Field(default=None, description=field.description))
+        for name, field in SummarizeResponse.model_fields.items()
+    }
+)
+
+
+class BatchItemResult(BaseModel):
+    """Per-item result of a batch summarization"""
+    
+    index: int = Field(..., description="ลำดับของรายการใน request")
+    result: Optional[SummarizeResponse] = Field(default=None, description="ผลการสรุป (ถ้าสำเร็จ)")
+    error: Optional[str] = Field(default=None, description="ข้อผิดพลาดของรายการนี้ (ถ้าล้มเหลว)")
+
+
+class PartialBatchItemResult(BatchItemResult):
+    """Per-item result of a batch summarization reduced with include_original / fields"""
+    
+    result: Optional[PartialSummarizeResponse] = Field(
+        default=None,
+        description="ผลการสรุป (ถ้าสำเร็จ) เฉพาะฟิลด์ที่เลือก"
+    )
+
+
+class JobResponse(BaseModel):
+    """Status and progress of a background summarization job"""
+    
+    job_id: str = Field(..., description="รหัสงาน")
+    status: Literal["queued", "running", "completed", "failed"] = Field(..., description="สถานะของงาน")
+    total: int = Field(..., description="จำนวนรายการทั้งหมด")
+    completed: int = Field(..., description="จำนวนรายการที่สรุปสำเร็จ")
+    failed: int = Field(..., description="จำนวนรายการที่ล้มเหลว")
+    progress: float = Field(..., description="สัดส่วนรายการที่ทำเสร็จแล้ว (0-1)")
+    created_at: float = Field(..., description="เวลาที่สร้างงาน (unix timestamp)")
+    updated_at: float = Field(..., description="เวลาที่อัปเดตล่าสุด (unix timestamp)")
+    error: Optional[str] = Field(default=None, description="สาเหตุที่งานล้มเหลว (เฉพาะสถานะ failed)")
+    results: list[BatchItemResult] = Field(
+        default_factory=list,
+        description="ผลลัพธ์ที่เสร็จแล้วหน้าแรก (ดูทั้งหมดที่ /jobs/{job_id}/results)"
+    )
+
+
+class JobResultsPage(BaseModel):
+    """One page of a job's finished results"""
+    
+    job_id: str = Field(..., description="รหัสงาน")
+    offset: int = Field(..., description="ตำแหน่งเริ่มต้นของหน้านี้")
+    limit: int = Field(..., description="จำนวนรายการสูงสุดต่อหน้า")
+    items: list[BatchItemResult] = Field(..., description="ผลลัพธ์ที่เสร็จแล้วเรียงตามลำดับ")
+    next_offset: Optional[int] = Field(default=None, description="offset ของหน้าถัดไป (null ถ้าไม่มี)")
+
+
+class ModelStatus(BaseModel):
+    """Load state of a single model"""
+    
+    name: str = Field(..., description="ชื่อโมเดล")
+    state: Literal["unloaded", "loading", "ready"] = Field(..., description="สถานะของโมเดล")
+    backend: Optional[str] = Field(default=None, description="backend ที่ใช้รันโมเดล (pytorch/quantized/onnx)")
+    load_seconds: Optional[float] = Field(default=None, description="เวลาที่ใช้โหลดโมเดลครั้งล่าสุด (วินาที)")
+    idle_seconds: Optional[float] = Field(default=None, description="เวลาที่โมเดลไม่ถูกใช้งาน (วินาที)")
+    languages: list[str] = Field(default_factory=list, description="ภาษาที่โมเดลรองรับ")
+    max_input_tokens: Optional[int] = Field(default=None, description="จำนวน token สูงสุดที่โมเดลอ่าน")
+    cost: Optional[float] = Field(default=None, description="ต้นทุนต่อ token เทียบกับโมเดลอื่น (จาก MODELS)")
+
+
+class HealthResponse(BaseModel):
+    """Response schema for health check"""
+    
+    status: str = Field(..., description="สถานะของ API")
+    model_loaded: bool = Field(..., description="สถานะการโหลดโมเดล")
+    version: str = Field(..., description="เวอร์ชันของ API")
+    models: list[ModelStatus] = Field(default_factory=list, description="สถานะของแต่ละโมเดล")
+
+
+class WarmupStep(BaseModel):
+    """One step of the startup warm-up"""
+    
+    language: str = Field(..., description="ภาษาของโมเดล")
+    model: Optional[str] = Field(default=None, description="โมเดลที่โหลดหรือ warm-up")
+    input_tokens: Optional[int] = Field(default=None, description="ความยาว input ของ warm-up generation (null = โหลดโมเดล)")
+    seconds: float = Field(..., description="เวลาที่ใช้ (วินาที)")
+
+
+class ReadinessResponse(BaseModel):
+    """Response schema for the readiness check"""
+    
+    ready: bool = Field(..., description="พร้อมรับ traffic หรือไม่")
+    state: Literal["warming_up", "ready", "failed", "stopping"] = Field(..., description="สถานะของ startup warm-up")
+    languages: list[str] = Field(default_factory=list, description="ภาษาที่โหลดโมเดลตอน startup")
+    steps: list[WarmupStep] = Field(default_factory=list, description="ขั้นตอนของ warm-up ที่ทำเสร็จแล้ว")
+    seconds: Optional[float] = Field(default=None, description="เวลาที่ใช้ warm-up ทั้งหมด (วินาที)")
+    error: Optional[str] = Field(default=None, description="ข้อผิดพลาดถ้า warm-up ล้มเหลว")
+
+
+class NearDuplicateStatsResponse(BaseModel):
+    """Response schema for near-duplicate index statistics"""
+    
+    enabled: bool = Field(..., description="เปิดใช้งานการใช้ผลสรุปซ้ำกับข้อความที่คล้ายกันหรือไม่")
+    hits: int = Field(..., description="จำนวนครั้งที่พบข้อความที่คล้ายกัน")
+    misses: int = Field(..., description="จำนวนครั้งที่ไม่พบ")
+    evictions: int = Field(..., description="จำนวนรายการที่ถูกลบออกจาก index")
+    hit_rate: float = Field(..., description="อัตรา hit")
+    size: int = Field(..., description="จำนวนข้อความใน index")
+    max_entries: int = Field(..., description="จำนวนข้อความสูงสุดใน index")
+    threshold: float = Field(..., description="ความคล้ายขั้นต่ำที่นำผลสรุปมาใช้ซ้ำ")
+    bands: int = Field(..., description="จำนวน LSH bands")
+    rows: int = Field(..., description="จำนวนค่า MinHash ต่อ band")
+
+
+class CacheStatsResponse(BaseModel):
+    """Response schema for summary cache statistics"""
+    
+    enabled: bool = Field(..., description="เปิดใช้งาน cache หรือไม่")
+    hits: int = Field(..., description="จำนวนครั้งที่พบใน cache")
+    misses: int = Field(..., description="จำนวนครั้งที่ไม่พบใน cache")
+    memory_hits: int = Field(..., description="จำนวน hit จาก memory")
+    disk_hits: int = Field(..., description="จำนวน hit จาก disk")
+    evictions: int = Field(..., description="จำนวนรายการที่ถูกลบออกจาก memory")
+    hit_rate: float = Field(..., description="อัตรา hit")
+    memory_size: int = Field(..., description="จำนวนรายการใน memory")
+    memory_max_entries: int = Field(..., description="จำนวนรายการสูงสุดใน memory")
+    disk_size: Optional[int] = Field(default=None, description="จำนวนรายการบน disk (null ถ้าไม่ได้เปิด)")
+    ttl_s: float = Field(..., description="อายุของแต่ละรายการ (วินาที)")
+    near_duplicates: Optional[NearDuplicateStatsResponse] = Field(
+        default=None,
+        description="สถิติของ near-duplicate index"
+    )
+
+
+class ErrorResponse(BaseModel):
+    """Response schema for errors"""
+    
+    detail: str = Field(..., description="รายละเอียดข้อผิดพลาด")
@@ -0,0 +1,342 @@
+"""
+Admission Control
+Global budget of in-flight tokens in front of the model, with a fast lane for short requests
+"""
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Optional
+
+from app.core.config import settings
+from app.services.executor import InferenceQueueFullError
+from app.services.language import language_detector
+from app.services.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+FAST_LANE = "fast"
+NORMAL_LANE = "normal"
+
+# Tokens of observation the configured chars-per-token ratio counts as, and
+# how many observed tokens are kept before older ones are halved away
+_CALIBRATION_PRIOR_TOKENS = 1000
+_CALIBRATION_WINDOW_TOKENS = 100000
+
+ADMISSION_WAIT_SECONDS = metrics.histogram(
+    "admission_wait_seconds",
+    "Time requests waited for token budget",
+    ("lane",)
+)
+ADMISSION_REJECTIONS = metrics.counter(
+    "admission_rejections_total",
+    "Requests shed by admission control",
+    ("lane", "reason")
+)
+
+
+class AdmissionRejectedError(InferenceQueueFullError):
+    """Raised when the token budget cannot take a request soon enough"""
+    
+    def __init__(self, message: str, estimated_wait_s: float, status_code: int):
+        super().__init__(max(1, math.ceil(estimated_wait_s)), message)
+        self.estimated_wait_s = estimated_wait_s
+        self.status_code = status_code
+
+
+@dataclass
+class _Waiter:
+    """A request queued for budget"""
+    cost: int
+    future: asyncio.Future
+
+
+class AdmissionController:
+    """
+    Admits requests while their estimated token cost fits the in-flight budget
+    
+    Requests that do not fit wait in FIFO order per lane. Requests costing at
+    most fast_lane_tokens use their own lane, which may also spend the
+    fast_lane_reserved part of the budget, so short texts keep moving while
+    long documents queue.
+    """
+    
+    def __init__(
+        self,
+        token_budget: int = 8192,
+        fast_lane_tokens: int = 512,
+        fast_lane_reserved: int = 1024,
+        max_wait_s: float = 30.0,
+        max_queued: int = 256,
+        chars_per_token: Optional[dict[str, float]] = None,
+        default_tokens_per_s: float = 200.0
+    ):
+        self.token_budget = token_budget
+        self.fast_lane_tokens = fast_lane_tokens
+        self.fast_lane_reserved = min(max(0, fast_lane_reserved), max(0, token_budget - 1))
+        self.max_wait_s = max_wait_s
+        self.max_queued = max_queued
+        self.chars_per_token = dict(chars_per_token or {})
+        # language -> (characters, tokens) observed by calibrate()
+        self._calibration: dict[str, tuple[float, float]] = {}
+        self.in_flight = 0
+        self._queues: dict[str, deque[_Waiter]] = {FAST_LANE: deque(), NORMAL_LANE: deque()}
+        # Throughput (finished tokens per busy second) for wait predictions; the
+        # default acts as one second of prior observation and old data decays
+        self._done_tokens = default_tokens_per_s
+        self._busy_s = 1.0
+        self._busy_mark = time.monotonic()
+    
+    @property
+    def tokens_per_s(self) -> float:
+        """Estimated tokens finished per second while requests are in flight"""
+        return self._done_tokens / self._busy_s
+    
+    @property
+    def enabled(self) -> bool:
+        """Whether admission control is active (ADMISSION_TOKEN_BUDGET > 0)"""
+        return self.token_budget > 0
+    
+    def input_tokens(self, text: str, language: Optional[str]) -> int:
+        """Estimated input tokens of a text from its character count (see estimate)"""
+        language = language or language_detector.classify(text) or "en"
+        ratio = self.chars_per_token.get(language) or 4.0
+        return math.ceil(len(text) / ratio)
+    
+    def estimate(
+        self,
+        text: str,
+        language: Optional[str],
+        max_length: int,
+        long_document: bool = False
+    ) -> int:
+        """
+        Estimated token cost of a summarize request
+        
+        Input tokens are estimated from the character count with a per-language
+        ratio - the tokenizer lives next to the model (possibly in another
+        process), and tokenizing on the event loop would cost more than it saves.
+        The ratio starts at ADMISSION_CHARS_PER_TOKEN and follows the exact
+        counts passed to calibrate().
+        
+        Args:
+            text: Input text
+            language: Language code, or None to classify from the script
+            max_length: Requested maximum summary length (output tokens)
+            long_document: Whether the text may be chunked and map-reduced
+        
+        Returns:
+            Input plus output tokens the request is expected to occupy
+        """
+        input_tokens = self.input_tokens(text, language)
+        if long_document:
+            # Every chunk produces a summary of its own before the reduce step
+            chunks = max(1, math.ceil(input_tokens / max(1, settings.LONG_DOC_CHUNK_TOKENS)))
+            return input_tokens + max_length * chunks
+        return min(input_tokens, settings.MAX_INPUT_LENGTH) + max_length
+    
+    def calibrate(self, language: str, chars: int, tokens: int):
+        """
+        Refine a language's characters-per-token ratio from an exact token count
+        
+        The counts come from the tokenization the model runs anyway, so
+        estimates converge on the real tokenizer without tokenizing on the
+        event loop.
+        
+        Args:
+            language: Language code
+            chars: Characters of the text
+            tokens: Tokens the model's tokenizer produced for the whole text
+        """
+        if chars <= 0 or tokens <= 0:
+            return
+        prior = self.chars_per_token.get(language) or 4.0
+        seen_chars, seen_tokens = self._calibration.get(
+            language, (prior * _CALIBRATION_PRIOR_TOKENS, _CALIBRATION_PRIOR_TOKENS)
+        )
+        seen_chars += chars
+        seen_tokens += tokens
+        if seen_tokens > _CALIBRATION_WINDOW_TOKENS:
+            seen_chars /= 2
+            seen_tokens /= 2
+        self._calibration[language] = (seen_chars, seen_tokens)
+        self.chars_per_token[language] = seen_chars / seen_tokens
+    
+    def lane(self, cost: int) -> str:
+        """Lane a request of the given cost queues in"""
+        return FAST_LANE if cost <= self.fast_lane_tokens else NORMAL_LANE
+    
+    def _limit(self, lane: str) -> int:
+        """Share of the budget a lane may fill"""
+        if lane == FAST_LANE:
+            return self.token_budget
+        return self.token_budget - self.fast_lane_reserved
+    
+    def queued(self, lane: str) -> int:
+        """Number of requests waiting in a lane"""
+        return len(self._queues[lane])
+    
+    def estimated_wait(self, cost: int) -> float:
+        """Seconds until a request of the given cost would be admitted"""
+        lane = self.lane(cost)
+        cost = min(cost, self._limit(lane))
+        ahead = sum(waiter.cost for waiter in self._queues[lane])
+        backlog = self.in_flight + ahead + cost - self._limit(lane)
+        return max(0.0, backlog / max(self.tokens_per_s, 1e-6))
+    
+    def _reject(self, lane: str, reason: str, message: str, wait: float, status_code: int):
+        ADMISSION_REJECTIONS.inc(lane=lane, reason=reason)
+        logger.warning(f"Admission rejected ({lane} lane, {reason}): {message}")
+        raise AdmissionRejectedError(message, wait, status_code)
+    
+    def _take(self, cost: int):
+        if self.in_flight == 0:
+            # Idle time does not count towards throughput
+            self._busy_mark = time.monotonic()
+        self.in_flight += cost
+    
+    def _grant(self):
+        """Admit queued requests that now fit, fast lane first"""
+        for lane in (FAST_LANE, NORMAL_LANE):
+            queue = self._queues[lane]
+            while queue and self.in_flight + queue[0].cost <= self._limit(lane):
+                waiter = queue.popleft()
+                if waiter.future.done():
+                    continue
+                self._take(waiter.cost)
+                waiter.future.set_result(None)
+    
+    async def acquire(self, cost: int) -> int:
+        """
+        Wait until a request fits the token budget
+        
+        A request larger than its lane's share of the budget is charged the
+        whole share, so it runs once everything ahead of it has finished.
+        
+        Args:
+            cost: Estimated tokens (see estimate())
+        
+        Returns:
+            The tokens charged, to pass to release()
+        
+        Raises:
+            AdmissionRejectedError: 429 if the lane's queue is full, 503 if the
+                estimated or actual wait exceeds ADMISSION_MAX_WAIT_S
+        """
+        if not self.enabled:
+            return 0
+        
+        lane = self.lane(cost)
+        cost = min(max(1, cost), self._limit(lane))
+        queue = self._queues[lane]
+        if not queue and self.in_flight + cost <= self._limit(lane):
+            self._take(cost)
+            ADMISSION_WAIT_SECONDS.observe(0.0, lane=lane)
+            return cost
+        
+        wait = self.estimated_wait(cost)
+        if len(queue) >= self.max_queued:
+            self._reject(
+                lane, "queue_full",
+                f"Too many requests waiting, estimated wait {wait:.1f}s",
+                wait, 429
+            )
+        if wait > self.max_wait_s:
+            self._reject(
+                lane, "estimated_wait",
+                f"Server is at capacity, estimated wait {wait:.1f}s",
+                wait, 503
+            )
+        
+        waiter = _Waiter(cost, asyncio.get_running_loop().create_future())
+        queue.append(waiter)
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), self.max_wait_s)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if waiter.future.done():
+                # Admitted just as the wait ended - hand the budget back
+                self.release(cost, completed=False)
+            else:
+                waiter.future.cancel()
+                queue.remove(waiter)
+                self._grant()
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            self._reject(
+                lane, "timeout",
+                f"Server is at capacity, waited {self.max_wait_s:g}s",
+                self.estimated_wait(cost), 503
+            )
+        
+        ADMISSION_WAIT_SECONDS.observe(time.monotonic() - started, lane=lane)
+        return cost
+    
+    def release(self, cost: int, completed: bool = True):
+        """
+        Give back tokens charged by acquire() and admit whoever now fits
+        
+        Args:
+            cost: Tokens returned by acquire()
+            completed: Whether the request ran (only finished work counts
+                towards the throughput estimate)
+        """
+        if cost <= 0:
+            return
+        now = time.monotonic()
+        self._busy_s += now - self._busy_mark
+        self._busy_mark = now
+        if completed:
+            self._done_tokens += cost
+        if self._busy_s > 60:
+            self._done_tokens /= 2
+            self._busy_s /= 2
+        self.in_flight -= cost
+        self._grant()
+    
+    @asynccontextmanager
+    async def admit(self, cost: int):
+        """Hold budget for the duration of a block (see acquire())"""
+        charged = await self.acquire(cost)
+        try:
+            yield
+        finally:
+            self.release(charged)
+
+
+# Global instance
+admission_controller = AdmissionController(
+    token_budget=settings.ADMISSION_TOKEN_BUDGET,
+    fast_lane_tokens=settings.ADMISSION_FAST_LANE_TOKENS,
+    fast_lane_reserved=settings.ADMISSION_FAST_LANE_RESERVED,
+    max_wait_s=settings.ADMISSION_MAX_WAIT_S,
+    max_queued=settings.ADMISSION_MAX_QUEUED,
+    chars_per_token=settings.ADMISSION_CHARS_PER_TOKEN,
+    default_tokens_per_s=settings.ADMISSION_DEFAULT_TOKENS_PER_S
+)
+
+metrics.gauge(
+    "admission_tokens_in_flight",
+    "Estimated tokens of requests admitted and not yet finished",
+    callback=lambda: {(): admission_controller.in_flight}
+)
+metrics.gauge(
+    "admission_queued",
+    "Requests waiting for token budget",
+    ("lane",),
+    callback=lambda: {(lane,): admission_controller.queued(lane) for lane in (FAST_LANE, NORMAL_LANE)}
+)
+metrics.gauge(
+    "admission_tokens_per_second",
+    "Throughput estimate used to predict waits",
+    callback=lambda: {(): admission_controller.tokens_per_s}
+)
+metrics.gauge(
+    "admission_chars_per_token",
+    "Characters per token used to estimate request cost",
+    ("language",),
+    callback=lambda: {(language,): ratio for language, ratio in admission_controller.chars_per_token.items()}
+)
@@ -0,0 +1,211 @@
+"""
+Inference Backends
+Builds summarization pipelines on eager PyTorch, int8-quantized PyTorch or ONNX Runtime
+"""
+import argparse
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+
+from app.core.config import settings
+from app.services.cpu import configure_tokenizers, worker_threads
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_BACKENDS = ("pytorch", "quantized", "onnx")
+
+_threads_lock = threading.Lock()
+_threads_configured = False
+_intra_op_threads = 0
+
+
+def backend_for(model_name: str) -> str:
+    """Backend configured for a model (MODEL_BACKENDS entry or MODEL_BACKEND default)"""
+    backend = settings.MODEL_BACKENDS.get(model_name, settings.MODEL_BACKEND)
+    if backend not in SUPPORTED_BACKENDS:
+        raise ValueError(f"Unknown backend '{backend}' for {model_name}, expected one of {SUPPORTED_BACKENDS}")
+    return backend
+
+
+def _onnx_export_dir(model_name: str) -> Path:
+    """Where the exported ONNX artifacts of a model are cached"""
+    return Path(settings.ONNX_CACHE_DIR) / model_name.strip("/").replace("/", "--")
+
+
+def configure_threads(intra_op_threads: int = 0):
+    """
+    Apply the torch thread pool sizes and TOKENIZERS_PARALLELISM to this process once
+    
+    Called before the first model is built: torch only accepts an inter-op
+    thread count before it has started any parallel work. With several
+    inference workers in one process, the intra-op pool defaults to their
+    share of the cores (see cpu.worker_threads).
+    
+    Args:
+        intra_op_threads: Intra-op threads for this process (0 uses cpu.worker_threads);
+            a pinned worker process passes the size of its core set
+    """
+    global _threads_configured, _intra_op_threads
+    with _threads_lock:
+        if _threads_configured:
+            return
+        _threads_configured = True
+        
+        configure_tokenizers()
+        
+        import torch
+        
+        threads = intra_op_threads or worker_threads(settings.INFERENCE_WORKERS)
+        _intra_op_threads = threads
+        if threads > 0:
+            torch.set_num_threads(threads)
+        if settings.TORCH_INTEROP_THREADS > 0:
+            try:
+                torch.set_num_interop_threads(settings.TORCH_INTEROP_THREADS)
+            except RuntimeError as e:
+                logger.warning(f"Could not set torch inter-op threads: {e}")
+        logger.info(
+            f"Torch threads: intra-op={torch.get_num_threads()}, inter-op={torch.get_num_interop_threads()}"
+        )
+
+
+def build_pipeline(model_name: str, backend: str = "pytorch"):
+    """
+    Build a summarization pipeline on the requested backend
+    
+    Args:
+        model_name: Hugging Face model name or local path
+        backend: 'pytorch' (eager), 'quantized' (dynamic int8 Linear layers)
+            or 'onnx' (ONNX Runtime, exported once and cached in ONNX_CACHE_DIR)
+    
+    Returns:
+        A transformers summarization pipeline
+    """
+    configure_threads()
+    
+    # Imported here so processes that never load a model (HTTP workers in
+    # remote mode) do not pay for torch and transformers
+    import torch
+    from transformers import AutoModelForSeq2SeqLM, AutoTokenizer, pipeline
+    
+    if backend == "pytorch":
+        return pipeline("summarization", model=model_name, tokenizer=model_name)
+    
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    
+    if backend == "quantized":
+        model = AutoModelForSeq2SeqLM.from_pretrained(model_name)
+        model.eval()
+        model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        return pipeline("summarization", model=model, tokenizer=tokenizer)
+    
+    if backend == "onnx":
+        try:
+            import onnxruntime
+            from optimum.onnxruntime import ORTModelForSeq2SeqLM
+        except ImportError as e:
+            raise ImportError(
+                "The onnx backend requires optimum[onnxruntime] - install it with `uv sync --extra onnx`"
+            ) from e
+        
+        # ONNX Runtime sizes its own thread pool; give it the torch share so workers do not oversubscribe
+        session_options = onnxruntime.SessionOptions()
+        if _intra_op_threads > 0:
+            session_options.intra_op_num_threads = _intra_op_threads
+        
+        export_dir = _onnx_export_dir(model_name)
+        if (export_dir / "config.json").exists():
+            logger.info(f"Using cached ONNX export: {export_dir}")
+            model = ORTModelForSeq2SeqLM.from_pretrained(export_dir, session_options=session_options)
+        else:
+            logger.info(f"Exporting {model_name} to ONNX: {export_dir}")
+            model = ORTModelForSeq2SeqLM.from_pretrained(model_name, export=True, session_options=session_options)
+            model.save_pretrained(export_dir)
+            tokenizer.save_pretrained(export_dir)
+        return pipeline("summarization", model=model, tokenizer=tokenizer)
+    
+    raise ValueError(f"Unknown backend '{backend}', expected one of {SUPPORTED_BACKENDS}")
+
+
+def token_f1(reference: str, candidate: str) -> float:
+    """Unigram overlap F1 between two summaries"""
+    ref, cand = reference.split(), candidate.split()
+    if not ref or not cand:
+        return float(ref == cand)
+    common = sum(min(ref.count(word), cand.count(word)) for word in set(cand))
+    if common == 0:
+        return 0.0
+    precision, recall = common / len(cand), common / len(ref)
+    return 2 * precision * recall / (precision + recall)
+
+
+def check_parity(
+    model_name: str,
+    backend: str,
+    texts: list[str],
+    max_length: int = 150,
+    min_length: int = 30
+) -> dict:
+    """
+    Compare a backend's summaries and latency against the eager PyTorch backend
+    
+    Args:
+        model_name: Hugging Face model name or local path
+        backend: Backend to check
+        texts: Sample inputs
+        max_length: Maximum length of summary
+        min_length: Minimum length of summary
+    
+    Returns:
+        Dictionary with exact-match rate, mean token F1 and per-backend latency
+    """
+    results = {}
+    for name in ("pytorch", backend):
+        summarizer = build_pipeline(model_name, name)
+        started = time.perf_counter()
+        outputs = summarizer(
+            texts, max_length=max_length, min_length=min_length, do_sample=False, truncation=True
+        )
+        results[name] = {
+            "summaries": [output["summary_text"] for output in outputs],
+            "seconds": time.perf_counter() - started
+        }
+        del summarizer
+    
+    reference, candidate = results["pytorch"]["summaries"], results[backend]["summaries"]
+    return {
+        "model": model_name,
+        "backend": backend,
+        "samples": len(texts),
+        "exact_match": sum(a == b for a, b in zip(reference, candidate)) / len(texts),
+        "token_f1": sum(token_f1(a, b) for a, b in zip(reference, candidate)) / len(texts),
+        "pytorch_ms_per_text": round(results["pytorch"]["seconds"] * 1000 / len(texts), 2),
+        "backend_ms_per_text": round(results[backend]["seconds"] * 1000 / len(texts), 2)
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check a backend against eager PyTorch")
+    parser.add_argument("--model", default=settings.MODEL_NAME_EN)
+    parser.add_argument("--backend", choices=SUPPORTED_BACKENDS[1:], required=True)
+    parser.add_argument("--input", help="Text file with one sample per line")
+    parser.add_argument("--max-length", type=int, default=settings.MAX_OUTPUT_LENGTH)
+    parser.add_argument("--min-length", type=int, default=settings.MIN_OUTPUT_LENGTH)
+    args = parser.parse_args()
+    
+    if args.input:
+        samples = [line.strip() for line in Path(args.input).read_text(encoding="utf-8").splitlines() if line.strip()]
+    else:
+        samples = [
+            "Artificial Intelligence has revolutionized modern technology by enabling machines to perform "
+            "tasks that typically require human intelligence. Machine learning allows computers to learn "
+            "from data without explicit programming, and deep learning has achieved breakthroughs in image "
+            "recognition, speech processing and autonomous vehicles."
+        ]
+    
+    print(json.dumps(
+        check_parity(args.model, args.backend, samples, args.max_length, args.min_length),
+        indent=2
+    ))
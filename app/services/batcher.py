@@ -0,0 +1,777 @@
+"""
+Dynamic Micro-Batching Scheduler
+Collects concurrent summarize calls per language and model and runs them as one batch
+"""
+import asyncio
+import bisect
+import logging
+from dataclasses import dataclass, field
+from typing import Optional
+
+from app.core.config import settings
+from app.services.summarizer import (
+    summarizer_service,
+    run_summarize,
+    run_summarize_many,
+    run_summarize_long,
+    run_needs_long_document_mode
+)
+from app.services.executor import inference_executor, InferenceTimeoutError
+from app.services.admission import admission_controller
+from app.services.cache import summary_cache
+from app.services.dedup import near_duplicate_index
+from app.services.language import language_detector
+from app.services.generation import resolve_profile
+from app.services.routing import model_router
+from app.services.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+COALESCED = metrics.counter(
+    "summarize_coalesced_total",
+    "Summarize calls that joined an identical call already in flight",
+    ("language",)
+)
+
+
+@dataclass
+class _PendingItem:
+    """A single queued summarize call waiting for its batch"""
+    text: str
+    max_length: int
+    min_length: int
+    profile: str
+    future: asyncio.Future
+
+
+@dataclass
+class _Flight:
+    """An in-flight summarization that identical calls attach to"""
+    future: asyncio.Future
+    work: asyncio.Task  # computes this flight (and, for a batch, its sibling flights)
+    siblings: list = field(default_factory=list)  # flights computed by the same work, this one included
+    waiters: int = 0
+
+
+@dataclass
+class SubBatch:
+    """Indices of batch items that share a language, model, generation params and length bucket"""
+    language: str
+    max_length: int
+    min_length: int
+    profile: str
+    indices: list[int] = field(default_factory=list)
+    model: Optional[str] = None
+
+
+def plan_sub_batches(
+    texts: list[str],
+    languages: list[str],
+    params: list[tuple[int, int, str]],
+    sub_batch_size: int,
+    length_buckets: list[int],
+    models: Optional[list[Optional[str]]] = None
+) -> list[SubBatch]:
+    """
+    Split batch items into padded sub-batches
+    
+    Items are grouped by language, model and (max_length, min_length, profile), placed into
+    length buckets, sorted by length inside each bucket and cut into chunks
+    of at most sub_batch_size so each padded forward pass holds similar lengths.
+    
+    Args:
+        texts: Input texts
+        languages: Language code of each text
+        params: (max_length, min_length, profile) of each text
+        sub_batch_size: Maximum number of texts per pipeline call
+        length_buckets: Ascending character-length boundaries between buckets
+        models: Routed model of each text (None uses each language's default)
+    
+    Returns:
+        List of sub-batches covering every index exactly once
+    """
+    boundaries = sorted(length_buckets)
+    groups: dict[tuple[str, Optional[str], int, int, str, int], list[int]] = {}
+    for index, text in enumerate(texts):
+        bucket = bisect.bisect_left(boundaries, len(text))
+        model = models[index] if models else None
+        key = (languages[index], model, *params[index], bucket)
+        groups.setdefault(key, []).append(index)
+    
+    size = max(1, sub_batch_size)
+    plan = []
+    for (language, model, max_length, min_length, profile, _), indices in groups.items():
+        indices.sort(key=lambda i: len(texts[i]))
+        for start in range(0, len(indices), size):
+            plan.append(SubBatch(language, max_length, min_length, profile, indices[start:start + size], model))
+    return plan
+
+
+class MicroBatcher:
+    """
+    Asyncio queue that groups requests for one language and model into padded pipeline calls
+    
+    Up to max_concurrent batches run at once, so a full batch does not wait
+    for the previous one while inference workers are free; the queue keeps
+    filling the next batch meanwhile.
+    """
+    
+    def __init__(self, language: str, model: str, max_batch_size: int, max_wait_ms: int, max_concurrent: int = 1):
+        self.language = language
+        self.model = model
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0, max_wait_ms) / 1000
+        self.max_concurrent = max(1, max_concurrent)
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._running: set[asyncio.Task] = set()
+    
+    def _ensure_worker(self):
+        """Start the collector task on the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._slots = asyncio.Semaphore(self.max_concurrent)
+            self._running = set()
+            self._worker = None
+        if self._worker is None or self._worker.done():
+            self._worker = loop.create_task(self._run())
+    
+    async def submit(self, text: str, max_length: int, min_length: int, profile: str) -> dict:
+        """
+        Queue a text and wait for its batch to finish
+        
+        Args:
+            text: Input text to summarize
+            max_length: Maximum length of summary
+            min_length: Minimum length of summary
+            profile: Generation profile
+        
+        Returns:
+            Dictionary with summary and language
+        """
+        self._ensure_worker()
+        future = self._loop.create_future()
+        await self._queue.put(_PendingItem(text, max_length, min_length, profile, future))
+        return await future
+    
+    async def _collect(self) -> list[_PendingItem]:
+        """Wait for the first item, then gather more until the window closes"""
+        batch = [await self._queue.get()]
+        deadline = self._loop.time() + self.max_wait
+        
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - self._loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        
+        return batch
+    
+    async def _run(self):
+        """Collector loop - one padded generate call per group of compatible items, max_concurrent at a time"""
+        while True:
+            batch = await self._collect()
+            
+            # Generation parameters must match to share a forward pass
+            groups: dict[tuple[int, int, str], list[_PendingItem]] = {}
+            for item in batch:
+                if item.future.cancelled():
+                    continue
+                groups.setdefault((item.max_length, item.min_length, item.profile), []).append(item)
+            
+            for (max_length, min_length, profile), items in groups.items():
+                # Wait for a free worker; items arriving meanwhile join the next batch
+                await self._slots.acquire()
+                task = self._loop.create_task(self._process(items, max_length, min_length, profile))
+                self._running.add(task)
+                task.add_done_callback(self._finished)
+    
+    def _finished(self, task: asyncio.Task):
+        """Free the worker slot of a finished batch"""
+        self._running.discard(task)
+        self._slots.release()
+    
+    async def _process(self, items: list[_PendingItem], max_length: int, min_length: int, profile: str):
+        """Run one batch and fan the results back to the waiting callers"""
+        logger.debug(f"Running {self.language} batch of {len(items)} on {self.model}")
+        try:
+            results = await inference_executor.run(
+                run_summarize_many,
+                [item.text for item in items],
+                max_length,
+                min_length,
+                self.language,
+                profile,
+                self.model
+            )
+        except Exception as e:
+            logger.error(f"Error in {self.language} batch: {e}")
+            for item in items:
+                if not item.future.done():
+                    item.future.set_exception(e)
+            return
+        
+        for item, result in zip(items, results):
+            if not item.future.done():
+                item.future.set_result(result)
+    
+    async def stop(self):
+        """Cancel the collector task and the batches it started"""
+        if self._worker is not None and not self._worker.done():
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        self._worker = None
+        running = list(self._running)
+        for task in running:
+            task.cancel()
+        await asyncio.gather(*running, return_exceptions=True)
+
+
+class BatchScheduler:
+    """Routes summarize calls to a micro-batcher per language and model"""
+    
+    def __init__(self):
+        self._batchers: dict[tuple[str, str], MicroBatcher] = {}
+        self._in_flight: dict[str, _Flight] = {}
+    
+    def _get_batcher(self, language: str, model: str) -> MicroBatcher:
+        """Get or create the batcher for a language and model"""
+        if (language, model) not in self._batchers:
+            self._batchers[(language, model)] = MicroBatcher(
+                language,
+                model,
+                max_batch_size=settings.BATCH_MAX_SIZE,
+                max_wait_ms=settings.BATCH_MAX_WAIT_MS,
+                max_concurrent=settings.INFERENCE_WORKERS
+            )
+        return self._batchers[(language, model)]
+    
+    @staticmethod
+    def _route(text: str, language: str, tier: Optional[str]) -> str:
+        """Model for a text, routed on its language, estimated input tokens and tier"""
+        return model_router.route(language, admission_controller.input_tokens(text, language), tier)
+    
+    def _request_key(
+        self,
+        text: str,
+        language: str,
+        model: str,
+        max_length: int,
+        min_length: int,
+        variant: str = ""
+    ) -> str:
+        """Content-addressed key of a summarize call - identical keys produce identical summaries"""
+        return summary_cache.make_key(text, language, model, max_length, min_length, variant)
+    
+    @staticmethod
+    def _cache_key(request_key: str) -> Optional[str]:
+        """Summary cache key, or None when the cache is disabled"""
+        return request_key if settings.SUMMARY_CACHE_ENABLED else None
+    
+    def _start_flights(self, request_keys: list[str], work: asyncio.Task, futures: list[asyncio.Future]) -> list[_Flight]:
+        """Register calls that work is computing so identical calls can join them"""
+        flights = [_Flight(future, work) for future in futures]
+        for request_key, flight in zip(request_keys, flights):
+            flight.siblings = flights
+            self._in_flight[request_key] = flight
+        
+        def finished(_):
+            for request_key, flight in zip(request_keys, flights):
+                if self._in_flight.get(request_key) is flight:
+                    del self._in_flight[request_key]
+        
+        work.add_done_callback(finished)
+        return flights
+    
+    def _join_flight(self, request_key: str, language: str) -> Optional[_Flight]:
+        """The in-flight call with this key, if coalescing is on and one is running"""
+        if not settings.COALESCING_ENABLED:
+            return None
+        flight = self._in_flight.get(request_key)
+        if flight is not None:
+            COALESCED.inc(language=language)
+        return flight
+    
+    async def _wait_flight(self, flight: _Flight) -> dict:
+        """
+        Wait for a flight's result without owning it
+        
+        A caller that goes away (e.g. its client disconnected) only stops
+        waiting; the work is cancelled once nobody waits for any of the
+        flights it computes, and those flights are unregistered right away so
+        new identical calls start fresh instead of joining a cancelled one.
+        """
+        flight.waiters += 1
+        try:
+            result = await asyncio.shield(flight.future)
+        finally:
+            flight.waiters -= 1
+            if not flight.work.done() and all(sibling.waiters == 0 for sibling in flight.siblings):
+                for request_key, registered in list(self._in_flight.items()):
+                    if registered in flight.siblings:
+                        del self._in_flight[request_key]
+                flight.work.cancel()
+        return dict(result)
+    
+    @staticmethod
+    def _dedup_group(language: str, model: str, max_length: int, min_length: int, variant: str) -> str:
+        """Near-duplicate index group - only requests that would get the same kind of summary share one"""
+        return "\x1f".join([language, model, str(max_length), str(min_length), variant])
+    
+    async def _find_near_duplicates(
+        self,
+        texts: list[str],
+        groups: list[str]
+    ) -> list[tuple[Optional[dict], Optional[tuple]]]:
+        """
+        Look texts up in the near-duplicate index
+        
+        Returns:
+            Per text, the reused result (with duplicate_score) or None, and the
+            (group, signature) to index the fresh result under - None when
+            DEDUP_ENABLED is off or the text is too short to match safely
+        """
+        found: list[tuple[Optional[dict], Optional[tuple]]] = [(None, None)] * len(texts)
+        if not settings.DEDUP_ENABLED:
+            return found
+        indices = [i for i, text in enumerate(texts) if near_duplicate_index.applies_to(text)]
+        if not indices:
+            return found
+        
+        # Hashing every shingle of long texts would stall the event loop
+        signatures = await asyncio.to_thread(lambda: [near_duplicate_index.signature(texts[i]) for i in indices])
+        for index, signature in zip(indices, signatures):
+            match = near_duplicate_index.lookup(groups[index], signature)
+            if match is None:
+                found[index] = (None, (groups[index], signature))
+            else:
+                result, score = match
+                result["duplicate_score"] = score
+                found[index] = (result, None)
+        return found
+    
+    @staticmethod
+    def _remember(key: Optional[str], dedup: Optional[tuple], result: dict):
+        """Store a fresh result in the summary cache and the near-duplicate index"""
+        if key is not None:
+            summary_cache.set(key, result)
+        if dedup is not None:
+            near_duplicate_index.add(*dedup, result)
+    
+    async def detect_language(self, text: str) -> str:
+        """
+        Detect the language of a text without blocking the event loop
+        
+        Text whose script decides the language is classified inline (the check
+        is a bounded regex scan); only mixed text goes to langdetect in a thread.
+        """
+        if language_detector.classify(text) is not None:
+            return summarizer_service.detect_language(text)
+        return await asyncio.to_thread(summarizer_service.detect_language, text)
+    
+    @staticmethod
+    def _variant(long_candidate: bool, profile: str) -> str:
+        """Cache key variant - long-document mode and the generation profile change the output"""
+        return f"long:{profile}" if long_candidate else profile
+    
+    @staticmethod
+    def _calibrate(text: str, language: str, result: dict):
+        """Feed the exact input token count of a result back into admission estimates"""
+        # Truncated and pre-filtered inputs are shorter than their text
+        if result.get("input_tokens") and not result.get("truncated") and result.get("pruned_tokens") is None:
+            admission_controller.calibrate(language, len(text), result["input_tokens"])
+    
+    def _is_long_candidate(self, text: str, long_document: Optional[bool]) -> bool:
+        """Whether a text may need long-document mode (cheap character check)"""
+        if long_document is None:
+            long_document = settings.LONG_DOC_ENABLED
+        return long_document and len(text) > settings.LONG_DOC_CHUNK_TOKENS
+    
+    @staticmethod
+    async def _needs_chunking(text: str, language: str, model: str) -> bool:
+        """Whether a long-document candidate really exceeds the model input (counted by its tokenizer)"""
+        return await inference_executor.wait(
+            inference_executor.run(run_needs_long_document_mode, text, language, model)
+        )
+    
+    @staticmethod
+    async def _map_reduce(
+        text: str,
+        max_length: int,
+        min_length: int,
+        language: str,
+        profile: str,
+        model: str
+    ) -> dict:
+        """Chunk and map-reduce a text that exceeds the model input"""
+        return await inference_executor.wait(
+            inference_executor.run(run_summarize_long, text, max_length, min_length, language, profile, model),
+            timeout=settings.LONG_DOC_TIMEOUT_S
+        )
+    
+    async def _summarize_one(
+        self,
+        text: str,
+        max_length: int,
+        min_length: int,
+        language: str,
+        profile: str,
+        model: str
+    ) -> dict:
+        """Summarize a text that fits the model input, through the micro-batcher when batching is on"""
+        if not settings.BATCHING_ENABLED:
+            return await inference_executor.wait(
+                inference_executor.run(run_summarize, text, max_length, min_length, language, profile, model)
+            )
+        return await inference_executor.wait(
+            self._get_batcher(language, model).submit(text, max_length, min_length, profile)
+        )
+    
+    async def _summarize_long(
+        self,
+        text: str,
+        max_length: int,
+        min_length: int,
+        language: str,
+        profile: str,
+        model: str
+    ) -> dict:
+        """Map-reduce a text that exceeds the model input; one that fits is batched like any other"""
+        if await self._needs_chunking(text, language, model):
+            return await self._map_reduce(text, max_length, min_length, language, profile, model)
+        return await self._summarize_one(text, max_length, min_length, language, profile, model)
+    
+    async def summarize(
+        self,
+        text: str,
+        max_length: int = 150,
+        min_length: int = 30,
+        language: str = None,
+        long_document: Optional[bool] = None,
+        profile: Optional[str] = None,
+        tier: Optional[str] = None
+    ) -> dict:
+        """
+        Summarize a text through the micro-batching queue
+        
+        Args:
+            text: Input text to summarize
+            max_length: Maximum length of summary
+            min_length: Minimum length of summary
+            language: Language code ('en', 'th', or None for auto-detect)
+            long_document: Chunk and map-reduce texts longer than the model
+                input (None uses LONG_DOC_ENABLED)
+            profile: Generation profile (None uses GENERATION_PROFILE)
+            tier: Routing tier (None uses MODEL_DEFAULT_TIER)
+        
+        Returns:
+            Dictionary with summary, detected language, model and generation profile
+        
+        Raises:
+            InferenceQueueFullError: If the inference queue is full or admission
+                control sheds the request (AdmissionRejectedError)
+            InferenceTimeoutError: If the result is not ready within INFERENCE_TIMEOUT_S
+        """
+        if language is None:
+            language = await self.detect_language(text)
+        
+        model = self._route(text, language, tier)
+        profile = resolve_profile(profile, model)
+        long_candidate = self._is_long_candidate(text, long_document)
+        variant = self._variant(long_candidate, profile)
+        request_key = self._request_key(text, language, model, max_length, min_length, variant)
+        key = self._cache_key(request_key)
+        if key is not None:
+            cached = summary_cache.get(key)
+            if cached is not None:
+                return cached
+        
+        # Identical calls arriving while this one generates share its result
+        flight = self._join_flight(request_key, language)
+        if flight is None:
+            work = asyncio.create_task(
+                self._summarize_uncached(
+                    text, max_length, min_length, language, model, profile, long_candidate, variant, key
+                )
+            )
+            if not settings.COALESCING_ENABLED:
+                return await work
+            [flight] = self._start_flights([request_key], work, [work])
+        return await self._wait_flight(flight)
+    
+    async def _summarize_uncached(
+        self,
+        text: str,
+        max_length: int,
+        min_length: int,
+        language: str,
+        model: str,
+        profile: str,
+        long_candidate: bool,
+        variant: str,
+        key: Optional[str]
+    ) -> dict:
+        """Summarize a text the summary cache missed (near-duplicate reuse, then generation)"""
+        group = self._dedup_group(language, model, max_length, min_length, variant)
+        [(duplicate, dedup)] = await self._find_near_duplicates([text], [group])
+        if duplicate is not None:
+            if key is not None:
+                summary_cache.set(key, duplicate)
+            return duplicate
+        
+        cost = admission_controller.estimate(text, language, max_length, long_candidate)
+        async with admission_controller.admit(cost):
+            with inference_executor.slots():
+                if long_candidate:
+                    result = await self._summarize_long(text, max_length, min_length, language, profile, model)
+                else:
+                    result = await self._summarize_one(text, max_length, min_length, language, profile, model)
+        
+        self._calibrate(text, language, result)
+        self._remember(key, dedup, result)
+        return result
+    
+    async def summarize_batch(self, requests: list[dict]) -> list:
+        """
+        Summarize many texts at once, grouped by language, model and length
+        
+        Args:
+            requests: Dictionaries with text, max_length, min_length, language
+                and optionally long_document, profile and tier
+        
+        Returns:
+            One entry per request in original order - the result dictionary,
+            or the exception raised for that item
+        
+        Raises:
+            InferenceQueueFullError: If the inference queue or the token budget
+                cannot take the whole batch
+        """
+        texts = [req["text"] for req in requests]
+        results: list = [None] * len(requests)
+        
+        # Detect missing languages up front - clear-cut scripts inline, mixed text in one thread call
+        languages = [req.get("language") for req in requests]
+        ambiguous = []
+        for index, req in enumerate(requests):
+            if languages[index] is None:
+                if language_detector.classify(req["text"]) is not None:
+                    languages[index] = summarizer_service.detect_language(req["text"])
+                else:
+                    ambiguous.append(index)
+        if ambiguous:
+            detected = await asyncio.to_thread(
+                lambda: [summarizer_service.detect_language(texts[i]) for i in ambiguous]
+            )
+            for index, language in zip(ambiguous, detected):
+                languages[index] = language
+        
+        models = [
+            self._route(req["text"], language, req.get("tier"))
+            for req, language in zip(requests, languages)
+        ]
+        profiles = [
+            resolve_profile(req.get("profile"), model)
+            for req, model in zip(requests, models)
+        ]
+        long_candidates = [
+            self._is_long_candidate(req["text"], req.get("long_document")) for req in requests
+        ]
+        variants = [self._variant(long, profile) for long, profile in zip(long_candidates, profiles)]
+        request_keys = [
+            self._request_key(req["text"], language, model, req["max_length"], req["min_length"], variant)
+            for req, language, model, variant in zip(requests, languages, models, variants)
+        ]
+        keys = [self._cache_key(request_key) for request_key in request_keys]
+        uncached = []
+        for index, key in enumerate(keys):
+            cached = summary_cache.get(key) if key is not None else None
+            if cached is not None:
+                results[index] = cached
+            else:
+                uncached.append(index)
+        
+        # Items identical to a call already in flight (or to an earlier item of
+        # this batch) wait for that result instead of generating again
+        own: list[int] = []
+        joined: dict[int, _Flight] = {}
+        duplicates: dict[int, int] = {}  # index -> earlier index of this batch with the same key
+        first: dict[str, int] = {}
+        for index in uncached:
+            request_key = request_keys[index]
+            if settings.COALESCING_ENABLED and request_key in first:
+                duplicates[index] = first[request_key]
+                COALESCED.inc(language=languages[index])
+                continue
+            flight = self._join_flight(request_key, languages[index])
+            if flight is not None:
+                joined[index] = flight
+            else:
+                first[request_key] = index
+                own.append(index)
+        
+        if not own and not joined:
+            return results
+        
+        async def run_long(index: int, dedup: Optional[tuple]):
+            try:
+                req = requests[index]
+                output = await self._map_reduce(
+                    texts[index], req["max_length"], req["min_length"], languages[index], profiles[index], models[index]
+                )
+                results[index] = output
+                self._calibrate(texts[index], languages[index], output)
+                self._remember(keys[index], dedup, output)
+            except Exception as e:
+                results[index] = e
+        
+        async def run_sub_batch(sub: SubBatch, indices: list[int], dedups: dict[int, tuple]):
+            try:
+                outputs = await inference_executor.wait(inference_executor.run(
+                    run_summarize_many,
+                    [texts[i] for i in indices],
+                    sub.max_length,
+                    sub.min_length,
+                    sub.language,
+                    sub.profile,
+                    sub.model
+                ))
+                for index, output in zip(indices, outputs):
+                    results[index] = output
+                    self._calibrate(texts[index], sub.language, output)
+                    self._remember(keys[index], dedups.get(index), output)
+                return
+            except Exception as e:
+                if len(indices) == 1 or isinstance(e, InferenceTimeoutError):
+                    for index in indices:
+                        results[index] = e
+                    return
+                logger.warning(f"Sub-batch of {len(indices)} failed, retrying items one by one: {e}")
+            
+            # Isolate the failing item(s) so the rest of the sub-batch still succeeds
+            for index in indices:
+                await run_sub_batch(sub, [index], dedups)
+        
+        async def compute():
+            """Summarize the items this call owns (near-duplicate reuse, then generation)"""
+            dedups: dict[int, tuple] = {}
+            found = await self._find_near_duplicates(
+                [texts[i] for i in own],
+                [
+                    self._dedup_group(
+                        languages[i], models[i], requests[i]["max_length"], requests[i]["min_length"], variants[i]
+                    )
+                    for i in own
+                ]
+            )
+            misses = []
+            long_misses = []
+            for index, (duplicate, dedup) in zip(own, found):
+                if duplicate is not None:
+                    results[index] = duplicate
+                    if keys[index] is not None:
+                        summary_cache.set(keys[index], duplicate)
+                    continue
+                if dedup is not None:
+                    dedups[index] = dedup
+                if long_candidates[index]:
+                    long_misses.append(index)
+                else:
+                    misses.append(index)
+            
+            if not misses and not long_misses:
+                return
+            
+            cost = sum(
+                admission_controller.estimate(
+                    texts[index], languages[index], requests[index]["max_length"], long_candidates[index]
+                )
+                for index in misses + long_misses
+            )
+            async with admission_controller.admit(cost):
+                with inference_executor.slots(len(misses) + len(long_misses)):
+                    # Candidates that turn out to fit the model join the sub-batches instead of running alone
+                    checks = await asyncio.gather(
+                        *(self._needs_chunking(texts[i], languages[i], models[i]) for i in long_misses),
+                        return_exceptions=True
+                    )
+                    chunked = []
+                    for index, check in zip(long_misses, checks):
+                        if isinstance(check, BaseException):
+                            results[index] = check
+                        elif check:
+                            chunked.append(index)
+                        else:
+                            misses.append(index)
+                    
+                    plan = plan_sub_batches(
+                        [texts[i] for i in misses],
+                        [languages[i] for i in misses],
+                        [(requests[i]["max_length"], requests[i]["min_length"], profiles[i]) for i in misses],
+                        settings.BATCH_SUB_BATCH_SIZE,
+                        settings.BATCH_LENGTH_BUCKETS,
+                        [models[i] for i in misses]
+                    )
+                    await asyncio.gather(
+                        *(run_sub_batch(sub, [misses[i] for i in sub.indices], dedups) for sub in plan),
+                        *(run_long(index, dedups.get(index)) for index in chunked)
+                    )
+        
+        work = None
+        if own:
+            work = asyncio.create_task(compute())
+            if not settings.COALESCING_ENABLED:
+                await work
+                return results
+            
+            loop = asyncio.get_running_loop()
+            futures = [loop.create_future() for _ in own]
+            flights = self._start_flights([request_keys[i] for i in own], work, futures)
+            joined.update(zip(own, flights))
+            
+            def settle(task: asyncio.Task):
+                for index, future in zip(own, futures):
+                    if task.cancelled():
+                        future.cancel()
+                    elif task.exception() is not None:
+                        future.set_exception(task.exception())
+                    elif isinstance(results[index], BaseException):
+                        future.set_exception(results[index])
+                    else:
+                        future.set_result(results[index])
+            
+            work.add_done_callback(settle)
+        
+        outcomes = await asyncio.gather(
+            *(self._wait_flight(flight) for flight in joined.values()), return_exceptions=True
+        )
+        # Admission rejecting this call's own items fails the whole batch, as without coalescing
+        if work is not None and not work.cancelled() and work.exception() is not None:
+            raise work.exception()
+        for index, outcome in zip(joined, outcomes):
+            results[index] = outcome
+        for index, earlier in duplicates.items():
+            outcome = results[earlier]
+            results[index] = outcome if isinstance(outcome, BaseException) else dict(outcome)
+        
+        return results
+    
+    async def shutdown(self):
+        """Stop all batchers"""
+        for batcher in self._batchers.values():
+            await batcher.stop()
+        self._batchers.clear()
+
+
+# Global instance
+batch_scheduler = BatchScheduler()
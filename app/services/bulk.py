@@ -0,0 +1,208 @@
+"""
+Bulk Summarization
+Summarizes a newline-delimited JSON upload item by item while it is still arriving
+"""
+import asyncio
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional
+
+from pydantic import ValidationError
+
+from app.core.config import settings
+from app.models.schemas import SummarizeRequest
+from app.services.batcher import batch_scheduler
+from app.services.executor import InferenceQueueFullError
+from app.services.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+BULK_ITEMS = metrics.counter(
+    "bulk_items_total",
+    "Items of NDJSON bulk uploads by outcome",
+    ("status",)
+)
+
+
+@dataclass
+class BulkItemOutcome:
+    """Result of one line of a bulk upload"""
+    index: int
+    id: Any
+    text: Optional[str] = None
+    result: Optional[dict] = None
+    error: Optional[str] = None
+
+
+async def _lines(body: AsyncIterator[bytes], max_line_bytes: int) -> AsyncIterator[tuple[bytes, bool]]:
+    """
+    Split a streamed body into lines without holding more than one line
+    
+    Yields:
+        (line, too_long) - lines over max_line_bytes are dropped and yielded
+        empty with too_long set, so their position still gets an error
+    """
+    pending: list[bytes] = []  # pieces of the line that is still arriving
+    pending_bytes = 0
+    overflow = False
+    async for chunk in body:
+        *lines, rest = chunk.split(b"\n")
+        for line in lines:
+            if overflow or pending_bytes + len(line) > max_line_bytes:
+                yield b"", True
+            else:
+                yield b"".join(pending) + line, False
+            pending, pending_bytes, overflow = [], 0, False
+        if overflow:
+            continue
+        pending.append(rest)
+        pending_bytes += len(rest)
+        if pending_bytes > max_line_bytes:
+            # Discard the rest of this line as it arrives
+            pending, pending_bytes, overflow = [], 0, True
+    if overflow:
+        yield b"", True
+    elif pending_bytes:
+        yield b"".join(pending), False
+
+
+class BulkSummarizer:
+    """
+    Streams an NDJSON upload through the batch scheduler
+    
+    At most max_in_flight items are summarizing at once; while that many are
+    busy (or their results have not been sent yet) the upload is not read,
+    so memory stays flat however many lines the body has. Items run through
+    BatchScheduler.summarize, so concurrent items share micro-batches and the
+    summary cache.
+    """
+    
+    def __init__(self, max_in_flight: int = 32, max_line_bytes: int = 1_000_000, max_retries: int = 3):
+        self.max_in_flight = max(1, max_in_flight)
+        self.max_line_bytes = max_line_bytes
+        self.max_retries = max_retries
+    
+    def _parse(self, index: int, line: bytes, too_long: bool) -> tuple[Any, Optional[SummarizeRequest], Optional[str]]:
+        """Item id, validated request (None on failure) and error message"""
+        if too_long:
+            return index, None, f"Line is longer than {self.max_line_bytes} bytes"
+        try:
+            data = json.loads(line)
+        except ValueError as e:
+            return index, None, f"Invalid JSON: {e}"
+        if not isinstance(data, dict):
+            return index, None, "Each line must be a JSON object"
+        item_id = data.get("id", index)
+        try:
+            return item_id, SummarizeRequest.model_validate(data), None
+        except ValidationError as e:
+            errors = "; ".join(
+                f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors()
+            )
+            return item_id, None, f"Invalid request: {errors}"
+    
+    async def _summarize(self, request: SummarizeRequest) -> dict:
+        """Summarize one item, waiting out admission control instead of failing the item"""
+        attempt = 0
+        while True:
+            try:
+                return await batch_scheduler.summarize(
+                    text=request.text,
+                    max_length=request.max_length,
+                    min_length=request.min_length,
+                    language=request.language,
+                    long_document=request.long_document,
+                    profile=request.profile,
+                    tier=request.tier
+                )
+            except InferenceQueueFullError as e:
+                attempt += 1
+                if attempt > self.max_retries:
+                    raise
+                await asyncio.sleep(e.retry_after)
+    
+    async def run(
+        self,
+        body: AsyncIterator[bytes],
+        wait_for_disconnect: Optional[Callable[[], Awaitable[None]]] = None
+    ) -> AsyncIterator[BulkItemOutcome]:
+        """
+        Summarize every line of an NDJSON body
+        
+        Args:
+            body: Request body chunks
+            wait_for_disconnect: Returns once the client has gone away; polled
+                after the body ends so abandoned uploads stop early
+        
+        Yields:
+            One outcome per non-empty line, in completion order
+        """
+        outcomes: asyncio.Queue = asyncio.Queue(maxsize=self.max_in_flight)
+        slots = asyncio.Semaphore(self.max_in_flight)
+        tasks: set[asyncio.Task] = set()
+        done = object()
+        
+        async def process(index: int, item_id: Any, request: SummarizeRequest):
+            try:
+                try:
+                    outcome = BulkItemOutcome(index, item_id, request.text, result=await self._summarize(request))
+                    BULK_ITEMS.inc(status="ok")
+                except Exception as e:
+                    logger.error(f"Error in bulk summarization (item {item_id}): {e}")
+                    outcome = BulkItemOutcome(index, item_id, error=f"Error summarizing text: {str(e)}")
+                    BULK_ITEMS.inc(status="error")
+                await outcomes.put(outcome)
+            finally:
+                slots.release()
+        
+        def cancel_items(*_):
+            for task in list(tasks):
+                task.cancel()
+        
+        async def read():
+            index = 0
+            watcher = None
+            try:
+                async for line, too_long in _lines(body, self.max_line_bytes):
+                    if not too_long and not line.strip():
+                        continue
+                    item_id, request, error = self._parse(index, line, too_long)
+                    if request is None:
+                        BULK_ITEMS.inc(status="invalid")
+                        await outcomes.put(BulkItemOutcome(index, item_id, error=error))
+                    else:
+                        await slots.acquire()
+                        task = asyncio.create_task(process(index, item_id, request))
+                        tasks.add(task)
+                        task.add_done_callback(tasks.discard)
+                    index += 1
+                if wait_for_disconnect is not None:
+                    # Nobody reads the results of a client that went away
+                    watcher = asyncio.create_task(wait_for_disconnect())
+                    watcher.add_done_callback(cancel_items)
+            except Exception as e:
+                # e.g. the client disconnected mid-upload
+                logger.warning(f"Bulk upload stopped after {index} items: {e!r}")
+                cancel_items()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if watcher is not None:
+                watcher.remove_done_callback(cancel_items)
+                watcher.cancel()
+            await outcomes.put(done)
+        
+        reader = asyncio.create_task(read())
+        try:
+            while (outcome := await outcomes.get()) is not done:
+                yield outcome
+        finally:
+            reader.cancel()
+            cancel_items()
+
+
+# Global instance
+bulk_summarizer = BulkSummarizer(
+    max_in_flight=settings.BULK_MAX_IN_FLIGHT,
+    max_line_bytes=settings.BULK_MAX_LINE_BYTES,
+    max_retries=settings.BULK_MAX_RETRIES
+)
@@ -0,0 +1,198 @@
+"""
+Content-Addressed Summary Cache
+In-memory LRU/TTL tier with an optional sqlite tier that survives restarts
+"""
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Optional
+
+from app.core.config import settings
+from app.services.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Normalize unicode and collapse whitespace so trivial edits share a key"""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+class SummaryCache:
+    """Two-tier cache of summarization results keyed by content hash"""
+    
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_s: float = 86400,
+        disk_path: str = "",
+        disk_max_entries: int = 100000
+    ):
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self.disk_max_entries = disk_max_entries
+        self._memory: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk: Optional[sqlite3.Connection] = None
+        self._disk_writes = 0
+        self._stats = {"hits": 0, "misses": 0, "memory_hits": 0, "disk_hits": 0, "evictions": 0}
+        
+        if disk_path:
+            self._disk = sqlite3.connect(disk_path, check_same_thread=False)
+            self._disk.execute(
+                "CREATE TABLE IF NOT EXISTS summaries "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL)"
+            )
+            self._disk.commit()
+            logger.info(f"Summary cache disk tier: {disk_path}")
+    
+    @staticmethod
+    def make_key(
+        text: str,
+        language: str,
+        model_name: str,
+        max_length: int,
+        min_length: int,
+        variant: str = ""
+    ) -> str:
+        """
+        Build the content-addressed key for a summarize call
+        
+        Args:
+            text: Input text (normalized before hashing)
+            language: Language code
+            model_name: Model that produces the summary
+            max_length: Maximum length of summary
+            min_length: Minimum length of summary
+            variant: Extra mode that changes the output (e.g. "long")
+        
+        Returns:
+            Hex SHA-256 digest
+        """
+        parts = [normalize_text(text), language, model_name, str(max_length), str(min_length), variant]
+        return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+    
+    def _expired(self, created: float) -> bool:
+        return self.ttl_s > 0 and time.time() - created > self.ttl_s
+    
+    def get(self, key: str) -> Optional[dict]:
+        """Look up a result, promoting disk hits into memory"""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if not self._expired(entry[0]):
+                    self._memory.move_to_end(key)
+                    self._stats["hits"] += 1
+                    self._stats["memory_hits"] += 1
+                    return dict(entry[1])
+                del self._memory[key]
+            
+            if self._disk is not None:
+                row = self._disk.execute(
+                    "SELECT value, created FROM summaries WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and not self._expired(row[1]):
+                    value = json.loads(row[0])
+                    self._put_memory(key, value, row[1])
+                    self._stats["hits"] += 1
+                    self._stats["disk_hits"] += 1
+                    return dict(value)
+            
+            self._stats["misses"] += 1
+            return None
+    
+    def set(self, key: str, value: dict):
+        """Store a result in both tiers"""
+        created = time.time()
+        with self._lock:
+            self._put_memory(key, dict(value), created)
+            if self._disk is not None:
+                self._disk.execute(
+                    "INSERT OR REPLACE INTO summaries (key, value, created) VALUES (?, ?, ?)",
+                    (key, json.dumps(value, ensure_ascii=False), created)
+                )
+                self._disk_writes += 1
+                if self._disk_writes % 100 == 0:
+                    self._prune_disk()
+                self._disk.commit()
+    
+    def _put_memory(self, key: str, value: dict, created: float):
+        """Insert into the LRU tier (caller holds the lock)"""
+        self._memory[key] = (created, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self._stats["evictions"] += 1
+    
+    def _prune_disk(self):
+        """Drop expired rows and keep the disk tier under its size limit (caller holds the lock)"""
+        if self.ttl_s > 0:
+            self._disk.execute("DELETE FROM summaries WHERE created < ?", (time.time() - self.ttl_s,))
+        count = self._disk.execute("SELECT COUNT(*) FROM summaries").fetchone()[0]
+        if count > self.disk_max_entries:
+            self._disk.execute(
+                "DELETE FROM summaries WHERE key IN "
+                "(SELECT key FROM summaries ORDER BY created LIMIT ?)",
+                (count - self.disk_max_entries,)
+            )
+    
+    def stats(self) -> dict:
+        """Hit/miss counters and tier sizes"""
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            disk_size = None
+            if self._disk is not None:
+                disk_size = self._disk.execute("SELECT COUNT(*) FROM summaries").fetchone()[0]
+            return {
+                **self._stats,
+                "hit_rate": round(self._stats["hits"] / lookups, 4) if lookups else 0.0,
+                "memory_size": len(self._memory),
+                "memory_max_entries": self.max_entries,
+                "disk_size": disk_size,
+                "ttl_s": self.ttl_s
+            }
+    
+    def clear(self):
+        """Drop all cached entries"""
+        with self._lock:
+            self._memory.clear()
+            if self._disk is not None:
+                self._disk.execute("DELETE FROM summaries")
+                self._disk.commit()
+
+
+# Global instance
+summary_cache = SummaryCache(
+    max_entries=settings.SUMMARY_CACHE_MAX_ENTRIES,
+    ttl_s=settings.SUMMARY_CACHE_TTL_S,
+    disk_path=settings.SUMMARY_CACHE_DISK_PATH,
+    disk_max_entries=settings.SUMMARY_CACHE_DISK_MAX_ENTRIES
+)
+
+metrics.counter(
+    "summary_cache_lookups_total",
+    "Summary cache lookups by outcome",
+    ("result",),
+    callback=lambda: {
+        (result,): summary_cache._stats[name]
+        for name, result in (("memory_hits", "memory_hit"), ("disk_hits", "disk_hit"), ("misses", "miss"))
+    }
+)
+metrics.counter(
+    "summary_cache_evictions_total",
+    "Entries evicted from the in-memory summary cache",
+    callback=lambda: {(): summary_cache._stats["evictions"]}
+)
+metrics.gauge(
+    "summary_cache_entries",
+    "Entries held in the in-memory summary cache",
+    callback=lambda: {(): len(summary_cache._memory)}
+)
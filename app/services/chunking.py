@@ -0,0 +1,61 @@
+"""
+Token-Aware Text Chunking
+Splits long documents into overlapping chunks measured in model tokens
+"""
+
+
+def count_tokens(tokenizer, text: str) -> int:
+    """Number of tokens in text, without special tokens or truncation"""
+    return len(tokenizer(text, add_special_tokens=False, truncation=False)["input_ids"])
+
+
+def split_into_chunks(tokenizer, text: str, chunk_tokens: int, overlap: int) -> list[str]:
+    """
+    Split text into overlapping chunks of at most chunk_tokens tokens
+    
+    Chunks are cut from the original string using the tokenizer's character
+    offsets, so no text is altered by a decode round-trip.
+    
+    Args:
+        tokenizer: Hugging Face tokenizer of the model that will read the chunks
+        text: Input text
+        chunk_tokens: Maximum tokens per chunk
+        overlap: Tokens shared between consecutive chunks
+    
+    Returns:
+        List of chunk strings (a single item if the text already fits)
+    """
+    chunk_tokens = max(1, chunk_tokens)
+    step = max(1, chunk_tokens - max(0, overlap))
+    
+    if tokenizer.is_fast:
+        encoding = tokenizer(
+            text,
+            add_special_tokens=False,
+            truncation=False,
+            return_offsets_mapping=True
+        )
+        offsets = encoding["offset_mapping"]
+        if len(offsets) <= chunk_tokens:
+            return [text]
+        
+        chunks = []
+        for start in range(0, len(offsets), step):
+            end = min(start + chunk_tokens, len(offsets))
+            chunks.append(text[offsets[start][0]:offsets[end - 1][1]])
+            if end == len(offsets):
+                break
+        return chunks
+    
+    # Slow tokenizers have no offsets - fall back to decoding token windows
+    ids = tokenizer(text, add_special_tokens=False, truncation=False)["input_ids"]
+    if len(ids) <= chunk_tokens:
+        return [text]
+    
+    chunks = []
+    for start in range(0, len(ids), step):
+        end = min(start + chunk_tokens, len(ids))
+        chunks.append(tokenizer.decode(ids[start:end], skip_special_tokens=True))
+        if end == len(ids):
+            break
+    return chunks
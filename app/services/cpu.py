@@ -0,0 +1,169 @@
+"""
+CPU Placement
+Torch thread pools, core pinning and tokenizer threads of the workers that run the models
+"""
+import logging
+import os
+from typing import Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_TOKENIZERS_ENV = "TOKENIZERS_PARALLELISM"
+
+
+def available_cores() -> list[int]:
+    """CPUs this process may run on (its affinity mask, e.g. a container's cpuset)"""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def parse_cpu_set(spec: str) -> list[int]:
+    """
+    Parse a Linux-style CPU list
+    
+    Args:
+        spec: Comma-separated CPUs and ranges, e.g. "0-3,8"
+    
+    Returns:
+        Sorted CPU numbers
+    
+    Raises:
+        ValueError: If the list is empty or malformed
+    """
+    cores = set()
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        first, _, last = part.partition("-")
+        try:
+            start, end = int(first), int(last or first)
+        except ValueError:
+            raise ValueError(f"Invalid CPU set '{spec}', expected e.g. '0-3,8'") from None
+        if start < 0 or end < start:
+            raise ValueError(f"Invalid CPU range '{part}' in '{spec}'")
+        cores.update(range(start, end + 1))
+    if not cores:
+        raise ValueError(f"Empty CPU set '{spec}'")
+    return sorted(cores)
+
+
+def worker_cpu_sets(workers: int) -> list[list[int]]:
+    """
+    Core set of each inference worker
+    
+    INFERENCE_CPU_SETS entries are taken in order (and reused when there are
+    fewer entries than workers). Without them the available cores are cut
+    into contiguous slices of near-equal size, so neighbouring cores (often
+    hyper-threads of one physical core or one cache) serve the same worker.
+    """
+    workers = max(1, workers)
+    if settings.INFERENCE_CPU_SETS:
+        sets = [parse_cpu_set(spec) for spec in settings.INFERENCE_CPU_SETS]
+        return [sets[index % len(sets)] for index in range(workers)]
+    
+    cores = available_cores()
+    if workers >= len(cores):
+        return [[cores[index % len(cores)]] for index in range(workers)]
+    size, extra = divmod(len(cores), workers)
+    sets, start = [], 0
+    for index in range(workers):
+        end = start + size + (1 if index < extra else 0)
+        sets.append(cores[start:end])
+        start = end
+    return sets
+
+
+def worker_threads(workers: int) -> int:
+    """
+    Intra-op threads for each of several workers sharing this process's cores
+    
+    Returns:
+        TORCH_NUM_THREADS when set, otherwise the available cores divided by
+        the number of workers (at least 1); 0 for a single worker, which
+        keeps torch's default
+    """
+    if settings.TORCH_NUM_THREADS > 0:
+        return settings.TORCH_NUM_THREADS
+    if workers <= 1:
+        return 0
+    return max(1, len(available_cores()) // workers)
+
+
+def pin_current_thread(cores: list[int]) -> bool:
+    """
+    Restrict the calling thread to a core set
+    
+    Threads it starts afterwards (torch's intra-op pool for example) inherit
+    the mask, so this must run before the worker's first inference.
+    
+    Returns:
+        Whether pinning is supported and succeeded
+    """
+    if not hasattr(os, "sched_setaffinity"):
+        logger.warning("CPU affinity is not supported on this platform, workers are not pinned")
+        return False
+    try:
+        # pid 0 is the calling thread on Linux
+        os.sched_setaffinity(0, cores)
+    except OSError as e:
+        logger.warning(f"Could not pin inference worker to CPUs {cores}: {e}")
+        return False
+    return True
+
+
+def place_worker(index: int, workers: int, own_process: bool) -> Optional[list[int]]:
+    """
+    Pin an inference worker to its cores and size its torch thread pool
+    
+    Called by the worker itself: the process pool initializer or the first
+    task of an inference thread.
+    
+    Args:
+        index: Worker number, 0-based
+        workers: Number of inference workers
+        own_process: Whether the worker is a process of its own; only then
+            does it size its torch thread pool itself (threads share the
+            process-wide value set by configure_threads)
+    
+    Returns:
+        The cores the worker was pinned to, or None when not pinned
+    """
+    cores = None
+    if settings.INFERENCE_CPU_AFFINITY:
+        cores = worker_cpu_sets(workers)[index % max(1, workers)]
+        if pin_current_thread(cores):
+            logger.info(f"Inference worker {index} pinned to CPUs {cores}")
+        else:
+            cores = None
+    
+    if own_process:
+        from app.services.backends import configure_threads
+        
+        # Each worker process otherwise starts one thread per core of the machine
+        configure_threads(len(cores) if cores and settings.TORCH_NUM_THREADS <= 0 else 0)
+    return cores
+
+
+def configure_tokenizers():
+    """
+    Apply TOKENIZERS_PARALLELISM to the environment before tokenizers run
+    
+    'auto' turns the Rust tokenizer's thread pool off when batches are
+    encoded or several workers share the machine, where its threads would
+    compete with torch's for the same cores.
+    """
+    mode = settings.TOKENIZERS_PARALLELISM.lower()
+    if mode not in ("auto", "true", "false"):
+        raise ValueError(f"Unknown TOKENIZERS_PARALLELISM '{mode}', expected 'auto', 'true' or 'false'")
+    if mode == "auto":
+        if not (settings.BATCHING_ENABLED or settings.INFERENCE_WORKERS > 1):
+            # Left to tokenizers; "auto" itself would read as enabled
+            if os.environ.get(_TOKENIZERS_ENV, "").lower() == "auto":
+                del os.environ[_TOKENIZERS_ENV]
+            return
+        mode = "false"
+    os.environ[_TOKENIZERS_ENV] = mode
@@ -0,0 +1,216 @@
+"""
+Near-Duplicate Index
+MinHash signatures with LSH banding, so reprints and lightly edited copies of a summarized text reuse its summary
+"""
+import threading
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.cache import normalize_text
+from app.services.metrics import metrics
+
+# Seeds the MinHash permutations: (a * x + b) >> 32 with odd a is a universal hash family on 64-bit wrap-around arithmetic
+_SEED = 1
+# Shingles hashed against all permutations at once; bounds the temporary matrix
+_SHINGLE_BLOCK = 4096
+_ROLLING_BASE = np.uint64(1_000_003)
+
+
+@dataclass
+class _Entry:
+    """A summarized text in the index"""
+    group: str
+    signature: np.ndarray
+    result: dict
+    buckets: list[tuple]
+
+
+def _choose_bands(num_perm: int, threshold: float) -> int:
+    """
+    Number of LSH bands for a similarity threshold
+    
+    A pair with Jaccard similarity s shares a bucket with probability
+    1 - (1 - s^r)^b; its steepest point sits near (1/b)^(1/r). The band
+    count whose point is closest below the threshold keeps misses rare and
+    leaves the exact check to the signatures.
+    """
+    best = 1
+    for bands in range(1, num_perm + 1):
+        if num_perm % bands:
+            continue
+        rows = num_perm // bands
+        if (1 / bands) ** (1 / rows) <= threshold:
+            return bands
+        best = bands
+    return best
+
+
+class NearDuplicateIndex:
+    """
+    Bounded LRU index of summarized texts, searchable by estimated Jaccard similarity
+    
+    Texts are normalized (unicode, case, whitespace) and cut into character
+    shingles, which works for Thai as well as space-separated languages.
+    Each entry belongs to a group (language, model and generation params), so
+    a summary is only reused for a request that would have produced it.
+    """
+    
+    def __init__(
+        self,
+        threshold: float = 0.85,
+        num_perm: int = 128,
+        shingle_size: int = 5,
+        max_entries: int = 10000,
+        min_chars: int = 200
+    ):
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.max_entries = max_entries
+        self.min_chars = min_chars
+        self.bands = _choose_bands(num_perm, threshold)
+        self.rows = num_perm // self.bands
+        
+        rng = np.random.default_rng(_SEED)
+        self._a = rng.integers(1, 2 ** 63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2 ** 63, size=num_perm, dtype=np.uint64)
+        self._powers = _ROLLING_BASE ** np.arange(shingle_size - 1, -1, -1, dtype=np.uint64)
+        
+        self._entries: OrderedDict[int, _Entry] = OrderedDict()
+        self._buckets: dict[tuple, set[int]] = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+    
+    def applies_to(self, text: str) -> bool:
+        """Whether a text is long enough for near-duplicate matching to be safe"""
+        return len(text) >= self.min_chars
+    
+    def signature(self, text: str) -> np.ndarray:
+        """
+        MinHash signature of a text
+        
+        Shingles are hashed with a vectorized rolling hash over code points,
+        then every permutation's minimum is taken block by block.
+        
+        Returns:
+            num_perm uint32 values
+        """
+        normalized = unicodedata.normalize("NFKC", normalize_text(text)).lower()
+        points = np.frombuffer(normalized.encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+        size = min(self.shingle_size, len(points))
+        count = len(points) - size + 1
+        
+        shingles = np.zeros(max(count, 0), dtype=np.uint64)
+        for offset, power in enumerate(self._powers[-size:] if size else []):
+            shingles += points[offset:offset + count] * power
+        shingles = np.unique(shingles)
+        
+        minimum = np.full(self.num_perm, np.iinfo(np.uint64).max, dtype=np.uint64)
+        for start in range(0, len(shingles), _SHINGLE_BLOCK):
+            block = shingles[start:start + _SHINGLE_BLOCK, None]
+            hashed = (block * self._a + self._b) >> np.uint64(32)
+            np.minimum(minimum, hashed.min(axis=0), out=minimum)
+        return minimum.astype(np.uint32)
+    
+    def _bucket_keys(self, group: str, signature: np.ndarray) -> list[tuple]:
+        return [
+            (group, band, signature[band * self.rows:(band + 1) * self.rows].tobytes())
+            for band in range(self.bands)
+        ]
+    
+    def lookup(self, group: str, signature: np.ndarray) -> Optional[tuple[dict, float]]:
+        """
+        Find the most similar summarized text of the same group
+        
+        Returns:
+            (stored result, estimated Jaccard similarity) for the best
+            candidate at or above the threshold, or None
+        """
+        with self._lock:
+            candidates = set()
+            for key in self._bucket_keys(group, signature):
+                candidates.update(self._buckets.get(key, ()))
+            
+            best_id, best_score = None, 0.0
+            for entry_id in candidates:
+                score = float(np.mean(self._entries[entry_id].signature == signature))
+                if score > best_score:
+                    best_id, best_score = entry_id, score
+            
+            if best_id is None or best_score < self.threshold:
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(best_id)
+            self._stats["hits"] += 1
+            return dict(self._entries[best_id].result), round(best_score, 4)
+    
+    def add(self, group: str, signature: np.ndarray, result: dict):
+        """Index a freshly summarized text, evicting the least recently used entries over max_entries"""
+        with self._lock:
+            entry_id = self._next_id
+            self._next_id += 1
+            buckets = self._bucket_keys(group, signature)
+            self._entries[entry_id] = _Entry(group, signature, dict(result), buckets)
+            for key in buckets:
+                self._buckets.setdefault(key, set()).add(entry_id)
+            
+            while len(self._entries) > self.max_entries:
+                old_id, old = self._entries.popitem(last=False)
+                for key in old.buckets:
+                    members = self._buckets.get(key)
+                    if members is not None:
+                        members.discard(old_id)
+                        if not members:
+                            del self._buckets[key]
+                self._stats["evictions"] += 1
+    
+    def stats(self) -> dict:
+        """Hit/miss counters, size and LSH shape"""
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "hit_rate": round(self._stats["hits"] / lookups, 4) if lookups else 0.0,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "threshold": self.threshold,
+                "bands": self.bands,
+                "rows": self.rows
+            }
+    
+    def clear(self):
+        """Drop all indexed texts"""
+        with self._lock:
+            self._entries.clear()
+            self._buckets.clear()
+
+
+# Global instance
+near_duplicate_index = NearDuplicateIndex(
+    threshold=settings.DEDUP_THRESHOLD,
+    num_perm=settings.DEDUP_NUM_PERM,
+    shingle_size=settings.DEDUP_SHINGLE_SIZE,
+    max_entries=settings.DEDUP_MAX_ENTRIES,
+    min_chars=settings.DEDUP_MIN_CHARS
+)
+
+metrics.counter(
+    "near_duplicate_lookups_total",
+    "Near-duplicate index lookups by outcome",
+    ("result",),
+    callback=lambda: {
+        ("hit",): near_duplicate_index._stats["hits"],
+        ("miss",): near_duplicate_index._stats["misses"]
+    }
+)
+metrics.gauge(
+    "near_duplicate_entries",
+    "Summarized texts held in the near-duplicate index",
+    callback=lambda: {(): len(near_duplicate_index._entries)}
+)
@@ -0,0 +1,224 @@
+"""
+Inference Executor
+Runs blocking model calls off the event loop with a bounded queue depth
+"""
+import asyncio
+import itertools
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+from app.core.config import settings
+from app.services.cpu import place_worker
+from app.services.metrics import metrics
+from app.services.model_host import model_host_client
+from app.services.summarizer import run_warm_up, summarizer_service
+
+logger = logging.getLogger(__name__)
+
+
+class InferenceQueueFullError(Exception):
+    """Raised when too many requests are already waiting for inference"""
+    
+    status_code = 503
+    
+    def __init__(self, retry_after: int, message: str = "Inference queue is full, please retry later"):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class InferenceTimeoutError(Exception):
+    """Raised when a request does not finish within the inference timeout"""
+
+
+# Set in each worker process by _init_worker
+_warmed_workers = None
+_warm_up_steps: list[dict] = []
+
+
+def _init_worker(worker_count, warmed_workers):
+    """Inference worker process setup - pin to its cores, size torch threads, buffer metrics for the parent and warm up"""
+    global _warmed_workers, _warm_up_steps
+    with worker_count.get_lock():
+        index = worker_count.value
+        worker_count.value += 1
+    place_worker(index, max(1, settings.INFERENCE_WORKERS), own_process=True)
+    metrics.start_buffering()
+    
+    # Warming up in a task would not reach every process - the pool may hand all tasks to one worker
+    if settings.MODEL_WARMUP_LANGUAGES:
+        _warm_up_steps = run_warm_up(settings.MODEL_WARMUP_LANGUAGES, settings.WARMUP_INPUT_TOKENS)
+    _warmed_workers = warmed_workers
+    with warmed_workers.get_lock():
+        warmed_workers.value += 1
+
+
+def worker_warm_up_steps() -> list[dict]:
+    """
+    Warm-up steps of the worker process that runs this, once every worker has warmed up
+    
+    Blocks until all INFERENCE_WORKERS pool initializers have finished, so
+    it only returns when each worker process is warm. Submit one call per
+    worker: the pool starts a process per pending call.
+    """
+    while _warmed_workers.value < max(1, settings.INFERENCE_WORKERS):
+        time.sleep(0.05)
+    return _warm_up_steps
+
+
+def _init_thread(indexes: Iterator[int]):
+    """Inference thread setup - pin to its cores before torch starts threads for it"""
+    place_worker(next(indexes), max(1, settings.INFERENCE_WORKERS), own_process=False)
+
+
+def _call_with_metrics(fn: Callable, *args) -> tuple:
+    """Run fn in a worker process and return its result with the metrics it recorded"""
+    return fn(*args), metrics.drain()
+
+
+class InferenceExecutor:
+    """Bounded thread or process pool for model inference"""
+    
+    def __init__(self):
+        self._pool: Optional[Executor] = None
+        self._depth = 0
+    
+    def _get_pool(self) -> Executor:
+        """Create the worker pool on first use"""
+        if self._pool is None:
+            workers = max(1, settings.INFERENCE_WORKERS)
+            if settings.INFERENCE_EXECUTOR == "process":
+                # spawn avoids forking a process that already holds torch threads
+                context = multiprocessing.get_context("spawn")
+                self._pool = ProcessPoolExecutor(
+                    max_workers=workers,
+                    mp_context=context,
+                    initializer=_init_worker,
+                    initargs=(context.Value("i", 0), context.Value("i", 0))
+                )
+            elif settings.INFERENCE_EXECUTOR == "remote":
+                # Threads only wait on the model host; the host bounds the real concurrency
+                self._pool = ThreadPoolExecutor(
+                    max_workers=workers,
+                    thread_name_prefix="model-host-client"
+                )
+            else:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=workers,
+                    thread_name_prefix="inference",
+                    initializer=_init_thread,
+                    initargs=(itertools.count(),)
+                )
+            logger.info(f"Inference executor started: {settings.INFERENCE_EXECUTOR} x{workers}")
+        return self._pool
+    
+    @property
+    def depth(self) -> int:
+        """Number of requests currently queued or running"""
+        return self._depth
+    
+    def reserve(self, count: int = 1):
+        """
+        Reserve queue slots for a request
+        
+        Args:
+            count: Number of texts the request will send to the model
+        
+        Raises:
+            InferenceQueueFullError: If the reservation would exceed INFERENCE_QUEUE_LIMIT
+        """
+        if self._depth + count > settings.INFERENCE_QUEUE_LIMIT:
+            raise InferenceQueueFullError(settings.INFERENCE_RETRY_AFTER_S)
+        self._depth += count
+    
+    def release(self, count: int = 1):
+        """Give back slots taken with reserve()"""
+        self._depth -= count
+    
+    @contextmanager
+    def slots(self, count: int = 1):
+        """Reserve queue slots for the duration of a block (see reserve())"""
+        self.reserve(count)
+        try:
+            yield
+        finally:
+            self.release(count)
+    
+    async def run(self, fn: Callable, *args):
+        """
+        Run a blocking function in the inference pool
+        
+        Args:
+            fn: Module-level callable (must be picklable for the process pool)
+            *args: Positional arguments for fn
+        
+        Returns:
+            The return value of fn
+        """
+        loop = asyncio.get_running_loop()
+        if settings.INFERENCE_EXECUTOR == "remote":
+            return await loop.run_in_executor(self._get_pool(), model_host_client.call, fn, *args)
+        if settings.INFERENCE_EXECUTOR == "process":
+            # Worker processes cannot serve /metrics, so their observations come back with the result
+            result, events = await loop.run_in_executor(self._get_pool(), _call_with_metrics, fn, *args)
+            metrics.replay(events)
+            return result
+        return await loop.run_in_executor(self._get_pool(), fn, *args)
+    
+    async def stream(
+        self,
+        text: str,
+        max_length: int,
+        min_length: int,
+        language: str,
+        on_text: Callable[[str], None],
+        stop_event: threading.Event,
+        model: Optional[str] = None
+    ) -> dict:
+        """
+        Summarize while streaming text pieces (see SummarizerService.summarize_stream)
+        
+        on_text is called from another thread. The model runs in the inference
+        pool in thread mode, in a thread of this process in process mode (the
+        callback must share memory with the event loop) and on the model host
+        in remote mode.
+        """
+        args = (text, max_length, min_length, language, on_text, stop_event, model)
+        if settings.INFERENCE_EXECUTOR == "remote":
+            return await asyncio.to_thread(model_host_client.stream, *args)
+        if settings.INFERENCE_EXECUTOR == "process":
+            return await asyncio.to_thread(summarizer_service.summarize_stream, *args)
+        return await self.run(summarizer_service.summarize_stream, *args)
+    
+    async def wait(self, awaitable, timeout: Optional[float] = None):
+        """
+        Await an inference result with the per-request timeout
+        
+        Raises:
+            InferenceTimeoutError: If the result is not ready in time
+        """
+        timeout = timeout or settings.INFERENCE_TIMEOUT_S
+        try:
+            return await asyncio.wait_for(awaitable, timeout)
+        except asyncio.TimeoutError:
+            raise InferenceTimeoutError(f"Inference did not finish within {timeout}s")
+    
+    def shutdown(self):
+        """Stop the worker pool"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+# Global instance
+inference_executor = InferenceExecutor()
+
+metrics.gauge(
+    "inference_queue_depth",
+    "Requests queued or running in the inference executor",
+    callback=lambda: {(): inference_executor.depth}
+)
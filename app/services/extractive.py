@@ -0,0 +1,165 @@
+"""
+Extractive Pre-filter
+Keeps the most central sentences of a long input (TextRank over TF-IDF vectors) so the model reads less redundant text
+"""
+import re
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+import numpy as np
+
+# Sentence ends: Latin punctuation, line breaks, and spaces between Thai words
+# (Thai writes no full stop; a space marks the end of a clause or sentence)
+_BOUNDARY = re.compile(r"(?<=[.!?])\s+|\s*\n\s*|(?<=[\u0E00-\u0E7F])\s+(?=[\u0E00-\u0E7F])")
+# Thai runs first so Thai letters never fall into the generic word pattern
+_TERM = re.compile(r"[\u0E00-\u0E7F]+|[^\W_]+")
+_THAI = re.compile(r"[\u0E00-\u0E7F]")
+
+# Thai clauses split at every space are often a few words; shorter pieces join the next one
+MIN_SENTENCE_CHARS = 40
+DAMPING = 0.85
+MAX_ITERATIONS = 50
+TOLERANCE = 1e-6
+# A candidate this similar (cosine) to a kept sentence repeats it and is skipped
+REDUNDANCY_THRESHOLD = 0.8
+
+
+@dataclass
+class Extraction:
+    """Sentences kept by the pre-filter"""
+    text: str
+    sentences: int
+    kept: int
+    pruned_tokens: int
+
+
+def split_sentences(text: str, min_chars: int = MIN_SENTENCE_CHARS) -> list[str]:
+    """
+    Split English or Thai text into sentences
+    
+    Pieces shorter than min_chars are joined with the following piece, so
+    short Thai clauses and abbreviations do not become sentences of their own.
+    """
+    sentences = []
+    current = ""
+    for piece in _BOUNDARY.split(text):
+        piece = piece.strip()
+        if not piece:
+            continue
+        current = f"{current} {piece}" if current else piece
+        if len(current) >= min_chars:
+            sentences.append(current)
+            current = ""
+    if current:
+        if sentences:
+            sentences[-1] = f"{sentences[-1]} {current}"
+        else:
+            sentences.append(current)
+    return sentences
+
+
+def _terms(sentence: str) -> list[str]:
+    """Lower-cased words; Thai runs (no spaces between words) become character bigrams"""
+    terms = []
+    for match in _TERM.finditer(sentence.lower()):
+        term = match.group()
+        if _THAI.match(term) and len(term) > 2:
+            terms.extend(term[i:i + 2] for i in range(len(term) - 1))
+        else:
+            terms.append(term)
+    return terms
+
+
+def similarity_matrix(sentences: list[str]) -> np.ndarray:
+    """Cosine similarity of every pair of sentences as L2-normalised TF-IDF rows (one matrix product)"""
+    count = len(sentences)
+    vocabulary: dict[str, int] = {}
+    rows, columns = [], []
+    for row, sentence in enumerate(sentences):
+        for term in _terms(sentence):
+            rows.append(row)
+            columns.append(vocabulary.setdefault(term, len(vocabulary)))
+    counts = np.zeros((count, max(1, len(vocabulary))), dtype=np.float32)
+    np.add.at(counts, (rows, columns), 1.0)
+    
+    document_frequency = (counts > 0).sum(axis=0)
+    vectors = np.log1p(counts) * (np.log((1 + count) / (1 + document_frequency)) + 1).astype(np.float32)
+    vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+    return vectors @ vectors.T
+
+
+def score_sentences(similarity: np.ndarray) -> np.ndarray:
+    """
+    TextRank centrality of each sentence
+    
+    The scores are the stationary distribution of a random walk over the
+    similarity graph, found by power iteration.
+    """
+    count = similarity.shape[0]
+    if count < 2:
+        return np.ones(count, dtype=np.float32)
+    
+    weights = similarity.copy()
+    np.fill_diagonal(weights, 0.0)
+    totals = weights.sum(axis=1, keepdims=True)
+    # Sentences sharing no term with any other jump uniformly
+    transition = np.divide(weights, totals, out=np.full_like(weights, 1.0 / count), where=totals > 0)
+    
+    scores = np.full(count, 1.0 / count, dtype=np.float32)
+    for _ in range(MAX_ITERATIONS):
+        updated = (1 - DAMPING) / count + DAMPING * (transition.T @ scores)
+        converged = np.abs(updated - scores).sum() < TOLERANCE
+        scores = updated
+        if converged:
+            break
+    return scores
+
+
+def extract_sentences(
+    text: str,
+    token_counts: Callable[[list[str]], list[int]],
+    budget: int
+) -> Optional[Extraction]:
+    """
+    Keep the highest-scoring sentences that fit a token budget
+    
+    Near-duplicates of an already kept sentence are skipped, so the budget
+    goes to different content rather than to repeats of the central one.
+    
+    Args:
+        text: Input text
+        token_counts: Returns the model token count of each sentence
+        budget: Tokens the kept sentences may use together
+    
+    Returns:
+        The kept sentences in their original order, or None when the text
+        has too few sentences to choose from or already fits
+    """
+    sentences = split_sentences(text)
+    if len(sentences) < 2:
+        return None
+    lengths = token_counts(sentences)
+    total = sum(lengths)
+    if total <= budget:
+        return None
+    
+    similarity = similarity_matrix(sentences)
+    scores = score_sentences(similarity)
+    kept, used = [], 0
+    for index in np.argsort(-scores, kind="stable"):
+        if used + lengths[index] > budget:
+            continue
+        if kept and similarity[index, kept].max() >= REDUNDANCY_THRESHOLD:
+            continue
+        kept.append(int(index))
+        used += lengths[index]
+    if not kept:
+        return None
+    kept.sort()
+    
+    return Extraction(
+        text=" ".join(sentences[index] for index in kept),
+        sentences=len(sentences),
+        kept=len(kept),
+        pruned_tokens=total - used
+    )
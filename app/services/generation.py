@@ -0,0 +1,54 @@
+"""
+Generation Profiles
+Named decoding settings that trade summary quality for speed
+"""
+from typing import Optional
+
+from app.core.config import settings
+
+# Profile used instead of an assisted one when the model has no draft model
+ASSISTED_FALLBACK = "fast"
+
+# Beam-search options from the model's generation config that greedy search
+# would only warn about
+_GREEDY_RESETS = {"early_stopping": False, "length_penalty": 1.0}
+
+
+def resolve_profile(profile: Optional[str], model_name: str) -> str:
+    """
+    Name of the profile a call actually runs with
+    
+    Args:
+        profile: Requested profile, or None for GENERATION_PROFILE
+        model_name: Model that will generate the summary
+    
+    Returns:
+        The profile name; an assisted profile falls back to "fast" when
+        ASSISTANT_MODELS has no draft model for model_name
+    
+    Raises:
+        ValueError: If the profile is not in GENERATION_PROFILES
+    """
+    profile = profile or settings.GENERATION_PROFILE
+    if profile not in settings.GENERATION_PROFILES:
+        raise ValueError(
+            f"Unknown generation profile '{profile}', expected one of {sorted(settings.GENERATION_PROFILES)}"
+        )
+    if settings.GENERATION_PROFILES[profile].get("assistant") and model_name not in settings.ASSISTANT_MODELS:
+        return ASSISTED_FALLBACK
+    return profile
+
+
+def generation_kwargs(profile: str) -> dict:
+    """Keyword arguments for model.generate (on top of the model's generation config)"""
+    kwargs = {key: value for key, value in settings.GENERATION_PROFILES[profile].items() if key != "assistant"}
+    if kwargs.get("num_beams") == 1:
+        kwargs = {**_GREEDY_RESETS, **kwargs}
+    return kwargs
+
+
+def assistant_model_for(profile: str, model_name: str) -> Optional[str]:
+    """Draft model for assisted decoding, or None if the profile does not use one"""
+    if not settings.GENERATION_PROFILES[profile].get("assistant"):
+        return None
+    return settings.ASSISTANT_MODELS.get(model_name)
@@ -0,0 +1,49 @@
+"""
+Generation Hooks
+Streamer, stopping criterion and logits processor passed to model.generate
+"""
+import threading
+from typing import Callable, Union
+
+import torch
+from transformers import LogitsProcessor, StoppingCriteria, TextStreamer
+
+
+class CallbackStreamer(TextStreamer):
+    """Streamer that hands each decoded piece of text to a callback"""
+    
+    def __init__(self, tokenizer, on_text: Callable[[str], None]):
+        super().__init__(tokenizer, skip_prompt=False, skip_special_tokens=True)
+        self._on_text = on_text
+    
+    def on_finalized_text(self, text: str, stream_end: bool = False):
+        if text:
+            self._on_text(text)
+
+
+class StopOnEvent(StoppingCriteria):
+    """Stops generation once the event is set (e.g. the client disconnected)"""
+    
+    def __init__(self, event: threading.Event):
+        self._event = event
+    
+    def __call__(self, input_ids, scores, **kwargs):
+        return torch.full((input_ids.shape[0],), self._event.is_set(), dtype=torch.bool)
+
+
+class SuppressEosBelowLength(LogitsProcessor):
+    """
+    Blocks end-of-sequence until the output has min_length tokens
+    
+    Same effect as generate(min_length=...), which assisted decoding refuses.
+    """
+    
+    def __init__(self, min_length: int, eos_token_id: Union[int, list[int]]):
+        self.min_length = min_length
+        self.eos_token_ids = [eos_token_id] if isinstance(eos_token_id, int) else list(eos_token_id)
+    
+    def __call__(self, input_ids, scores):
+        if input_ids.shape[-1] < self.min_length:
+            scores = scores.clone()
+            scores[:, self.eos_token_ids] = -float("inf")
+        return scores
@@ -0,0 +1,317 @@
+"""
+Background Summarization Jobs
+sqlite-backed job store and asyncio workers that process batches in chunks
+"""
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from enum import Enum
+from typing import Optional
+
+from app.core.config import settings
+from app.services.batcher import batch_scheduler
+from app.services.executor import InferenceQueueFullError
+
+logger = logging.getLogger(__name__)
+
+
+class JobStatus(str, Enum):
+    """Lifecycle state of a job"""
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class JobStore:
+    """Persistent store of jobs and their items (blocking - call it off the event loop)"""
+    
+    def __init__(self, path: str):
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._db.executescript(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                " id TEXT PRIMARY KEY, status TEXT NOT NULL, total INTEGER NOT NULL,"
+                " completed INTEGER NOT NULL DEFAULT 0, failed INTEGER NOT NULL DEFAULT 0,"
+                " created REAL NOT NULL, updated REAL NOT NULL, error TEXT, owner TEXT);"
+                "CREATE TABLE IF NOT EXISTS job_items ("
+                " job_id TEXT NOT NULL, idx INTEGER NOT NULL, request TEXT NOT NULL,"
+                " done INTEGER NOT NULL DEFAULT 0, result TEXT, error TEXT,"
+                " PRIMARY KEY (job_id, idx));"
+            )
+            # Stores created before jobs could fail or be claimed lack these columns
+            columns = [row[1] for row in self._db.execute("PRAGMA table_info(jobs)")]
+            if "error" not in columns:
+                self._db.execute("ALTER TABLE jobs ADD COLUMN error TEXT")
+            if "owner" not in columns:
+                self._db.execute("ALTER TABLE jobs ADD COLUMN owner TEXT")
+            self._db.commit()
+        logger.info(f"Job store: {path}")
+    
+    def create(self, requests: list[dict]) -> str:
+        """Store a new queued job and return its id"""
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO jobs (id, status, total, created, updated) VALUES (?, ?, ?, ?, ?)",
+                (job_id, JobStatus.QUEUED.value, len(requests), now, now)
+            )
+            self._db.executemany(
+                "INSERT INTO job_items (job_id, idx, request) VALUES (?, ?, ?)",
+                [
+                    (job_id, index, json.dumps(request, ensure_ascii=False))
+                    for index, request in enumerate(requests)
+                ]
+            )
+            self._db.commit()
+        return job_id
+    
+    def get(self, job_id: str) -> Optional[dict]:
+        """Job status and progress counters, or None if unknown"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT id, status, total, completed, failed, created, updated, error FROM jobs WHERE id = ?",
+                (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return dict(zip(("id", "status", "total", "completed", "failed", "created", "updated", "error"), row))
+    
+    def set_status(self, job_id: str, status: JobStatus, error: Optional[str] = None):
+        """Move a job to another lifecycle state (error explains a failed job)"""
+        with self._lock:
+            self._db.execute(
+                "UPDATE jobs SET status = ?, error = ?, updated = ? WHERE id = ?",
+                (status.value, error, time.time(), job_id)
+            )
+            self._db.commit()
+    
+    def claim(self, job_id: str, owner: str, lease_s: float) -> bool:
+        """
+        Atomically take a job for one worker
+        
+        Several processes share the store, so a job is only processed by the
+        one whose update matched: a queued job, or a running job whose owner
+        has not saved anything for lease_s seconds (its process died).
+        
+        Args:
+            job_id: Job id
+            owner: Id of the claiming JobManager
+            lease_s: Seconds without progress after which a running job is abandoned
+        
+        Returns:
+            True if this owner now runs the job
+        """
+        now = time.time()
+        with self._lock:
+            claimed = self._db.execute(
+                "UPDATE jobs SET status = ?, owner = ?, updated = ? "
+                "WHERE id = ? AND (status = ? OR (status = ? AND updated < ?))",
+                (
+                    JobStatus.RUNNING.value, owner, now, job_id,
+                    JobStatus.QUEUED.value, JobStatus.RUNNING.value, now - lease_s
+                )
+            ).rowcount
+            self._db.commit()
+        return claimed == 1
+    
+    def release(self, owner: str):
+        """Put an owner's running jobs back in the queue so any worker can resume them"""
+        with self._lock:
+            self._db.execute(
+                "UPDATE jobs SET status = ?, owner = NULL, updated = ? WHERE owner = ? AND status = ?",
+                (JobStatus.QUEUED.value, time.time(), owner, JobStatus.RUNNING.value)
+            )
+            self._db.commit()
+    
+    def pending_items(self, job_id: str, limit: int) -> list[tuple[int, dict]]:
+        """Next unfinished items of a job as (index, request) pairs"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT idx, request FROM job_items WHERE job_id = ? AND done = 0 ORDER BY idx LIMIT ?",
+                (job_id, limit)
+            ).fetchall()
+        return [(index, json.loads(request)) for index, request in rows]
+    
+    def save_results(self, job_id: str, outcomes: list[tuple[int, Optional[dict], Optional[str]]]):
+        """
+        Mark items finished and update the job counters in one transaction
+        
+        Items that are already finished are left alone and not counted again,
+        so completed + failed never exceeds total.
+        
+        Args:
+            job_id: Job id
+            outcomes: (index, result, error) per item - exactly one of result/error is set
+        """
+        completed = failed = 0
+        with self._lock:
+            for index, result, error in outcomes:
+                updated = self._db.execute(
+                    "UPDATE job_items SET done = 1, result = ?, error = ? WHERE job_id = ? AND idx = ? AND done = 0",
+                    (json.dumps(result, ensure_ascii=False) if result is not None else None, error, job_id, index)
+                ).rowcount
+                if error is None:
+                    completed += updated
+                else:
+                    failed += updated
+            self._db.execute(
+                "UPDATE jobs SET completed = completed + ?, failed = failed + ?, updated = ? WHERE id = ?",
+                (completed, failed, time.time(), job_id)
+            )
+            self._db.commit()
+    
+    def results(self, job_id: str, offset: int, limit: int) -> list[dict]:
+        """Finished items of a job in index order, paginated"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT idx, request, result, error FROM job_items "
+                "WHERE job_id = ? AND done = 1 ORDER BY idx LIMIT ? OFFSET ?",
+                (job_id, limit, offset)
+            ).fetchall()
+        return [
+            {
+                "index": index,
+                "text": json.loads(request)["text"],
+                "result": json.loads(result) if result is not None else None,
+                "error": error
+            }
+            for index, request, result, error in rows
+        ]
+    
+    def unfinished(self, lease_s: float) -> list[str]:
+        """Ids of jobs that are queued or whose running owner stopped making progress, oldest first"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id FROM jobs WHERE status = ? OR (status = ? AND updated < ?) ORDER BY created",
+                (JobStatus.QUEUED.value, JobStatus.RUNNING.value, time.time() - lease_s)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+
+class JobManager:
+    """
+    Runs stored jobs chunk by chunk on background asyncio workers
+    
+    Every HTTP worker process has its own manager over the shared store;
+    a job is claimed in the store before it runs, so only one of them
+    processes it.
+    """
+    
+    def __init__(self):
+        self._owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._store: Optional[JobStore] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: list[asyncio.Task] = []
+    
+    @property
+    def store(self) -> JobStore:
+        """The job store (opened on first use; call its methods through asyncio.to_thread)"""
+        if self._store is None:
+            self._store = JobStore(settings.JOBS_DB_PATH)
+        return self._store
+    
+    async def start(self):
+        """Start the workers and requeue jobs left unfinished by the previous run"""
+        self._queue = asyncio.Queue()
+        for job_id in await asyncio.to_thread(lambda: self.store.unfinished(settings.JOBS_LEASE_S)):
+            self._queue.put_nowait(job_id)
+        self._workers = [
+            asyncio.create_task(self._run()) for _ in range(max(1, settings.JOBS_WORKERS))
+        ]
+    
+    async def submit(self, requests: list[dict]) -> str:
+        """
+        Store a job and queue it for the workers
+        
+        Args:
+            requests: Dictionaries with text, max_length, min_length, language
+                and optionally long_document
+        
+        Returns:
+            The new job id
+        """
+        job_id = await asyncio.to_thread(lambda: self.store.create(requests))
+        await self._queue.put(job_id)
+        return job_id
+    
+    async def _run(self):
+        """Worker loop - one job at a time"""
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._process(job_id)
+            except Exception as e:
+                # Reported by GET /jobs/{job_id}; a shutdown (cancellation) instead leaves it to resume
+                logger.error(f"Error processing job {job_id}: {e}")
+                try:
+                    await asyncio.to_thread(self.store.set_status, job_id, JobStatus.FAILED, f"Error processing job: {e}")
+                except Exception as store_error:
+                    logger.error(f"Could not mark job {job_id} failed: {store_error}")
+    
+    async def _summarize_chunk(self, requests: list[dict]) -> list:
+        """
+        Summarize one chunk, backing off while interactive traffic fills the queue
+        
+        Returns:
+            One result or exception per request; after JOBS_MAX_RETRIES
+            rejections in a row every item gets the rejection, so a queue that
+            never drains cannot hold the worker forever
+        """
+        attempt = 0
+        while True:
+            try:
+                return await batch_scheduler.summarize_batch(requests)
+            except InferenceQueueFullError as e:
+                attempt += 1
+                if attempt > settings.JOBS_MAX_RETRIES:
+                    logger.warning(f"Chunk of {len(requests)} rejected {attempt} times, failing its items: {e}")
+                    return [e] * len(requests)
+                # Interactive traffic has priority - back off and retry the same chunk
+                await asyncio.sleep(e.retry_after)
+    
+    async def _process(self, job_id: str):
+        """Summarize a job's pending items in chunks, saving each chunk as it finishes"""
+        if not await asyncio.to_thread(self.store.claim, job_id, self._owner, settings.JOBS_LEASE_S):
+            logger.info(f"Job {job_id} is claimed by another worker, skipping")
+            return
+        logger.info(f"Running job {job_id} as {self._owner}")
+        chunk_size = max(1, settings.JOBS_CHUNK_SIZE)
+        
+        while items := await asyncio.to_thread(self.store.pending_items, job_id, chunk_size):
+            outputs = await self._summarize_chunk([request for _, request in items])
+            
+            outcomes = []
+            for (index, _), output in zip(items, outputs):
+                if isinstance(output, Exception):
+                    outcomes.append((index, None, f"Error summarizing text: {str(output)}"))
+                else:
+                    outcomes.append((index, output, None))
+            await asyncio.to_thread(self.store.save_results, job_id, outcomes)
+        
+        await asyncio.to_thread(self.store.set_status, job_id, JobStatus.COMPLETED)
+        logger.info(f"Job {job_id} completed")
+    
+    async def stop(self):
+        """Cancel the workers and give back their jobs (they resume on the next start)"""
+        for worker in self._workers:
+            worker.cancel()
+        for worker in self._workers:
+            try:
+                await worker
+            except asyncio.CancelledError:
+                pass
+        self._workers = []
+        if self._store is not None:
+            await asyncio.to_thread(self._store.release, self._owner)
+
+
+# Global instance
+job_manager = JobManager()
@@ -0,0 +1,105 @@
+"""
+Language Detection
+Thai/English detection from a bounded prefix using the Thai Unicode block,
+with a seeded langdetect fallback for mixed-script text
+"""
+import logging
+import re
+import threading
+from typing import Optional
+
+from langdetect import DetectorFactory, LangDetectException, detect
+from langdetect.detector_factory import init_factory
+
+from app.core.config import settings
+from app.services.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+_THAI_CHARS = re.compile(r"[\u0E00-\u0E7F]")
+_OTHER_LETTERS = re.compile(r"[^\W\d_\u0E00-\u0E7F]")
+
+DETECTIONS = metrics.counter(
+    "language_detections_total",
+    "Language detections by method and result",
+    ("method", "language")
+)
+
+
+def thai_ratio(text: str) -> Optional[float]:
+    """Share of Thai-block characters among the letters of text (None if it has no letters)"""
+    thai = len(_THAI_CHARS.findall(text))
+    total = thai + len(_OTHER_LETTERS.findall(text))
+    return thai / total if total else None
+
+
+class LanguageDetector:
+    """Chooses between Thai and English, touching langdetect only for ambiguous text"""
+    
+    def __init__(
+        self,
+        sample_chars: int = 1000,
+        thai_threshold: float = 0.6,
+        english_threshold: float = 0.3
+    ):
+        self.sample_chars = sample_chars
+        self.thai_threshold = thai_threshold
+        self.english_threshold = english_threshold
+        self._loaded = False
+        self._lock = threading.Lock()
+    
+    def load(self):
+        """Load langdetect's language profiles now instead of on the first ambiguous text"""
+        with self._lock:
+            if not self._loaded:
+                # Seeded so the same text always gets the same answer
+                DetectorFactory.seed = 0
+                init_factory()
+                self._loaded = True
+    
+    def classify(self, text: str) -> Optional[str]:
+        """
+        Fast path - decide from the script of a bounded prefix
+        
+        Returns:
+            'th' or 'en', or None if the prefix is too mixed to call
+        """
+        ratio = thai_ratio(text[:self.sample_chars])
+        if ratio is None or ratio <= self.english_threshold:
+            return 'en'
+        if ratio >= self.thai_threshold:
+            return 'th'
+        return None
+    
+    def detect(self, text: str) -> str:
+        """
+        Detect the language of text
+        
+        Args:
+            text: Input text
+        
+        Returns:
+            Language code ('en' or 'th')
+        """
+        language = self.classify(text)
+        if language is not None:
+            DETECTIONS.inc(method="script", language=language)
+            return language
+        
+        self.load()
+        try:
+            language = 'th' if detect(text[:self.sample_chars]) == 'th' else 'en'
+        except LangDetectException:
+            # Default to English if detection fails
+            logger.warning("Language detection failed, defaulting to English")
+            language = 'en'
+        DETECTIONS.inc(method="langdetect", language=language)
+        return language
+
+
+# Global instance
+language_detector = LanguageDetector(
+    sample_chars=settings.LANGUAGE_SAMPLE_CHARS,
+    thai_threshold=settings.LANGUAGE_THAI_THRESHOLD,
+    english_threshold=settings.LANGUAGE_ENGLISH_THRESHOLD
+)
@@ -0,0 +1,292 @@
+"""
+Service Metrics
+Lightweight counters, gauges and histograms rendered in Prometheus text format
+"""
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+from app.core.config import settings
+
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+TOKEN_BUCKETS = (8, 16, 32, 64, 128, 256, 512, 1024, 2048, 4096)
+SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64)
+
+
+def _format_labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    pairs = [
+        f'{name}="' + str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
+        for name, value in zip(names, values)
+    ]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    """Base class - one time series per combination of label values"""
+    
+    kind = "untyped"
+    
+    def __init__(
+        self,
+        registry: "MetricsRegistry",
+        name: str,
+        description: str,
+        labels: tuple[str, ...],
+        callback: Optional[Callable[[], dict]] = None
+    ):
+        self._registry = registry
+        self.name = name
+        self.description = description
+        self.labels = labels
+        self._values: dict[tuple, float] = {}
+        # Optional callback returning {label values tuple: value}, read at scrape time
+        self._callback = callback
+        self._lock = threading.Lock()
+    
+    def _key(self, labels: dict) -> tuple:
+        return tuple(labels.get(name, "") for name in self.labels)
+    
+    def _record(self, op: str, value: float, labels: dict) -> bool:
+        """Send the observation to the worker buffer instead, if buffering; True when handled"""
+        if not self._registry.enabled:
+            return True
+        if self._registry._buffer is not None:
+            self._registry._append((self.name, op, value, labels))
+            return True
+        return False
+    
+    def render(self) -> list[str]:
+        if self._callback is not None:
+            values = self._callback()
+        else:
+            with self._lock:
+                values = dict(self._values)
+        return [
+            f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"
+            for key, value in values.items()
+        ]
+
+
+class Counter(_Metric):
+    """Monotonically increasing count"""
+    
+    kind = "counter"
+    
+    def inc(self, amount: float = 1, **labels):
+        """Add amount to the series selected by labels"""
+        if self._record("inc", amount, labels):
+            return
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    """Value that can go up and down"""
+    
+    kind = "gauge"
+    
+    def set(self, value: float, **labels):
+        """Set the series selected by labels"""
+        if self._record("set", value, labels):
+            return
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    """Bucketed distribution with sum and count"""
+    
+    kind = "histogram"
+    
+    def __init__(self, *args, buckets: tuple = LATENCY_BUCKETS):
+        super().__init__(*args)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts..., +Inf count, sum]
+        self._values: dict[tuple, list] = {}
+    
+    def observe(self, value: float, **labels):
+        """Record one value in the series selected by labels"""
+        if self._record("observe", value, labels):
+            return
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                series = self._values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+    
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of a block in seconds"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+    
+    def render(self) -> list[str]:
+        lines = []
+        with self._lock:
+            items = [(key, list(series)) for key, series in self._values.items()]
+        for key, series in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series[:-1]):
+                cumulative += count
+                le = 'le="' + _format_value(float(bound)) + '"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labels, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, key)} {_format_value(series[-1])}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, key)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Collection of metrics exposed on /metrics"""
+    
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._metrics: dict[str, _Metric] = {}
+        self._buffer: Optional[list] = None
+        self._buffer_lock = threading.Lock()
+    
+    def _add(self, metric: _Metric) -> _Metric:
+        self._metrics[metric.name] = metric
+        return metric
+    
+    def counter(
+        self,
+        name: str,
+        description: str,
+        labels: tuple[str, ...] = (),
+        callback: Optional[Callable[[], dict]] = None
+    ) -> Counter:
+        """Register a counter (callback metrics are read at scrape time)"""
+        return self._add(Counter(self, name, description, labels, callback))
+    
+    def gauge(
+        self,
+        name: str,
+        description: str,
+        labels: tuple[str, ...] = (),
+        callback: Optional[Callable[[], dict]] = None
+    ) -> Gauge:
+        """Register a gauge (callback metrics are read at scrape time)"""
+        return self._add(Gauge(self, name, description, labels, callback))
+    
+    def histogram(
+        self,
+        name: str,
+        description: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple = LATENCY_BUCKETS
+    ) -> Histogram:
+        """Register a histogram with the given bucket upper bounds"""
+        return self._add(Histogram(self, name, description, labels, buckets=buckets))
+    
+    def start_buffering(self):
+        """
+        Record observations into a list instead of aggregating them
+        
+        Used in inference worker processes and the model host: the buffer is
+        drained after each call and replayed into the process that serves /metrics.
+        """
+        self._buffer = []
+    
+    def _append(self, event: tuple):
+        with self._buffer_lock:
+            self._buffer.append(event)
+    
+    def drain(self) -> list:
+        """Take the buffered observations"""
+        with self._buffer_lock:
+            if self._buffer is None:
+                return []
+            buffer, self._buffer = self._buffer, []
+        return buffer
+    
+    def replay(self, events: list):
+        """Apply observations drained from a worker process"""
+        for name, op, value, labels in events:
+            metric = self._metrics.get(name)
+            if metric is not None:
+                getattr(metric, op)(value, **labels)
+    
+    def render(self) -> str:
+        """All metrics in Prometheus text exposition format"""
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.description}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# Global instance
+metrics = MetricsRegistry(enabled=settings.METRICS_ENABLED)
+
+STAGE_SECONDS = metrics.histogram(
+    "summarizer_stage_seconds",
+    "Time spent in each stage of the summarize path",
+    ("stage", "language")
+)
+SUMMARIES = metrics.counter(
+    "summarizer_summaries_total",
+    "Texts summarized by the model",
+    ("language", "model")
+)
+INPUT_TOKENS = metrics.histogram(
+    "summarizer_input_tokens",
+    "Input tokens per text after truncation",
+    ("language",),
+    buckets=TOKEN_BUCKETS
+)
+OUTPUT_TOKENS = metrics.histogram(
+    "summarizer_output_tokens",
+    "Generated tokens per summary",
+    ("language",),
+    buckets=TOKEN_BUCKETS
+)
+PRUNED_TOKENS = metrics.counter(
+    "summarizer_pruned_tokens_total",
+    "Input tokens removed by the extractive pre-filter",
+    ("language",)
+)
+MODEL_TOKENS = metrics.counter(
+    "summarizer_model_tokens_total",
+    "Input and generated tokens per model",
+    ("model", "direction")
+)
+MODEL_COST = metrics.counter(
+    "summarizer_model_cost_total",
+    "Input plus generated tokens weighted by the model's declared cost",
+    ("model",)
+)
+MODEL_GENERATE_SECONDS = metrics.histogram(
+    "summarizer_model_generate_seconds",
+    "Time of one generate call per model",
+    ("model",)
+)
+BATCH_SIZE = metrics.histogram(
+    "summarizer_batch_size",
+    "Texts per generate call",
+    ("language",),
+    buckets=SIZE_BUCKETS
+)
+MODEL_LOAD_SECONDS = metrics.histogram(
+    "model_load_seconds",
+    "Time to load a model",
+    ("model", "backend"),
+    buckets=(0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+)
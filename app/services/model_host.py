@@ -0,0 +1,255 @@
+"""
+Model Host
+One process owns the model pipelines; HTTP workers send it inference calls over local IPC
+
+Usage:
+    python -m app.services.model_host
+    INFERENCE_EXECUTOR=remote uvicorn main:app --workers 4
+"""
+import argparse
+import logging
+import os
+import pickle
+import threading
+import time
+from contextlib import contextmanager
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Connection, Listener
+from typing import Callable, Optional
+
+from app.core.config import settings
+from app.services.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+def _parse_address(address: str) -> tuple:
+    """
+    Turn MODEL_HOST_ADDRESS into a multiprocessing.connection address and family
+    
+    "host:port" is a TCP address (for platforms without unix sockets),
+    anything else is a unix socket path.
+    """
+    host, _, port = address.rpartition(":")
+    if host and port.isdigit() and "/" not in address:
+        return (host, int(port)), "AF_INET"
+    return address, "AF_UNIX"
+
+
+def authkey() -> bytes:
+    """
+    Shared secret both sides must present
+    
+    Every message on a model host connection is unpickled, so whoever can
+    connect without it could run code in the host; the handshake cannot be
+    turned off.
+    
+    Raises:
+        ValueError: If MODEL_HOST_AUTHKEY is empty
+    """
+    if not settings.MODEL_HOST_AUTHKEY:
+        raise ValueError(
+            "MODEL_HOST_AUTHKEY must be set for the model host and its HTTP workers "
+            "(run.py generates one for the processes it starts)"
+        )
+    return settings.MODEL_HOST_AUTHKEY.encode()
+
+
+class ModelHostClient:
+    """Pool of connections from an HTTP worker to the model host"""
+    
+    def __init__(self):
+        self._idle: list[Connection] = []
+        self._lock = threading.Lock()
+    
+    def _connect(self) -> Connection:
+        """Open a connection, waiting for the host if it is still starting"""
+        address, family = _parse_address(settings.MODEL_HOST_ADDRESS)
+        deadline = time.monotonic() + settings.MODEL_HOST_CONNECT_TIMEOUT_S
+        while True:
+            try:
+                return Client(address, family=family, authkey=authkey())
+            except (FileNotFoundError, ConnectionRefusedError):
+                if time.monotonic() > deadline:
+                    raise ConnectionError(f"Model host is not reachable at {settings.MODEL_HOST_ADDRESS}")
+                time.sleep(0.5)
+    
+    @contextmanager
+    def _connection(self):
+        """Borrow a connection; broken connections are dropped instead of returned"""
+        with self._lock:
+            conn = self._idle.pop() if self._idle else None
+        if conn is None:
+            conn = self._connect()
+        try:
+            yield conn
+        except BaseException:
+            conn.close()
+            raise
+        with self._lock:
+            self._idle.append(conn)
+    
+    @staticmethod
+    def _unpack(reply: tuple):
+        """Replay the host's metrics and return the result or raise its exception"""
+        status, payload, events = reply
+        metrics.replay(events)
+        if status == "error":
+            raise payload
+        return payload
+    
+    def call(self, fn: Callable, *args):
+        """
+        Run a module-level function of app.services.summarizer in the model host
+        
+        Args:
+            fn: One of the run_* entry points
+            *args: Positional arguments for fn
+        
+        Returns:
+            The return value of fn
+        """
+        with self._connection() as conn:
+            conn.send(("call", fn.__name__, args))
+            reply = conn.recv()
+        return self._unpack(reply)
+    
+    def stream(
+        self,
+        text: str,
+        max_length: int,
+        min_length: int,
+        language: str,
+        on_text: Callable[[str], None],
+        stop_event: Optional[threading.Event] = None,
+        model: Optional[str] = None
+    ) -> dict:
+        """
+        Stream a summary from the model host (see SummarizerService.summarize_stream)
+        
+        Setting stop_event closes the connection, which stops generation in the host.
+        """
+        with self._connection() as conn:
+            conn.send(("stream", None, (text, max_length, min_length, language, model)))
+            while True:
+                if stop_event is not None and stop_event.is_set():
+                    raise ConnectionAbortedError("Streaming stopped")
+                if not conn.poll(0.05):
+                    continue
+                message = conn.recv()
+                if message[0] != "text":
+                    break
+                on_text(message[1])
+        return self._unpack(message)
+
+
+def _picklable_error(error: Exception) -> Exception:
+    """Exceptions are sent back to the caller; fall back to RuntimeError if one cannot be pickled"""
+    try:
+        pickle.dumps(error)
+        return error
+    except Exception:
+        return RuntimeError(str(error))
+
+
+def _serve_connection(conn: Connection, slots: threading.Semaphore):
+    """Answer requests from one HTTP worker connection until it closes"""
+    from app.services import summarizer
+    
+    try:
+        while True:
+            try:
+                kind, name, args = conn.recv()
+            except EOFError:
+                return
+            
+            stop_event = threading.Event()
+            
+            def on_text(piece: str):
+                try:
+                    conn.send(("text", piece))
+                except OSError:
+                    # The HTTP worker hung up - stop generating
+                    stop_event.set()
+            
+            with slots:
+                try:
+                    if kind == "stream":
+                        text, max_length, min_length, language, model = args
+                        result = summarizer.summarizer_service.summarize_stream(
+                            text, max_length, min_length, language, on_text, stop_event, model
+                        )
+                    elif name.startswith("run_") and callable(getattr(summarizer, name, None)):
+                        result = getattr(summarizer, name)(*args)
+                    else:
+                        raise ValueError(f"Unknown model host call: {name}")
+                    reply = ("ok", result, metrics.drain())
+                except Exception as e:
+                    reply = ("error", _picklable_error(e), metrics.drain())
+            
+            if stop_event.is_set():
+                return
+            conn.send(reply)
+    except OSError as e:
+        logger.info(f"Model host connection closed: {e}")
+    finally:
+        conn.close()
+
+
+def serve(warmup_languages: Optional[list[str]] = None):
+    """
+    Run the model host until interrupted
+    
+    Args:
+        warmup_languages: Languages whose models are loaded and warmed up
+            (WARMUP_INPUT_TOKENS) before accepting connections
+    """
+    from app.services.summarizer import summarizer_service
+    
+    # Refuse to start before loading anything when there is no key
+    key = authkey()
+    
+    # Observations travel back to the HTTP worker that made each call
+    metrics.start_buffering()
+    
+    if warmup_languages:
+        logger.info(f"Warming up models for: {', '.join(warmup_languages)}")
+        summarizer_service.warm_up(warmup_languages, settings.WARMUP_INPUT_TOKENS)
+    
+    address, family = _parse_address(settings.MODEL_HOST_ADDRESS)
+    if family == "AF_UNIX" and os.path.exists(address):
+        os.unlink(address)
+    
+    slots = threading.Semaphore(max(1, settings.INFERENCE_WORKERS))
+    with Listener(address, family=family, authkey=key) as listener:
+        logger.info(f"Model host listening on {settings.MODEL_HOST_ADDRESS}")
+        while True:
+            try:
+                conn = listener.accept()
+            except (OSError, AuthenticationError) as e:
+                # e.g. a client with the wrong authkey
+                logger.warning(f"Rejected model host connection: {e}")
+                continue
+            threading.Thread(target=_serve_connection, args=(conn, slots), daemon=True).start()
+
+
+# Global instance
+model_host_client = ModelHostClient()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+    parser = argparse.ArgumentParser(description="Serve the summarization models to HTTP workers")
+    parser.add_argument(
+        "--warmup",
+        default=",".join(settings.MODEL_WARMUP_LANGUAGES),
+        help="Comma-separated languages to load at startup"
+    )
+    args = parser.parse_args()
+    try:
+        serve([language for language in args.warmup.split(",") if language])
+    except KeyboardInterrupt:
+        pass
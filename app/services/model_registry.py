@@ -0,0 +1,174 @@
+"""
+Model Registry
+Loads summarization pipelines on first use and unloads them when idle
+"""
+import asyncio
+import gc
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Optional
+
+from app.core.config import settings
+from app.services.backends import backend_for, build_pipeline
+from app.services.metrics import MODEL_LOAD_SECONDS
+
+logger = logging.getLogger(__name__)
+
+
+class ModelState(str, Enum):
+    """Lifecycle state of a registered model"""
+    UNLOADED = "unloaded"
+    LOADING = "loading"
+    READY = "ready"
+
+
+@dataclass
+class _ModelEntry:
+    """Bookkeeping for one model"""
+    name: str
+    state: ModelState = ModelState.UNLOADED
+    pipeline: Any = None
+    last_used: float = 0.0
+    load_seconds: Optional[float] = None
+    backend: Optional[str] = None
+    in_use: int = 0
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+class ModelRegistry:
+    """Thread-safe registry of lazily loaded summarization pipelines"""
+    
+    def __init__(self):
+        self._entries: dict[str, _ModelEntry] = {}
+        self._lock = threading.Lock()
+        # transformers patches torch globally while building a model, so two
+        # different models must not be built at the same time
+        self._build_lock = threading.Lock()
+    
+    def _entry(self, name: str) -> _ModelEntry:
+        """Get or create the entry for a model name"""
+        with self._lock:
+            if name not in self._entries:
+                self._entries[name] = _ModelEntry(name)
+            return self._entries[name]
+    
+    def load(self, name: str):
+        """
+        Load a model if it is not loaded yet
+        
+        Args:
+            name: Hugging Face model name or local path
+        
+        Returns:
+            The ready pipeline
+        """
+        entry = self._entry(name)
+        with entry.lock:
+            if entry.state == ModelState.READY:
+                return entry.pipeline
+            
+            entry.state = ModelState.LOADING
+            entry.backend = backend_for(name)
+            logger.info(f"Loading model: {name} ({entry.backend})")
+            started = time.perf_counter()
+            try:
+                with self._build_lock:
+                    entry.pipeline = build_pipeline(name, entry.backend)
+            except Exception as e:
+                entry.state = ModelState.UNLOADED
+                logger.error(f"Error loading model {name}: {e}")
+                raise
+            
+            entry.load_seconds = round(time.perf_counter() - started, 3)
+            MODEL_LOAD_SECONDS.observe(entry.load_seconds, model=name, backend=entry.backend)
+            entry.last_used = time.time()
+            entry.state = ModelState.READY
+            logger.info(f"Model {name} loaded in {entry.load_seconds}s")
+            return entry.pipeline
+    
+    @contextmanager
+    def use(self, name: str):
+        """
+        Borrow a model's pipeline, loading it on first use
+        
+        The model cannot be evicted while it is borrowed.
+        """
+        entry = self._entry(name)
+        with self._lock:
+            entry.in_use += 1
+        try:
+            model_pipeline = self.load(name)
+            yield model_pipeline
+        finally:
+            with self._lock:
+                entry.in_use -= 1
+                entry.last_used = time.time()
+    
+    def unload(self, name: str) -> bool:
+        """Drop a model's pipeline so its memory can be reclaimed"""
+        entry = self._entry(name)
+        with entry.lock:
+            with self._lock:
+                if entry.state != ModelState.READY or entry.in_use > 0:
+                    return False
+                entry.pipeline = None
+                entry.state = ModelState.UNLOADED
+        gc.collect()
+        logger.info(f"Model {name} unloaded")
+        return True
+    
+    def evict_idle(self, idle_seconds: float) -> list[str]:
+        """
+        Unload every model that has not been used for idle_seconds
+        
+        Returns:
+            Names of the unloaded models
+        """
+        now = time.time()
+        with self._lock:
+            candidates = [
+                entry.name for entry in self._entries.values()
+                if entry.state == ModelState.READY
+                and entry.in_use == 0
+                and now - entry.last_used > idle_seconds
+            ]
+        return [name for name in candidates if self.unload(name)]
+    
+    async def run_eviction_loop(self):
+        """Periodically unload idle models (runs until cancelled)"""
+        while True:
+            await asyncio.sleep(settings.MODEL_EVICTION_INTERVAL_S)
+            evicted = await asyncio.to_thread(self.evict_idle, settings.MODEL_IDLE_TIMEOUT_S)
+            if evicted:
+                logger.info(f"Evicted idle models: {', '.join(evicted)}")
+    
+    def state(self, name: str) -> ModelState:
+        """Current state of a model"""
+        with self._lock:
+            entry = self._entries.get(name)
+            return entry.state if entry else ModelState.UNLOADED
+    
+    def status(self, names: list[str]) -> list[dict]:
+        """State, load time and idle time of the given models"""
+        now = time.time()
+        result = []
+        for name in names:
+            with self._lock:
+                entry = self._entries.get(name)
+                ready = entry is not None and entry.state == ModelState.READY
+                result.append({
+                    "name": name,
+                    "state": entry.state.value if entry else ModelState.UNLOADED.value,
+                    "backend": entry.backend if entry else None,
+                    "load_seconds": entry.load_seconds if entry else None,
+                    "idle_seconds": round(now - entry.last_used, 1) if ready else None
+                })
+        return result
+
+
+# Global instance
+model_registry = ModelRegistry()
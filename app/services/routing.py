@@ -0,0 +1,176 @@
+"""
+Model Routing
+Declared models (languages, input limit, cost) and the rules that pick one for each request
+"""
+from dataclasses import dataclass
+from typing import Optional
+
+from app.core.config import settings
+from app.services.metrics import metrics
+
+ROUTED = metrics.counter(
+    "model_routed_total",
+    "Summarize calls routed to each model",
+    ("model", "language", "tier")
+)
+
+
+@dataclass(frozen=True)
+class ModelSpec:
+    """A model the service can summarize with"""
+    name: str
+    languages: tuple[str, ...]
+    max_input_tokens: int
+    cost: float = 1.0
+
+
+@dataclass(frozen=True)
+class RoutingRule:
+    """Sends matching calls to a model; an empty condition matches anything"""
+    model: str
+    languages: tuple[str, ...] = ()
+    tiers: tuple[str, ...] = ()
+    min_input_tokens: int = 0
+    max_input_tokens: Optional[int] = None
+    
+    def matches(self, language: str, tier: str, input_tokens: int) -> bool:
+        """Whether a call of this language, tier and estimated input length takes this rule"""
+        return (
+            (not self.languages or language in self.languages)
+            and (not self.tiers or tier in self.tiers)
+            and input_tokens >= self.min_input_tokens
+            and (self.max_input_tokens is None or input_tokens <= self.max_input_tokens)
+        )
+
+
+class ModelRouter:
+    """
+    Picks the model of each summarize call
+    
+    MODEL_NAME_EN and MODEL_NAME_TH are always available as their language's
+    default; MODELS declares more. Rules are tried in order and the first one
+    whose conditions match (and whose model serves the language) wins, so a
+    distilled model can take short or fast-tier calls while everything else
+    falls through to the default model.
+    """
+    
+    def __init__(
+        self,
+        models: Optional[dict[str, dict]] = None,
+        rules: Optional[list[dict]] = None,
+        tiers: Optional[list[str]] = None,
+        default_tier: str = "standard"
+    ):
+        self.tiers = list(tiers or [default_tier])
+        self.default_tier = default_tier
+        if default_tier not in self.tiers:
+            raise ValueError(f"MODEL_DEFAULT_TIER '{default_tier}' is not one of MODEL_TIERS {self.tiers}")
+        
+        self._declared: dict[str, ModelSpec] = {}
+        for name, spec in (models or {}).items():
+            languages = tuple(spec.get("languages") or ())
+            if not languages:
+                raise ValueError(f"Model {name} in MODELS must list its languages")
+            self._declared[name] = ModelSpec(
+                name=name,
+                languages=languages,
+                max_input_tokens=int(spec.get("max_input_tokens") or 0),
+                cost=float(spec.get("cost", 1.0))
+            )
+        
+        self.rules = [self._rule(rule) for rule in rules or []]
+    
+    def _rule(self, rule: dict) -> RoutingRule:
+        """Validate one MODEL_ROUTES entry"""
+        name = rule.get("model")
+        if not name or name not in self.model_names:
+            raise ValueError(f"Route {rule} names a model that is not in MODELS or MODEL_NAME_EN/TH")
+        parsed = RoutingRule(
+            model=name,
+            languages=tuple(rule.get("languages") or ()),
+            tiers=tuple(rule.get("tiers") or ()),
+            min_input_tokens=int(rule.get("min_input_tokens") or 0),
+            max_input_tokens=rule.get("max_input_tokens")
+        )
+        unknown_tiers = set(parsed.tiers) - set(self.tiers)
+        if unknown_tiers:
+            raise ValueError(f"Route {rule} uses tiers {sorted(unknown_tiers)} missing from MODEL_TIERS")
+        unserved = set(parsed.languages) - set(self.spec(name).languages)
+        if unserved:
+            raise ValueError(f"Route {rule} sends {sorted(unserved)} to {name}, which does not serve them")
+        return parsed
+    
+    def default_model(self, language: str) -> str:
+        """Model that serves a language when no rule matches"""
+        return settings.MODEL_NAME_TH if language == "th" else settings.MODEL_NAME_EN
+    
+    @property
+    def model_names(self) -> list[str]:
+        """Default models first, then the declared ones"""
+        return list(dict.fromkeys([settings.MODEL_NAME_EN, settings.MODEL_NAME_TH, *self._declared]))
+    
+    def models_for(self, language: str) -> list[str]:
+        """Every model that serves a language, its default first"""
+        return [name for name in self.model_names if language in self.spec(name).languages]
+    
+    def spec(self, name: str) -> ModelSpec:
+        """
+        Declaration of a model
+        
+        Default models that MODELS does not declare serve their language,
+        read up to MAX_INPUT_LENGTH tokens and cost 1.0.
+        """
+        spec = self._declared.get(name)
+        if spec is None:
+            languages = tuple(
+                language for language in ("en", "th") if self.default_model(language) == name
+            )
+            spec = ModelSpec(name=name, languages=languages, max_input_tokens=settings.MAX_INPUT_LENGTH)
+        if spec.max_input_tokens <= 0:
+            spec = ModelSpec(spec.name, spec.languages, settings.MAX_INPUT_LENGTH, spec.cost)
+        return spec
+    
+    def resolve_tier(self, tier: Optional[str]) -> str:
+        """
+        Tier a call is routed with
+        
+        Raises:
+            ValueError: If the tier is not in MODEL_TIERS
+        """
+        tier = tier or self.default_tier
+        if tier not in self.tiers:
+            raise ValueError(f"Unknown tier '{tier}', expected one of {self.tiers}")
+        return tier
+    
+    def route(self, language: str, input_tokens: int, tier: Optional[str] = None) -> str:
+        """
+        Model for a summarize call
+        
+        Args:
+            language: Language code of the text
+            input_tokens: Estimated input tokens of the text
+            tier: Requested tier (None uses MODEL_DEFAULT_TIER)
+        
+        Returns:
+            Name of the model to summarize with
+        
+        Raises:
+            ValueError: If the tier is not in MODEL_TIERS
+        """
+        tier = self.resolve_tier(tier)
+        model = self.default_model(language)
+        for rule in self.rules:
+            if rule.matches(language, tier, input_tokens) and language in self.spec(rule.model).languages:
+                model = rule.model
+                break
+        ROUTED.inc(model=model, language=language, tier=tier)
+        return model
+
+
+# Global instance
+model_router = ModelRouter(
+    models=settings.MODELS,
+    rules=settings.MODEL_ROUTES,
+    tiers=settings.MODEL_TIERS,
+    default_tier=settings.MODEL_DEFAULT_TIER
+)
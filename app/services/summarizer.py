@@ -2,20 +2,38 @@
 Text Summarization Service using Transformers
 Supports English and Thai languages
 """
-from transformers import pipeline, AutoTokenizer, AutoModelForSeq2SeqLM
 from app.core.config import settings
-from langdetect import detect, LangDetectException
+from app.services.model_registry import model_registry, ModelState
+from app.services.chunking import count_tokens, split_into_chunks
+from app.services.extractive import extract_sentences
+from app.services.language import language_detector
+from app.services.generation import resolve_profile, generation_kwargs, assistant_model_for
+from app.services.routing import model_router
+from app.services.metrics import (
+    STAGE_SECONDS, SUMMARIES, INPUT_TOKENS, OUTPUT_TOKENS, BATCH_SIZE, PRUNED_TOKENS,
+    MODEL_TOKENS, MODEL_COST, MODEL_GENERATE_SECONDS
+)
+from typing import Callable, Optional
+import threading
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
+# Character cut applied before tokenizing, per allowed input token
+_MAX_CHARS_PER_TOKEN = 32
+
+# Repeated to build warm-up inputs of a given length
+_WARMUP_SENTENCES = {
+    "en": "The city council met on Tuesday to discuss the budget for public transport and new schools. ",
+    "th": "คณะกรรมการเมืองประชุมเมื่อวันอังคารเพื่อหารืองบประมาณสำหรับระบบขนส่งสาธารณะและโรงเรียนแห่งใหม่ "
+}
+
 
 class SummarizerService:
     """Service class for text summarization"""
     
     _instance = None
-    _en_pipeline = None
-    _th_pipeline = None
     
     def __new__(cls):
         """Singleton pattern"""
@@ -24,34 +42,58 @@ class SummarizerService:
         return cls._instance
     
     def __init__(self):
-        """Initialize the summarizer service"""
-        if self._en_pipeline is None:
-            self._load_models()
-    
-    def _load_models(self):
-        """Load the summarization models for both languages"""
-        try:
-            # Load English model (BART)
-            logger.info(f"Loading English model: {settings.MODEL_NAME_EN}")
-            self._en_pipeline = pipeline(
-                "summarization",
-                model=settings.MODEL_NAME_EN,
-                tokenizer=settings.MODEL_NAME_EN
-            )
-            logger.info("English model loaded successfully")
-            
-            # Load Thai model (mT5)
-            logger.info(f"Loading Thai model: {settings.MODEL_NAME_TH}")
-            self._th_pipeline = pipeline(
-                "summarization",
-                model=settings.MODEL_NAME_TH,
-                tokenizer=settings.MODEL_NAME_TH
-            )
-            logger.info("Thai model loaded successfully")
-            
-        except Exception as e:
-            logger.error(f"Error loading models: {e}")
-            raise
+        """Initialize the summarizer service (models load lazily on first use)"""
+    
+    @property
+    def model_names(self) -> list[str]:
+        """Configured model names: each language's default, then the MODELS declarations"""
+        return model_router.model_names
+    
+    def warm_up(self, languages: list[str], input_tokens: Optional[list[int]] = None) -> list[dict]:
+        """
+        Load every model serving the given languages ahead of the first request
+        
+        After loading, one generation per input length runs so tokenizer
+        caches, allocator pools and kernels for those shapes are initialised
+        before real traffic arrives.
+        
+        Args:
+            languages: Language codes to pre-load ('en', 'th')
+            input_tokens: Approximate input lengths (tokens) of the warm-up
+                generations; None or empty only loads the models
+        
+        Returns:
+            One dictionary per step with language, model, input_tokens (None
+            for the model load) and seconds
+        """
+        steps = []
+        for language in languages:
+            for model_name in model_router.models_for(language):
+                started = time.perf_counter()
+                model_registry.load(model_name)
+                steps.append({
+                    "language": language,
+                    "model": model_name,
+                    "input_tokens": None,
+                    "seconds": round(time.perf_counter() - started, 3)
+                })
+                
+                limit = model_router.spec(model_name).max_input_tokens
+                for tokens in sorted({min(length, limit) for length in input_tokens or []}):
+                    text = self._warm_up_text(model_name, language, tokens)
+                    started = time.perf_counter()
+                    self.summarize_many([text], settings.WARMUP_MAX_LENGTH, 1, language, model=model_name)
+                    seconds = time.perf_counter() - started
+                    steps.append({"language": language, "model": model_name, "input_tokens": tokens, "seconds": round(seconds, 3)})
+                    logger.info(f"Warm-up generation ({model_name}, ~{tokens} tokens) took {seconds:.2f}s")
+        return steps
+    
+    def _warm_up_text(self, model_name: str, language: str, tokens: int) -> str:
+        """Synthetic input of roughly the given number of tokens"""
+        sentence = _WARMUP_SENTENCES.get(language, _WARMUP_SENTENCES["en"])
+        with model_registry.use(model_name) as pipeline_to_use:
+            per_sentence = max(1, count_tokens(pipeline_to_use.tokenizer, sentence))
+        return sentence * max(1, -(-tokens // per_sentence))
     
     def detect_language(self, text: str) -> str:
         """
@@ -63,22 +105,125 @@ class SummarizerService:
         Returns:
             Language code ('en' or 'th')
         """
-        try:
-            lang = detect(text)
-            if lang == 'th':
-                return 'th'
-            return 'en'
-        except LangDetectException:
-            # Default to English if detection fails
-            logger.warning("Language detection failed, defaulting to English")
-            return 'en'
+        started = time.perf_counter()
+        language = language_detector.detect(text)
+        STAGE_SECONDS.observe(time.perf_counter() - started, stage="detect_language", language=language)
+        return language
+    
+    def model_name_for(self, language: str) -> str:
+        """Name of the default model of a language (calls routed elsewhere pass model explicitly)"""
+        return model_router.default_model(language)
+    
+    def _encode(
+        self,
+        tokenizer,
+        texts: list[str],
+        prefix: str = "",
+        model_name: Optional[str] = None
+    ) -> tuple[list[list[int]], list[bool]]:
+        """
+        Tokenize texts once and truncate them exactly at the model input limit
+        
+        Huge strings are first cut by characters so they cannot make the
+        tokenizer itself expensive; the cut keeps _MAX_CHARS_PER_TOKEN
+        characters per allowed token, far more than any real token spans.
+        
+        Args:
+            tokenizer: Tokenizer of the model that will read the ids
+            texts: Input texts
+            prefix: Task prefix the model expects in front of each text
+            model_name: Model whose max_input_tokens applies (None uses MAX_INPUT_LENGTH)
+        
+        Returns:
+            Input ids of each text (with the model's special tokens) and
+            whether each text was truncated
+        """
+        limit = self._input_token_limit(tokenizer, model_name)
+        max_chars = limit * _MAX_CHARS_PER_TOKEN
+        encoded = tokenizer([prefix + text[:max_chars] for text in texts], truncation=False)["input_ids"]
+        
+        # Special tokens closing a sequence (e.g. </s>) must survive the cut
+        sample = tokenizer("a")["input_ids"]
+        special_ids = set(tokenizer.all_special_ids)
+        tail = 0
+        while tail < len(sample) and sample[len(sample) - 1 - tail] in special_ids:
+            tail += 1
+        
+        input_ids = [
+            ids if len(ids) <= limit else ids[:limit - tail] + ids[len(ids) - tail:]
+            for ids in encoded
+        ]
+        return input_ids, [len(ids) > limit for ids in encoded]
+    
+    def _prefilter(
+        self,
+        tokenizer,
+        texts: list[str],
+        prefix: str,
+        input_ids: list[list[int]],
+        truncated: list[bool],
+        language: str,
+        model_name: Optional[str] = None
+    ) -> list[Optional[dict]]:
+        """
+        Shrink inputs over EXTRACTIVE_TOKEN_BUDGET to their most central sentences
+        
+        Texts that were encoded over the budget (or truncated) are replaced in
+        input_ids and truncated by their extractive selection, re-encoded.
+        
+        Returns:
+            For each text, {"pruned_sentences", "pruned_tokens"} or None when
+            the text was left as it was
+        """
+        limit = self._input_token_limit(tokenizer, model_name)
+        budget = min(settings.EXTRACTIVE_TOKEN_BUDGET or limit, limit)
+        # Special tokens and the task prefix take part of the budget
+        available = budget - len(tokenizer(prefix)["input_ids"])
+        max_chars = limit * _MAX_CHARS_PER_TOKEN
+        
+        def token_counts(sentences: list[str]) -> list[int]:
+            # A leading space tokenizes each sentence as it reads inside the joined text
+            encoded = tokenizer([" " + sentence for sentence in sentences], add_special_tokens=False)
+            return [len(ids) for ids in encoded["input_ids"]]
+        
+        pruning: list[Optional[dict]] = [None] * len(texts)
+        for index, text in enumerate(texts):
+            if not truncated[index] and len(input_ids[index]) <= budget:
+                continue
+            extraction = extract_sentences(text[:max_chars], token_counts, available)
+            if extraction is None:
+                continue
+            ids, was_truncated = self._encode(tokenizer, [extraction.text], prefix, model_name)
+            input_ids[index] = ids[0]
+            # Text past the character cut never reached the pre-filter
+            truncated[index] = was_truncated[0] or len(text) > max_chars
+            pruning[index] = {
+                "pruned_sentences": extraction.sentences - extraction.kept,
+                "pruned_tokens": extraction.pruned_tokens
+            }
+            PRUNED_TOKENS.inc(extraction.pruned_tokens, language=language)
+        return pruning
+    
+    def _pad(self, tokenizer, input_ids: list[list[int]]) -> dict:
+        """Right-pad token ids into input_ids and attention_mask tensors"""
+        import torch
+        
+        width = max(len(ids) for ids in input_ids)
+        padded = torch.full((len(input_ids), width), tokenizer.pad_token_id, dtype=torch.long)
+        attention_mask = torch.zeros((len(input_ids), width), dtype=torch.long)
+        for row, ids in enumerate(input_ids):
+            padded[row, :len(ids)] = torch.tensor(ids, dtype=torch.long)
+            attention_mask[row, :len(ids)] = 1
+        return {"input_ids": padded, "attention_mask": attention_mask}
     
     def summarize(
         self,
         text: str,
         max_length: int = 150,
         min_length: int = 30,
-        language: str = None
+        language: str = None,
+        profile: Optional[str] = None,
+        model: Optional[str] = None
     ) -> dict:
         """
         Summarize the given text
@@ -88,44 +233,415 @@ class SummarizerService:
             max_length: Maximum length of summary
             min_length: Minimum length of summary
             language: Language code ('en', 'th', or None for auto-detect)
+            profile: Generation profile (None uses GENERATION_PROFILE)
+            model: Model to summarize with (None uses the language's default)
             
         Returns:
-            Dictionary with summary and detected language
+            Dictionary with summary, detected language and generation profile
         """
-        if self._en_pipeline is None or self._th_pipeline is None:
-            self._load_models()
-        
         # Auto-detect language if not specified
         if language is None:
             language = self.detect_language(text)
         
-        # Select appropriate pipeline
-        pipeline_to_use = self._th_pipeline if language == 'th' else self._en_pipeline
-        
-        # Truncate input if too long
-        max_chars = settings.MAX_INPUT_LENGTH * 4
-        if len(text) > max_chars:
-            text = text[:max_chars]
-        
-        # Summarize with appropriate model
-        result = pipeline_to_use(
-            text,
+        return self.summarize_many(
+            [text],
             max_length=max_length,
             min_length=min_length,
-            do_sample=False,
-            truncation=True
-        )
+            language=language,
+            profile=profile,
+            model=model
+        )[0]
+    
+    def summarize_many(
+        self,
+        texts: list[str],
+        max_length: int = 150,
+        min_length: int = 30,
+        language: str = 'en',
+        profile: Optional[str] = None,
+        model: Optional[str] = None
+    ) -> list[dict]:
+        """
+        Summarize several texts of the same language in one padded forward pass
+        
+        Args:
+            texts: Input texts to summarize
+            max_length: Maximum length of each summary
+            min_length: Minimum length of each summary
+            language: Language code shared by all texts ('en' or 'th')
+            profile: Generation profile (None uses GENERATION_PROFILE)
+            model: Model to summarize with (None uses the language's default)
+        
+        Returns:
+            List of dictionaries with summary, language, model, generation profile,
+            input_tokens (after truncation), output_tokens, truncated and the
+            extractive pre-filter's pruned_sentences/pruned_tokens (None when
+            it did not run), in input order
+        """
+        from torch import no_grad
+        
+        # Summarize with appropriate model (loaded on first use); tokenize,
+        # generate and decode run as separate steps so each can be timed
+        model_name = model or self.model_name_for(language)
+        profile = resolve_profile(profile, model_name)
+        draft_name = assistant_model_for(profile, model_name)
+        with model_registry.use(model_name) as pipeline_to_use:
+            tokenizer = pipeline_to_use.tokenizer
+            model = pipeline_to_use.model
+            prefix = pipeline_to_use.prefix or ""
+            
+            with STAGE_SECONDS.time(stage="tokenize", language=language):
+                input_ids, truncated = self._encode(tokenizer, texts, prefix, model_name)
+            
+            pruning = [None] * len(texts)
+            if settings.EXTRACTIVE_ENABLED:
+                with STAGE_SECONDS.time(stage="extract", language=language):
+                    pruning = self._prefilter(tokenizer, texts, prefix, input_ids, truncated, language, model_name)
+            inputs = self._pad(tokenizer, input_ids)
+            
+            with STAGE_SECONDS.time(stage="generate", language=language), MODEL_GENERATE_SECONDS.time(model=model_name), no_grad():
+                if draft_name is None:
+                    output_ids = list(model.generate(
+                        input_ids=inputs["input_ids"].to(model.device),
+                        attention_mask=inputs["attention_mask"].to(model.device),
+                        generation_config=pipeline_to_use.generation_config,
+                        max_length=max_length,
+                        min_length=min_length,
+                        do_sample=False,
+                        **generation_kwargs(profile)
+                    ))
+                else:
+                    output_ids = self._generate_assisted(
+                        pipeline_to_use, inputs, max_length, min_length, profile, draft_name
+                    )
+            
+            with STAGE_SECONDS.time(stage="decode", language=language):
+                summaries = tokenizer.batch_decode(
+                    output_ids, skip_special_tokens=True, clean_up_tokenization_spaces=False
+                )
+            
+            pad_token_id = tokenizer.pad_token_id
+        
+        # Generated tokens, without the decoder start token and the padding of shorter rows
+        output_counts = [int((ids[1:] != pad_token_id).sum()) for ids in output_ids]
+        
+        SUMMARIES.inc(len(texts), language=language, model=model_name)
+        BATCH_SIZE.observe(len(texts), language=language)
+        for ids in input_ids:
+            INPUT_TOKENS.observe(len(ids), language=language)
+        for count in output_counts:
+            OUTPUT_TOKENS.observe(count, language=language)
+        self._record_model_usage(model_name, sum(len(ids) for ids in input_ids), sum(output_counts))
+        
+        return [
+            {
+                "summary": summary,
+                "language": language,
+                "model": model_name,
+                "profile": profile,
+                "input_tokens": len(ids),
+                "output_tokens": count,
+                "truncated": was_truncated,
+                "pruned_sentences": pruned["pruned_sentences"] if pruned else None,
+                "pruned_tokens": pruned["pruned_tokens"] if pruned else None
+            }
+            for summary, ids, count, was_truncated, pruned in zip(
+                summaries, input_ids, output_counts, truncated, pruning
+            )
+        ]
+    
+    def _record_model_usage(self, model_name: str, input_tokens: int, output_tokens: int):
+        """Per-model token and cost counters (cost is MODELS' relative cost per token)"""
+        MODEL_TOKENS.inc(input_tokens, model=model_name, direction="input")
+        MODEL_TOKENS.inc(output_tokens, model=model_name, direction="output")
+        MODEL_COST.inc((input_tokens + output_tokens) * model_router.spec(model_name).cost, model=model_name)
+    
+    def _generate_assisted(
+        self,
+        pipeline_to_use,
+        inputs,
+        max_length: int,
+        min_length: int,
+        profile: str,
+        draft_name: str
+    ) -> list:
+        """
+        Generate with a draft model proposing tokens that the main model verifies
+        
+        Assisted decoding only handles one sequence at a time, so the padded
+        batch is generated row by row. Greedy verification keeps each output
+        identical to plain greedy search with the same settings.
+        """
+        from transformers import LogitsProcessorList
+        from app.services.generation_hooks import SuppressEosBelowLength
+        
+        model = pipeline_to_use.model
+        generation_config = pipeline_to_use.generation_config
+        with model_registry.use(draft_name) as draft_pipeline:
+            draft = draft_pipeline.model
+            # The draft proposes greedily; beams or a minimum length on its side break assisted decoding
+            draft.generation_config.update(num_beams=1, early_stopping=False, length_penalty=1.0, min_length=0)
+            
+            output_ids = []
+            for row in range(inputs["input_ids"].shape[0]):
+                mask = inputs["attention_mask"][row].bool()
+                output_ids.append(model.generate(
+                    input_ids=inputs["input_ids"][row:row + 1, mask].to(model.device),
+                    attention_mask=inputs["attention_mask"][row:row + 1, mask].to(model.device),
+                    generation_config=generation_config,
+                    max_length=max_length,
+                    min_length=0,
+                    do_sample=False,
+                    logits_processor=LogitsProcessorList(
+                        [SuppressEosBelowLength(min_length, generation_config.eos_token_id)]
+                    ),
+                    assistant_model=draft,
+                    **generation_kwargs(profile)
+                )[0])
+        return output_ids
+    
+    def needs_long_document_mode(self, text: str, language: str, model: Optional[str] = None) -> bool:
+        """
+        Check whether text is longer than the model input and should be chunked
+        
+        Texts with fewer characters than LONG_DOC_CHUNK_TOKENS cannot exceed
+        it in tokens, so they skip tokenization entirely.
+        """
+        if len(text) <= settings.LONG_DOC_CHUNK_TOKENS:
+            return False
+        model_name = model or self.model_name_for(language)
+        with model_registry.use(model_name) as pipeline_to_use:
+            tokenizer = pipeline_to_use.tokenizer
+            return count_tokens(tokenizer, text) > self._input_token_limit(tokenizer, model_name)
+    
+    def _input_token_limit(self, tokenizer, model_name: Optional[str] = None) -> int:
+        """Largest input the model reads without truncation (its max_input_tokens, else MAX_INPUT_LENGTH)"""
+        limit = model_router.spec(model_name).max_input_tokens if model_name else settings.MAX_INPUT_LENGTH
+        return min(limit, tokenizer.model_max_length)
+    
+    def summarize_long(
+        self,
+        text: str,
+        max_length: int = 150,
+        min_length: int = 30,
+        language: str = 'en',
+        profile: Optional[str] = None,
+        model: Optional[str] = None
+    ) -> dict:
+        """
+        Summarize a document longer than the model input with hierarchical map-reduce
+        
+        The text is split into overlapping token-aware chunks, the chunks are
+        summarized in padded batches, and the joined partial summaries are
+        summarized again until they fit the model input (or LONG_DOC_MAX_DEPTH
+        is reached, after which the remainder is truncated as usual).
+        
+        Args:
+            text: Input text to summarize
+            max_length: Maximum length of summary
+            min_length: Minimum length of summary
+            language: Language code ('en' or 'th')
+            profile: Generation profile (None uses GENERATION_PROFILE)
+            model: Model to summarize with (None uses the language's default)
+        
+        Returns:
+            Dictionary with summary, language, generation profile, token counts
+            (input_tokens is the whole document), number of first-level chunks
+            and levels used
+        """
+        model_name = model or self.model_name_for(language)
+        with model_registry.use(model_name) as pipeline_to_use:
+            tokenizer = pipeline_to_use.tokenizer
+            limit = self._input_token_limit(tokenizer, model_name)
+            # Leave room for the special tokens _encode adds, so chunks are not truncated again
+            chunk_tokens = max(1, min(
+                settings.LONG_DOC_CHUNK_TOKENS,
+                limit - tokenizer.num_special_tokens_to_add()
+            ))
+            # Keep the overlap under half a chunk so every window advances
+            overlap = max(0, min(settings.LONG_DOC_CHUNK_OVERLAP, (chunk_tokens - 1) // 2))
+            
+            current = text
+            current_tokens = document_tokens = count_tokens(tokenizer, current)
+            chunk_count = 1
+            levels = 0
+            while levels < settings.LONG_DOC_MAX_DEPTH and current_tokens > limit:
+                chunks = split_into_chunks(
+                    tokenizer, current, chunk_tokens, overlap
+                )
+                if levels == 0:
+                    chunk_count = len(chunks)
+                logger.info(f"Long document level {levels + 1}: {len(chunks)} chunks")
+                
+                # Map: summarize the chunks in padded batches
+                partials = []
+                batch_size = max(1, settings.LONG_DOC_BATCH_SIZE)
+                for start in range(0, len(chunks), batch_size):
+                    partials.extend(
+                        result["summary"] for result in self.summarize_many(
+                            chunks[start:start + batch_size],
+                            max_length=max_length,
+                            min_length=min(min_length, max_length),
+                            language=language,
+                            profile=profile,
+                            model=model_name
+                        )
+                    )
+                
+                # Reduce: the joined partial summaries become the next level's input
+                current = "\n".join(partials)
+                levels += 1
+                
+                # Stop if a level did not shrink the text; the final pass truncates it
+                previous_tokens, current_tokens = current_tokens, count_tokens(tokenizer, current)
+                if current_tokens >= previous_tokens:
+                    logger.warning("Long document summaries are not shrinking, stopping early")
+                    break
+            
+            # Final pass over text that now fits the model input
+            result = self.summarize_many(
+                [current],
+                max_length=max_length,
+                min_length=min_length,
+                language=language,
+                profile=profile,
+                model=model_name
+            )[0]
         
+        result["chunks"] = chunk_count
+        result["levels"] = levels + 1
+        result["input_tokens"] = document_tokens
+        return result
+    
+    def summarize_stream(
+        self,
+        text: str,
+        max_length: int,
+        min_length: int,
+        language: str,
+        on_text: Callable[[str], None],
+        stop_event: Optional[threading.Event] = None,
+        model: Optional[str] = None
+    ) -> dict:
+        """
+        Summarize while streaming decoded text pieces as they are generated
+        
+        Streaming uses greedy decoding because token streamers do not
+        support beam search.
+        
+        Args:
+            text: Input text to summarize
+            max_length: Maximum length of summary
+            min_length: Minimum length of summary
+            language: Language code ('en' or 'th')
+            on_text: Called from the generating thread with each new piece of text
+            stop_event: Set it to stop generation early
+            model: Model to summarize with (None uses the language's default)
+        
+        Returns:
+            Dictionary with the full summary, language, model and token counts
+        """
+        from torch import no_grad
+        from transformers import StoppingCriteriaList
+        from app.services.generation_hooks import CallbackStreamer, StopOnEvent
+        
+        model_name = model or self.model_name_for(language)
+        with model_registry.use(model_name) as pipeline_to_use:
+            tokenizer = pipeline_to_use.tokenizer
+            model = pipeline_to_use.model
+            
+            prefix = pipeline_to_use.prefix or ""
+            input_ids, truncated = self._encode(tokenizer, [text], prefix, model_name)
+            pruning = [None]
+            if settings.EXTRACTIVE_ENABLED:
+                with STAGE_SECONDS.time(stage="extract", language=language):
+                    pruning = self._prefilter(tokenizer, [text], prefix, input_ids, truncated, language, model_name)
+            inputs = self._pad(tokenizer, input_ids)
+            stopping_criteria = StoppingCriteriaList(
+                [StopOnEvent(stop_event)] if stop_event is not None else []
+            )
+            
+            with STAGE_SECONDS.time(stage="generate", language=language), MODEL_GENERATE_SECONDS.time(model=model_name), no_grad():
+                output_ids = model.generate(
+                    input_ids=inputs["input_ids"].to(model.device),
+                    attention_mask=inputs["attention_mask"].to(model.device),
+                    max_length=max_length,
+                    min_length=min_length,
+                    do_sample=False,
+                    num_beams=1,
+                    streamer=CallbackStreamer(tokenizer, on_text),
+                    stopping_criteria=stopping_criteria
+                )
+            
+            summary = tokenizer.decode(output_ids[0], skip_special_tokens=True)
+            output_tokens = int((output_ids[0][1:] != tokenizer.pad_token_id).sum())
+        
+        SUMMARIES.inc(language=language, model=model_name)
+        self._record_model_usage(model_name, len(input_ids[0]), output_tokens)
         return {
-            "summary": result[0]["summary_text"],
-            "language": language
+            "summary": summary.strip(),
+            "language": language,
+            "model": model_name,
+            "input_tokens": len(input_ids[0]),
+            "output_tokens": output_tokens,
+            "truncated": truncated[0],
+            "pruned_sentences": pruning[0]["pruned_sentences"] if pruning[0] else None,
+            "pruned_tokens": pruning[0]["pruned_tokens"] if pruning[0] else None
         }
     
     @property
     def is_loaded(self) -> bool:
-        """Check if models are loaded"""
-        return self._en_pipeline is not None and self._th_pipeline is not None
+        """Check if at least one model is loaded and ready"""
+        return any(
+            model_registry.state(name) == ModelState.READY for name in self.model_names
+        )
 
 
 # Global instance
 summarizer_service = SummarizerService()
+
+
+def run_summarize(
+    text: str,
+    max_length: int,
+    min_length: int,
+    language: str = None,
+    profile: Optional[str] = None,
+    model: Optional[str] = None
+) -> dict:
+    """Module-level entry point so the call can be sent to an inference worker"""
+    return summarizer_service.summarize(text, max_length, min_length, language, profile, model)
+
+
+def run_summarize_many(
+    texts: list[str],
+    max_length: int,
+    min_length: int,
+    language: str,
+    profile: Optional[str] = None,
+    model: Optional[str] = None
+) -> list[dict]:
+    """Module-level entry point so the call can be sent to an inference worker"""
+    return summarizer_service.summarize_many(texts, max_length, min_length, language, profile, model)
+
+
+def run_summarize_long(
+    text: str,
+    max_length: int,
+    min_length: int,
+    language: str,
+    profile: Optional[str] = None,
+    model: Optional[str] = None
+) -> dict:
+    """Module-level entry point so the call can be sent to an inference worker"""
+    return summarizer_service.summarize_long(text, max_length, min_length, language, profile, model)
+
+
+def run_needs_long_document_mode(text: str, language: str, model: Optional[str] = None) -> bool:
+    """Module-level entry point so the call can be sent to an inference worker"""
+    return summarizer_service.needs_long_document_mode(text, language, model)
+
+
+def run_warm_up(languages: list[str], input_tokens: Optional[list[int]] = None) -> list[dict]:
+    """Module-level entry point so warm-up runs inside an inference worker"""
+    return summarizer_service.warm_up(languages, input_tokens)
@@ -0,0 +1,105 @@
+"""
+Startup Warm-up
+Loads and exercises the models in the background, and tracks whether the service is ready for traffic
+"""
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from app.core.config import settings
+from app.services.executor import inference_executor, worker_warm_up_steps
+from app.services.language import language_detector
+from app.services.summarizer import run_warm_up
+
+logger = logging.getLogger(__name__)
+
+WARMING_UP = "warming_up"
+READY = "ready"
+FAILED = "failed"
+STOPPING = "stopping"
+
+
+class StartupWarmup:
+    """
+    Startup phase that runs while the server already answers requests
+    
+    The HTTP server starts right away so /health and /ready can be probed;
+    /ready only reports ready once language detection and the
+    MODEL_WARMUP_LANGUAGES models are loaded and their warm-up generations
+    have run.
+    """
+    
+    def __init__(self):
+        self.state = WARMING_UP
+        self.error: Optional[str] = None
+        self.steps: list[dict] = []
+        self.seconds: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+    
+    @property
+    def ready(self) -> bool:
+        """Whether the service should receive traffic"""
+        return self.state == READY
+    
+    def start(self):
+        """Start warming up in the background"""
+        self.state = WARMING_UP
+        self.error = None
+        self.steps = []
+        self._task = asyncio.create_task(self._run())
+    
+    async def _run(self):
+        started = time.monotonic()
+        languages = settings.MODEL_WARMUP_LANGUAGES
+        try:
+            # Load langdetect profiles now so the first mixed-script request does not pay for it
+            await asyncio.to_thread(language_detector.load)
+            
+            if languages:
+                logger.info(f"Warming up models for: {', '.join(languages)}")
+                if settings.INFERENCE_EXECUTOR == "process":
+                    # Every worker process warms up its own models in the pool initializer
+                    results = await asyncio.gather(*(
+                        inference_executor.run(worker_warm_up_steps)
+                        for _ in range(max(1, settings.INFERENCE_WORKERS))
+                    ))
+                    self.steps = results[0]
+                else:
+                    self.steps = await inference_executor.run(
+                        run_warm_up, languages, settings.WARMUP_INPUT_TOKENS
+                    )
+        except Exception as e:
+            self.state = FAILED
+            self.error = str(e)
+            logger.error(f"Warm-up failed, the service stays not ready: {e}")
+            return
+        
+        self.seconds = round(time.monotonic() - started, 3)
+        self.state = READY
+        logger.info(f"Warm-up finished in {self.seconds:.1f}s, ready for traffic")
+    
+    async def stop(self):
+        """Report not ready (so load balancers drain this instance) and cancel a running warm-up"""
+        self.state = STOPPING
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+    
+    def status(self) -> dict:
+        """Readiness details for the /ready endpoint"""
+        return {
+            "ready": self.ready,
+            "state": self.state,
+            "languages": list(settings.MODEL_WARMUP_LANGUAGES),
+            "steps": self.steps,
+            "seconds": self.seconds,
+            "error": self.error
+        }
+
+
+# Global instance
+startup_warmup = StartupWarmup()
@@ -0,0 +1,152 @@
+"""
+Extractive Pre-filter Benchmark
+Latency saved per document length by shrinking inputs to their most central sentences before generation
+
+Usage:
+    python -m benchmarks.bench_extractive --lengths 256,512,1024,2048 --budget 256 --output bench/extractive.json
+
+Each document length is summarized twice, once as is (truncated at the
+model input) and once through the pre-filter with EXTRACTIVE_TOKEN_BUDGET
+set to --budget. Tiny random models make the latency columns meaningful but
+not the summaries; use --real for overlap numbers that mean something.
+"""
+import argparse
+import os
+import random
+import time
+
+from benchmarks.common import EN_SENTENCES, TH_SENTENCES, environment, percentiles, write_report
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the extractive pre-filter")
+    parser.add_argument("--lengths", default="256,512,1024,2048", help="Comma-separated document lengths in tokens")
+    parser.add_argument("--budget", type=int, default=256, help="EXTRACTIVE_TOKEN_BUDGET of the pre-filtered runs")
+    parser.add_argument("--documents", type=int, default=8, help="Documents per length and language")
+    parser.add_argument("--max-length", type=int, default=60)
+    parser.add_argument("--min-length", type=int, default=10)
+    parser.add_argument("--languages", default="en,th", help="Comma-separated languages")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--d-model", type=int, default=256, help="Hidden size of the tiny models")
+    parser.add_argument("--layers", type=int, default=4, help="Encoder/decoder layers of the tiny models")
+    parser.add_argument("--models-dir", default=".bench_models", help="Where tiny models are built")
+    parser.add_argument("--real", action="store_true", help="Use the configured models instead of tiny ones")
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    return parser.parse_args()
+
+
+def configure(args: argparse.Namespace):
+    """Tiny models sized so the encoder cost shows; must run before importing app modules"""
+    os.environ["SUMMARY_CACHE_ENABLED"] = "false"
+    if args.real:
+        return
+    from benchmarks.tiny_models import create_tiny_model
+    size = f"{args.d_model}x{args.layers}"
+    for language, seed in (("en", 0), ("th", 1)):
+        os.environ[f"MODEL_NAME_{language.upper()}"] = create_tiny_model(
+            os.path.join(args.models_dir, f"tiny-{language}-{size}"), d_model=args.d_model, layers=args.layers, seed=seed
+        )
+
+
+def make_documents(tokenizer, language: str, tokens: int, count: int, rng: random.Random) -> list[str]:
+    """Documents of roughly the given token count, built from shuffled sentences"""
+    from app.services.chunking import count_tokens
+    
+    pool = TH_SENTENCES if language == "th" else EN_SENTENCES
+    documents = []
+    for index in range(count):
+        sentences = [f"{index}."]
+        while count_tokens(tokenizer, " ".join(sentences)) < tokens:
+            sentences.append(rng.choice(pool))
+        documents.append(" ".join(sentences))
+    return documents
+
+
+def run(documents: list[str], language: str, args: argparse.Namespace) -> tuple[list[float], list[dict]]:
+    """Summarize documents one at a time"""
+    from app.services.summarizer import summarizer_service
+    
+    latencies, results = [], []
+    for text in documents:
+        started = time.perf_counter()
+        results.append(summarizer_service.summarize_many([text], args.max_length, args.min_length, language)[0])
+        latencies.append(time.perf_counter() - started)
+    return latencies, results
+
+
+def extract_latencies(documents: list[str], language: str) -> list[float]:
+    """Time of the pre-filter stage alone (sentence split, token counts, TextRank and re-encode)"""
+    from app.services.model_registry import model_registry
+    from app.services.summarizer import summarizer_service
+    
+    latencies = []
+    with model_registry.use(summarizer_service.model_name_for(language)) as pipeline_to_use:
+        tokenizer = pipeline_to_use.tokenizer
+        prefix = pipeline_to_use.prefix or ""
+        for text in documents:
+            input_ids, truncated = summarizer_service._encode(tokenizer, [text], prefix)
+            started = time.perf_counter()
+            summarizer_service._prefilter(tokenizer, [text], prefix, input_ids, truncated, language)
+            latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def main():
+    args = parse_args()
+    configure(args)
+    
+    from app.core.config import settings
+    from app.services.backends import token_f1
+    from app.services.model_registry import model_registry
+    from app.services.summarizer import summarizer_service
+    
+    rng = random.Random(args.seed)
+    lengths = [int(length) for length in args.lengths.split(",")]
+    results = []
+    for language in args.languages.split(","):
+        with model_registry.use(summarizer_service.model_name_for(language)) as pipeline_to_use:
+            tokenizer = pipeline_to_use.tokenizer
+        # Untimed call so model loading is not measured
+        summarizer_service.summarize_many(["warm up " * 8], args.max_length, args.min_length, language)
+        
+        for tokens in lengths:
+            documents = make_documents(tokenizer, language, tokens, args.documents, rng)
+            
+            settings.EXTRACTIVE_ENABLED = False
+            baseline_latencies, baseline = run(documents, language, args)
+            
+            settings.EXTRACTIVE_ENABLED = True
+            settings.EXTRACTIVE_TOKEN_BUDGET = args.budget
+            latencies, pruned = run(documents, language, args)
+            
+            baseline_p50 = percentiles(baseline_latencies)["p50"]
+            p50 = percentiles(latencies)["p50"]
+            pairs = [(a["summary"], b["summary"]) for a, b in zip(baseline, pruned)]
+            results.append({
+                "language": language,
+                "document_tokens": tokens,
+                "input_tokens_baseline": round(sum(r["input_tokens"] for r in baseline) / len(baseline), 1),
+                "input_tokens_prefiltered": round(sum(r["input_tokens"] for r in pruned) / len(pruned), 1),
+                "pruned_tokens": round(sum(r["pruned_tokens"] or 0 for r in pruned) / len(pruned), 1),
+                "pruned_sentences": round(sum(r["pruned_sentences"] or 0 for r in pruned) / len(pruned), 1),
+                "baseline_ms": percentiles(baseline_latencies),
+                "prefiltered_ms": percentiles(latencies),
+                "extract_ms": percentiles(extract_latencies(documents, language)),
+                "saved_ms_p50": round(baseline_p50 - p50, 2),
+                "speedup_p50": round(baseline_p50 / p50, 2) if p50 else None,
+                "token_f1_vs_baseline": round(sum(token_f1(a, b) for a, b in pairs) / len(pairs), 4)
+            })
+    
+    write_report({
+        "benchmark": "extractive",
+        "environment": environment(),
+        "models": {"en": settings.MODEL_NAME_EN, "th": settings.MODEL_NAME_TH},
+        "budget": args.budget,
+        "max_input_length": settings.MAX_INPUT_LENGTH,
+        "documents_per_length": args.documents,
+        "results": results
+    }, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Language Detection Benchmark
+Per-call cost of the script-ratio detector against full-text langdetect, and how often they agree
+
+Usage:
+    python -m benchmarks.bench_language --documents 2000 --output bench/language.json
+"""
+import argparse
+import random
+import time
+
+from benchmarks.common import EN_SENTENCES, TH_SENTENCES, environment, make_corpus, percentiles, write_report
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark Thai/English language detection")
+    parser.add_argument("--documents", type=int, default=1000, help="Pure EN/TH documents")
+    parser.add_argument("--mixed", type=int, default=500, help="Documents mixing Thai and English sentences")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    return parser.parse_args()
+
+
+def make_mixed(count: int, seed: int = 0) -> list[str]:
+    """Documents with a random share of Thai and English sentences"""
+    rng = random.Random(seed)
+    documents = []
+    for _ in range(count):
+        size = rng.randint(2, 12)
+        thai = rng.randint(0, size)
+        sentences = rng.choices(TH_SENTENCES, k=thai) + rng.choices(EN_SENTENCES, k=size - thai)
+        rng.shuffle(sentences)
+        documents.append(" ".join(sentences))
+    return documents
+
+
+def _time_calls(detect, texts: list[str]) -> tuple[list[str], list[float]]:
+    results, latencies = [], []
+    for text in texts:
+        started = time.perf_counter()
+        results.append(detect(text))
+        latencies.append(time.perf_counter() - started)
+    return results, latencies
+
+
+def _micros(latencies: list[float]) -> dict:
+    # percentiles() reports milliseconds; detection is measured in microseconds
+    return {name: round(value * 1000, 1) for name, value in percentiles(latencies).items()}
+
+
+def main():
+    args = parse_args()
+    texts = [item["text"] for item in make_corpus(args.documents, seed=args.seed)]
+    texts += make_mixed(args.mixed, seed=args.seed)
+    
+    from langdetect import DetectorFactory, LangDetectException, detect
+    from langdetect.detector_factory import init_factory
+    from app.services.language import LanguageDetector
+    
+    # Previous behavior: langdetect on the full text (seeded here so the reference is stable)
+    def reference(text: str) -> str:
+        try:
+            return 'th' if detect(text) == 'th' else 'en'
+        except LangDetectException:
+            return 'en'
+    
+    DetectorFactory.seed = 0
+    started = time.perf_counter()
+    init_factory()
+    profile_load_s = time.perf_counter() - started
+    
+    detector = LanguageDetector()
+    detector.load()
+    
+    expected, reference_latencies = _time_calls(reference, texts)
+    actual, detector_latencies = _time_calls(detector.detect, texts)
+    fast_path = sum(detector.classify(text) is not None for text in texts)
+    pure = args.documents
+    
+    write_report({
+        "benchmark": "language",
+        "environment": environment(),
+        "documents": len(texts),
+        "mixed_documents": args.mixed,
+        "langdetect_profile_load_ms": round(profile_load_s * 1000, 1),
+        "reference_us": _micros(reference_latencies),
+        "detector_us": _micros(detector_latencies),
+        "speedup_mean": round(sum(reference_latencies) / sum(detector_latencies), 1),
+        "fast_path_rate": round(fast_path / len(texts), 4),
+        "agreement": round(sum(a == b for a, b in zip(expected, actual)) / len(texts), 4),
+        "agreement_pure": round(sum(a == b for a, b in zip(expected[:pure], actual[:pure])) / max(1, pure), 4),
+        "agreement_mixed": round(
+            sum(a == b for a, b in zip(expected[pure:], actual[pure:])) / max(1, len(texts) - pure), 4
+        )
+    }, args.output)
+
+
+if __name__ == "__main__":
+    main()
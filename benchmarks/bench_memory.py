@@ -0,0 +1,194 @@
+"""
+Multi-Worker Memory Benchmark
+Total memory of N uvicorn workers that each load the models, against N workers sharing one model host
+
+Usage:
+    python -m benchmarks.bench_memory --workers 4 --output bench/memory.json
+
+Reads /proc, so it runs on Linux only. PSS splits shared pages between the
+processes that map them, so its total is the fairest whole-deployment figure.
+"""
+import argparse
+import json
+import os
+import secrets
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+
+from benchmarks.common import environment, make_corpus, write_report
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Compare memory of per-worker models vs a shared model host")
+    parser.add_argument("--workers", type=int, default=4, help="uvicorn workers")
+    parser.add_argument("--requests", type=int, default=8, help="Requests sent before measuring")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--d-model", type=int, default=512, help="Hidden size of the tiny models")
+    parser.add_argument("--layers", type=int, default=6, help="Encoder/decoder layers of the tiny models")
+    parser.add_argument("--models-dir", default=".bench_models")
+    parser.add_argument("--real", action="store_true", help="Use the configured models instead of tiny ones")
+    parser.add_argument("--timeout", type=float, default=600, help="Seconds to wait for startup")
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    return parser.parse_args()
+
+
+def _children(pid: int) -> list[int]:
+    """pid and all of its descendants"""
+    parents: dict[int, list[int]] = {}
+    for entry in Path("/proc").iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            # Field 4 of /proc/<pid>/stat is the parent pid (after the parenthesised command)
+            ppid = int((entry / "stat").read_text().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        parents.setdefault(ppid, []).append(int(entry.name))
+    tree, stack = [], [pid]
+    while stack:
+        current = stack.pop()
+        tree.append(current)
+        stack.extend(parents.get(current, []))
+    return tree
+
+
+def _memory_kb(pid: int) -> dict:
+    """RSS and PSS of one process in kB"""
+    result = {"rss": 0, "pss": 0}
+    try:
+        for line in Path(f"/proc/{pid}/smaps_rollup").read_text().splitlines():
+            key, _, value = line.partition(":")
+            if key in ("Rss", "Pss"):
+                result[key.lower()] = int(value.split()[0])
+    except OSError:
+        pass
+    return result
+
+
+def _measure(roots: list[int]) -> dict:
+    processes = []
+    for root in roots:
+        for pid in _children(root):
+            try:
+                command = Path(f"/proc/{pid}/cmdline").read_bytes().replace(b"\0", b" ").decode().strip()
+            except OSError:
+                continue
+            processes.append({"pid": pid, "command": command[:80], **_memory_kb(pid)})
+    return {
+        "processes": len(processes),
+        "rss_mb_total": round(sum(p["rss"] for p in processes) / 1024, 1),
+        "pss_mb_total": round(sum(p["pss"] for p in processes) / 1024, 1),
+        "per_process": [
+            {"pid": p["pid"], "command": p["command"], "rss_mb": round(p["rss"] / 1024, 1), "pss_mb": round(p["pss"] / 1024, 1)}
+            for p in processes
+        ]
+    }
+
+
+def _wait_for(log: Path, marker: str, count: int, process: subprocess.Popen, timeout: float):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Process exited early, see {log}")
+        if log.read_text(errors="replace").count(marker) >= count:
+            return
+        time.sleep(0.5)
+    raise TimeoutError(f"Timed out waiting for '{marker}' x{count} in {log}")
+
+
+def _send_requests(port: int, count: int):
+    for item in make_corpus(count):
+        request = urllib.request.Request(
+            f"http://127.0.0.1:{port}/api/v1/summarize/",
+            data=json.dumps({**item, "max_length": 40, "min_length": 5}).encode(),
+            headers={"Content-Type": "application/json"}
+        )
+        with urllib.request.urlopen(request, timeout=300) as response:
+            response.read()
+
+
+def _start(command: list[str], env: dict, log: Path) -> subprocess.Popen:
+    return subprocess.Popen(command, cwd=ROOT, env=env, stdout=log.open("w"), stderr=subprocess.STDOUT)
+
+
+def _stop(processes: list[subprocess.Popen]):
+    for process in processes:
+        process.terminate()
+    for process in processes:
+        try:
+            process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def run_layout(layout: str, args: argparse.Namespace, base_env: dict, workdir: Path) -> dict:
+    """Start one deployment layout, warm it up, measure it and stop it"""
+    env = dict(base_env)
+    uvicorn = [
+        sys.executable, "-m", "uvicorn", "main:app",
+        "--workers", str(args.workers), "--port", str(args.port), "--log-level", "info"
+    ]
+    processes = []
+    try:
+        if layout == "per_worker":
+            # Every worker loads both models at startup
+            env.update(INFERENCE_EXECUTOR="thread", MODEL_WARMUP_LANGUAGES='["en", "th"]')
+        else:
+            env.update(
+                INFERENCE_EXECUTOR="remote",
+                MODEL_WARMUP_LANGUAGES="[]",
+                MODEL_HOST_ADDRESS=str(workdir / "model-host.sock"),
+                MODEL_HOST_AUTHKEY=env.get("MODEL_HOST_AUTHKEY") or secrets.token_hex(32)
+            )
+            host_log = workdir / "model-host.log"
+            processes.append(_start(
+                [sys.executable, "-m", "app.services.model_host", "--warmup", "en,th"], env, host_log
+            ))
+            _wait_for(host_log, "Model host listening", 1, processes[-1], args.timeout)
+        
+        web_log = workdir / f"{layout}.log"
+        processes.append(_start(uvicorn, env, web_log))
+        _wait_for(web_log, "Warm-up finished", args.workers, processes[-1], args.timeout)
+        
+        _send_requests(args.port, args.requests)
+        return _measure([process.pid for process in processes])
+    finally:
+        _stop(processes)
+
+
+def main():
+    args = parse_args()
+    env = os.environ.copy()
+    env["SUMMARY_CACHE_ENABLED"] = "false"
+    env["JOBS_DB_PATH"] = ":memory:"
+    if not args.real:
+        from benchmarks.tiny_models import create_tiny_model
+        size = f"{args.d_model}x{args.layers}"
+        env["MODEL_NAME_EN"] = create_tiny_model(
+            os.path.join(args.models_dir, f"tiny-en-{size}"), d_model=args.d_model, layers=args.layers, seed=0
+        )
+        env["MODEL_NAME_TH"] = create_tiny_model(
+            os.path.join(args.models_dir, f"tiny-th-{size}"), d_model=args.d_model, layers=args.layers, seed=1
+        )
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        results = {layout: run_layout(layout, args, env, Path(tmp)) for layout in ("per_worker", "model_host")}
+    
+    write_report({
+        "benchmark": "memory",
+        "environment": environment(),
+        "workers": args.workers,
+        "models": {"en": env.get("MODEL_NAME_EN"), "th": env.get("MODEL_NAME_TH")},
+        "results": results,
+        "pss_saved_mb": round(results["per_worker"]["pss_mb_total"] - results["model_host"]["pss_mb_total"], 1)
+    }, args.output)
+
+
+if __name__ == "__main__":
+    main()
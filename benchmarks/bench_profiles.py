@@ -0,0 +1,120 @@
+"""
+Generation Profile Benchmark
+Latency of each generation profile and how close its summaries stay to the "quality" profile
+
+Usage:
+    python -m benchmarks.bench_profiles --documents 32 --output bench/profiles.json
+
+Tiny random models make the latency column meaningful but not the summaries
+themselves; use --real (with ASSISTANT_MODELS set for the assisted profile)
+for quality numbers that mean something.
+"""
+import argparse
+import json
+import os
+import time
+
+from benchmarks.common import environment, make_corpus, percentiles, write_report
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark generation profiles")
+    parser.add_argument("--documents", type=int, default=16)
+    parser.add_argument("--profiles", help="Comma-separated profiles (default: all configured)")
+    parser.add_argument("--reference", default="quality", help="Profile the others are compared against")
+    parser.add_argument("--max-length", type=int, default=60)
+    parser.add_argument("--min-length", type=int, default=10)
+    parser.add_argument("--languages", default="en,th", help="Comma-separated languages to alternate")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--d-model", type=int, default=512, help="Hidden size of the tiny main models")
+    parser.add_argument("--layers", type=int, default=6, help="Encoder/decoder layers of the tiny main models")
+    parser.add_argument("--models-dir", default=".bench_models", help="Where tiny models are built")
+    parser.add_argument("--real", action="store_true", help="Use the configured models instead of tiny ones")
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    return parser.parse_args()
+
+
+def configure(args: argparse.Namespace):
+    """Tiny main models with the default tiny models as their drafts; must run before importing app modules"""
+    os.environ["SUMMARY_CACHE_ENABLED"] = "false"
+    if args.real:
+        return
+    from benchmarks.tiny_models import create_tiny_model
+    size = f"{args.d_model}x{args.layers}"
+    assistants = {}
+    for language, seed in (("en", 0), ("th", 1)):
+        main_model = create_tiny_model(
+            os.path.join(args.models_dir, f"tiny-{language}-{size}"), d_model=args.d_model, layers=args.layers, seed=seed
+        )
+        # Every tiny model shares one tokenizer, so the small one can draft for the large one
+        assistants[main_model] = create_tiny_model(os.path.join(args.models_dir, f"tiny-{language}"), seed=seed)
+        os.environ[f"MODEL_NAME_{language.upper()}"] = main_model
+    os.environ["ASSISTANT_MODELS"] = json.dumps(assistants)
+
+
+def run_profile(profile: str, corpus: list[dict], args: argparse.Namespace) -> dict:
+    """Summarize every document one at a time with a profile"""
+    from app.services.summarizer import summarizer_service
+    
+    # Untimed call per language so model loading is not measured
+    for language in {item["language"] for item in corpus}:
+        summarizer_service.summarize_many(["warm up " * 8], args.max_length, args.min_length, language, profile)
+    
+    latencies, summaries, resolved = [], [], set()
+    for item in corpus:
+        started = time.perf_counter()
+        result = summarizer_service.summarize_many(
+            [item["text"]], args.max_length, args.min_length, item["language"], profile
+        )[0]
+        latencies.append(time.perf_counter() - started)
+        summaries.append(result["summary"])
+        resolved.add(result["profile"])
+    
+    return {
+        "profile": profile,
+        "ran_as": sorted(resolved),
+        "latency_ms": percentiles(latencies),
+        "seconds": round(sum(latencies), 3),
+        "summaries": summaries
+    }
+
+
+def main():
+    args = parse_args()
+    configure(args)
+    
+    from app.core.config import settings
+    from app.services.backends import token_f1
+    
+    corpus = make_corpus(args.documents, seed=args.seed, languages=tuple(args.languages.split(",")))
+    profiles = args.profiles.split(",") if args.profiles else list(settings.GENERATION_PROFILES)
+    if args.reference not in profiles:
+        profiles.insert(0, args.reference)
+    
+    runs = {profile: run_profile(profile, corpus, args) for profile in profiles}
+    reference = runs[args.reference]
+    reference_summaries = reference["summaries"]
+    
+    results = []
+    for run in runs.values():
+        pairs = list(zip(reference_summaries, run.pop("summaries")))
+        results.append({
+            **run,
+            "speedup_vs_reference": round(reference["seconds"] / run["seconds"], 2) if run["seconds"] else None,
+            "exact_match_vs_reference": round(sum(a == b for a, b in pairs) / len(pairs), 4),
+            "token_f1_vs_reference": round(sum(token_f1(a, b) for a, b in pairs) / len(pairs), 4)
+        })
+    
+    write_report({
+        "benchmark": "profiles",
+        "environment": environment(),
+        "models": {"en": settings.MODEL_NAME_EN, "th": settings.MODEL_NAME_TH},
+        "assistant_models": settings.ASSISTANT_MODELS,
+        "documents": len(corpus),
+        "reference": args.reference,
+        "results": results
+    }, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Response Serialization Benchmark
+Encoding time and body size of large /summarize/batch responses: the previous JSON path against orjson and slim responses
+
+Usage:
+    python -m benchmarks.bench_serialization --items 200 --text-kb 50 --output bench/serialization.json
+
+No model is loaded - every item carries a fixed summary, so only response
+building and encoding is measured.
+"""
+import argparse
+import time
+
+from benchmarks.common import EN_SENTENCES, environment, percentiles, write_report
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark summarize response serialization")
+    parser.add_argument("--items", type=int, default=200, help="Items per batch response")
+    parser.add_argument("--text-kb", type=float, default=50, help="Size of each input text in kB")
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--fields", default="summary,language,input_tokens,output_tokens", help="fields= variant")
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    return parser.parse_args()
+
+
+def make_batch(items: int, text_kb: float) -> list[tuple[str, dict]]:
+    """(input text, service result) pairs shaped like batch_scheduler output"""
+    article = " ".join(EN_SENTENCES)
+    repeats = max(1, int(text_kb * 1024 / (len(article) + 1)))
+    batch = []
+    for index in range(items):
+        text = f"{index}. " + " ".join([article] * repeats)
+        batch.append((text, {
+            "summary": " ".join(EN_SENTENCES[:3]),
+            "language": "en",
+            "profile": "quality",
+            "input_tokens": 1024,
+            "output_tokens": 60,
+            "truncated": True
+        }))
+    return batch
+
+
+def encode_previous(batch: list[tuple[str, dict]]) -> bytes:
+    """What the endpoint did before: BatchItemResult models, validated and encoded by FastAPI with json"""
+    from fastapi.responses import JSONResponse
+    from pydantic import TypeAdapter
+    from app.api.v1.endpoints.summarize import build_response
+    from app.models.schemas import BatchItemResult
+    
+    results = [
+        BatchItemResult(index=index, result=build_response(text, output))
+        for index, (text, output) in enumerate(batch)
+    ]
+    # FastAPI re-validates the return value against response_model, dumps it
+    # in JSON mode and renders it with json.dumps
+    adapter = TypeAdapter(list[BatchItemResult])
+    content = adapter.dump_python(adapter.validate_python(results), mode="json")
+    return JSONResponse(content).body
+
+
+def encode_orjson(batch: list[tuple[str, dict]], fields) -> bytes:
+    """What the endpoint does now (fields as returned by response_fields())"""
+    from app.api.responses import OrjsonResponse
+    from app.api.v1.endpoints.summarize import build_response
+    
+    return OrjsonResponse([
+        {"index": index, "result": build_response(text, output).model_dump(include=fields), "error": None}
+        for index, (text, output) in enumerate(batch)
+    ]).body
+
+
+def measure(encode, repeats: int) -> dict:
+    latencies, size = [], 0
+    for _ in range(repeats):
+        started = time.perf_counter()
+        size = len(encode())
+        latencies.append(time.perf_counter() - started)
+    return {"latency_ms": percentiles(latencies), "bytes": size}
+
+
+def main():
+    args = parse_args()
+    
+    from app.api.v1.endpoints.summarize import response_fields
+    
+    batch = make_batch(args.items, args.text_kb)
+    variants = {
+        "previous_json": lambda: encode_previous(batch),
+        "orjson": lambda: encode_orjson(batch, response_fields(include_original=True, fields=None)),
+        "orjson_include_original_false": lambda: encode_orjson(
+            batch, response_fields(include_original=False, fields=None)
+        ),
+        "orjson_fields": lambda: encode_orjson(batch, response_fields(include_original=True, fields=args.fields))
+    }
+    results = {name: measure(encode, args.repeats) for name, encode in variants.items()}
+    
+    baseline = results["previous_json"]
+    for result in results.values():
+        result["speedup_vs_previous"] = round(baseline["latency_ms"]["p50"] / result["latency_ms"]["p50"], 2)
+        result["bytes_saved_vs_previous"] = baseline["bytes"] - result["bytes"]
+    
+    write_report({
+        "benchmark": "serialization",
+        "environment": environment(),
+        "items": args.items,
+        "text_kb": args.text_kb,
+        "fields": args.fields,
+        "results": results
+    }, args.output)
+
+
+if __name__ == "__main__":
+    main()
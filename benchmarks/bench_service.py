@@ -0,0 +1,242 @@
+"""
+Summarization Service Benchmark
+Measures latency and throughput of SummarizerService and the /summarize endpoints
+
+Usage:
+    python -m benchmarks.bench_service --targets service,api,batch --requests 64 --concurrency 8
+
+By default tiny randomly-initialized models are built in .bench_models/ so the
+run is offline; pass --real to benchmark MODEL_NAME_EN / MODEL_NAME_TH instead.
+"""
+import argparse
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.common import environment, make_corpus, peak_rss_mb, percentiles, write_report
+
+TARGETS = ("service", "api", "batch")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the summarization service")
+    parser.add_argument("--targets", default=",".join(TARGETS), help="Comma-separated subset of service,api,batch")
+    parser.add_argument("--requests", type=int, default=32, help="Documents per target")
+    parser.add_argument("--concurrency", type=int, default=4, help="Requests in flight at once")
+    parser.add_argument("--batch-size", type=int, default=8, help="Documents per /batch call")
+    parser.add_argument("--max-length", type=int, default=60)
+    parser.add_argument("--min-length", type=int, default=10)
+    parser.add_argument("--languages", default="en,th", help="Comma-separated languages to alternate")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--warmup", type=int, default=2, help="Untimed requests per target")
+    parser.add_argument("--models-dir", default=".bench_models", help="Where tiny models are built")
+    parser.add_argument("--real", action="store_true", help="Use the configured models instead of tiny ones")
+    parser.add_argument("--cache", action="store_true", help="Keep the summary cache enabled")
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    return parser.parse_args()
+
+
+def configure(args: argparse.Namespace) -> dict:
+    """Point the app at the benchmark models; must run before importing app modules"""
+    if not args.real:
+        from benchmarks.tiny_models import create_tiny_model
+        os.environ["MODEL_NAME_EN"] = create_tiny_model(os.path.join(args.models_dir, "tiny-en"), seed=0)
+        os.environ["MODEL_NAME_TH"] = create_tiny_model(os.path.join(args.models_dir, "tiny-th"), seed=1)
+    if not args.cache:
+        os.environ["SUMMARY_CACHE_ENABLED"] = "false"
+    
+    from app.core.config import settings
+    return {
+        "model_en": settings.MODEL_NAME_EN,
+        "model_th": settings.MODEL_NAME_TH,
+        "backend": settings.MODEL_BACKEND,
+        "executor": settings.INFERENCE_EXECUTOR,
+        "workers": settings.INFERENCE_WORKERS,
+        "batching": settings.BATCHING_ENABLED,
+        "batch_max_size": settings.BATCH_MAX_SIZE,
+        "cache": settings.SUMMARY_CACHE_ENABLED
+    }
+
+
+def output_tokens(result: dict) -> int:
+    """Tokens the model generated for a summary, as reported by the service (no extra tokenizer pass)"""
+    return result.get("output_tokens") or 0
+
+
+def _result(latencies: list[float], seconds: float, documents: int, tokens: int, errors: int, **extra) -> dict:
+    return {
+        **extra,
+        "documents": documents,
+        "errors": errors,
+        "seconds": round(seconds, 3),
+        "requests_per_s": round(len(latencies) / seconds, 2) if seconds else None,
+        "documents_per_s": round(documents / seconds, 2) if seconds else None,
+        "output_tokens": tokens,
+        "tokens_per_s": round(tokens / seconds, 2) if seconds else None,
+        "latency_ms": percentiles(latencies)
+    }
+
+
+def bench_service(corpus: list[dict], args: argparse.Namespace) -> dict:
+    """Call SummarizerService.summarize directly from a thread pool"""
+    from app.services.summarizer import summarizer_service
+    
+    def call(item: dict) -> tuple[float, int]:
+        started = time.perf_counter()
+        result = summarizer_service.summarize(
+            item["text"], args.max_length, args.min_length, item["language"]
+        )
+        return time.perf_counter() - started, output_tokens(result)
+    
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        list(pool.map(call, corpus[:args.warmup]))
+        
+        started = time.perf_counter()
+        measurements = list(pool.map(call, corpus))
+        seconds = time.perf_counter() - started
+    
+    return _result(
+        [latency for latency, _ in measurements],
+        seconds,
+        documents=len(corpus),
+        tokens=sum(tokens for _, tokens in measurements),
+        errors=0,
+        concurrency=args.concurrency
+    )
+
+
+async def _gather_limited(concurrency: int, calls: list) -> list:
+    """Run coroutine factories with at most `concurrency` in flight"""
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def limited(call):
+        async with semaphore:
+            return await call()
+    
+    return await asyncio.gather(*(limited(call) for call in calls))
+
+
+async def bench_api(client, corpus: list[dict], args: argparse.Namespace) -> dict:
+    """POST one document per request to /summarize/"""
+    from app.core.config import settings
+    url = f"{settings.API_V1_PREFIX}/summarize/"
+    
+    async def call(item: dict) -> tuple[float, int, bool]:
+        started = time.perf_counter()
+        response = await client.post(url, json={
+            "text": item["text"],
+            "max_length": args.max_length,
+            "min_length": args.min_length,
+            "language": item["language"]
+        })
+        latency = time.perf_counter() - started
+        if response.status_code != 200:
+            return latency, 0, False
+        return latency, output_tokens(response.json()), True
+    
+    await _gather_limited(args.concurrency, [lambda item=item: call(item) for item in corpus[:args.warmup]])
+    
+    started = time.perf_counter()
+    measurements = await _gather_limited(args.concurrency, [lambda item=item: call(item) for item in corpus])
+    seconds = time.perf_counter() - started
+    
+    return _result(
+        [latency for latency, _, _ in measurements],
+        seconds,
+        documents=len(corpus),
+        tokens=sum(tokens for _, tokens, _ in measurements),
+        errors=sum(not ok for _, _, ok in measurements),
+        concurrency=args.concurrency
+    )
+
+
+async def bench_batch(client, corpus: list[dict], args: argparse.Namespace) -> dict:
+    """POST documents in groups of --batch-size to /summarize/batch"""
+    from app.core.config import settings
+    url = f"{settings.API_V1_PREFIX}/summarize/batch"
+    batches = [corpus[start:start + args.batch_size] for start in range(0, len(corpus), args.batch_size)]
+    
+    async def call(batch: list[dict]) -> tuple[float, int, int]:
+        started = time.perf_counter()
+        response = await client.post(url, json=[
+            {
+                "text": item["text"],
+                "max_length": args.max_length,
+                "min_length": args.min_length,
+                "language": item["language"]
+            }
+            for item in batch
+        ])
+        latency = time.perf_counter() - started
+        if response.status_code != 200:
+            return latency, 0, len(batch)
+        tokens, errors = 0, 0
+        for item in response.json():
+            if item["result"] is None:
+                errors += 1
+            else:
+                tokens += output_tokens(item["result"])
+        return latency, tokens, errors
+    
+    warmup = [corpus[:args.warmup]] if args.warmup else []
+    await _gather_limited(args.concurrency, [lambda batch=batch: call(batch) for batch in warmup])
+    
+    started = time.perf_counter()
+    measurements = await _gather_limited(args.concurrency, [lambda batch=batch: call(batch) for batch in batches])
+    seconds = time.perf_counter() - started
+    
+    return _result(
+        [latency for latency, _, _ in measurements],
+        seconds,
+        documents=len(corpus),
+        tokens=sum(tokens for _, tokens, _ in measurements),
+        errors=sum(errors for _, _, errors in measurements),
+        concurrency=args.concurrency,
+        batch_size=args.batch_size
+    )
+
+
+async def bench_http(targets: list[str], corpus: list[dict], args: argparse.Namespace) -> dict:
+    """Run the endpoint benchmarks against the app in-process through an ASGI client"""
+    import httpx
+    from main import app
+    
+    results = {}
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            if "api" in targets:
+                results["api"] = await bench_api(client, corpus, args)
+            if "batch" in targets:
+                results["batch"] = await bench_batch(client, corpus, args)
+    return results
+
+
+def main():
+    args = parse_args()
+    targets = [target.strip() for target in args.targets.split(",") if target.strip()]
+    unknown = set(targets) - set(TARGETS)
+    if unknown:
+        raise SystemExit(f"Unknown targets: {', '.join(sorted(unknown))}")
+    
+    config = configure(args)
+    corpus = make_corpus(args.requests, seed=args.seed, languages=tuple(args.languages.split(",")))
+    
+    results = {}
+    if "service" in targets:
+        results["service"] = bench_service(corpus, args)
+    if "api" in targets or "batch" in targets:
+        results.update(asyncio.run(bench_http(targets, corpus, args)))
+    
+    write_report({
+        "benchmark": "service",
+        "environment": environment(),
+        "config": config,
+        "results": results,
+        "peak_rss_mb": peak_rss_mb()
+    }, args.output)
+
+
+if __name__ == "__main__":
+    main()
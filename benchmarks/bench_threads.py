@@ -0,0 +1,205 @@
+"""
+Thread and Worker Sweep
+Throughput of every inference worker count x torch thread count (x core pinning) mix, to pick the best for this machine
+
+Usage:
+    python -m benchmarks.bench_threads --workers 1,2,4 --threads 0,1,2,4 --affinity off,on --output bench/threads.json
+
+Every mix runs in a fresh process, since torch fixes its thread pools once
+they have started. A thread count of 0 is the default share: the available
+cores divided by the workers (the pinned core set with --affinity on). The
+report ends with the fastest mix as environment variables for .env.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from benchmarks.common import environment, make_corpus, percentiles, write_report
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Sweep inference workers and torch threads for the best throughput")
+    parser.add_argument("--executor", default="process", choices=("process", "thread"), help="INFERENCE_EXECUTOR of every run")
+    parser.add_argument("--workers", default="1,2,4", help="Comma-separated INFERENCE_WORKERS values")
+    parser.add_argument("--threads", default="0,1,2,4", help="Comma-separated TORCH_NUM_THREADS values, 0 = share of the cores")
+    parser.add_argument("--affinity", default="off", help="Comma-separated subset of off,on (INFERENCE_CPU_AFFINITY)")
+    parser.add_argument("--skip-oversubscribed", action="store_true", help="Skip mixes with more threads than cores")
+    parser.add_argument("--requests", type=int, default=64, help="Documents per mix")
+    parser.add_argument("--batch-size", type=int, default=4, help="Documents per inference call")
+    parser.add_argument("--max-length", type=int, default=60)
+    parser.add_argument("--min-length", type=int, default=10)
+    parser.add_argument("--languages", default="en", help="Comma-separated languages to alternate")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--d-model", type=int, default=256, help="Hidden size of the tiny models")
+    parser.add_argument("--layers", type=int, default=4, help="Encoder/decoder layers of the tiny models")
+    parser.add_argument("--models-dir", default=".bench_models", help="Where tiny models are built")
+    parser.add_argument("--real", action="store_true", help="Use the configured models instead of tiny ones")
+    parser.add_argument("--timeout", type=float, default=1800, help="Seconds one mix may take")
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def _values(spec: str) -> list[int]:
+    return [int(value) for value in spec.split(",") if value.strip()]
+
+
+def threads_per_worker(workers: int) -> int:
+    """Intra-op threads each worker of this run actually gets"""
+    from app.core.config import settings
+    from app.services.cpu import worker_cpu_sets, worker_threads
+    
+    if settings.TORCH_NUM_THREADS > 0:
+        return settings.TORCH_NUM_THREADS
+    if settings.INFERENCE_CPU_AFFINITY and settings.INFERENCE_EXECUTOR == "process":
+        return len(worker_cpu_sets(workers)[0])
+    threads = worker_threads(workers)
+    if threads:
+        return threads
+    
+    import torch
+    return torch.get_num_threads()
+
+
+async def measure(args: argparse.Namespace) -> dict:
+    """One mix: warm every worker up, then summarize the corpus through the inference executor"""
+    from app.core.config import settings
+    from app.services.executor import inference_executor
+    from app.services.summarizer import run_summarize_many
+    
+    workers = max(1, settings.INFERENCE_WORKERS)
+    corpus = make_corpus(args.requests, seed=args.seed, languages=tuple(args.languages.split(",")))
+    calls = []
+    for language in args.languages.split(","):
+        texts = [item["text"] for item in corpus if item["language"] == language]
+        calls.extend(
+            (texts[start:start + args.batch_size], language) for start in range(0, len(texts), args.batch_size)
+        )
+    
+    # Untimed: one call per worker and language so every worker has its models loaded
+    await asyncio.gather(*(
+        inference_executor.run(run_summarize_many, ["warm up " * 8], args.max_length, args.min_length, language)
+        for language in args.languages.split(",")
+        for _ in range(workers * 2)
+    ))
+    
+    latencies = []
+    
+    async def timed(texts: list[str], language: str):
+        started = time.perf_counter()
+        await inference_executor.run(run_summarize_many, texts, args.max_length, args.min_length, language)
+        latencies.append(time.perf_counter() - started)
+    
+    started = time.perf_counter()
+    await asyncio.gather(*(timed(texts, language) for texts, language in calls))
+    seconds = time.perf_counter() - started
+    inference_executor.shutdown()
+    
+    return {
+        "documents": len(corpus),
+        "calls": len(calls),
+        "seconds": round(seconds, 3),
+        "docs_per_s": round(len(corpus) / seconds, 2),
+        "call_ms": percentiles(latencies),
+        "threads_per_worker": threads_per_worker(workers)
+    }
+
+
+def run_mix(args: argparse.Namespace, env: dict, workers: int, threads: int, affinity: bool) -> dict:
+    """Run one mix in a fresh interpreter and return its result line"""
+    mix = {
+        "INFERENCE_EXECUTOR": args.executor,
+        "INFERENCE_WORKERS": str(workers),
+        "TORCH_NUM_THREADS": str(threads),
+        "INFERENCE_CPU_AFFINITY": "true" if affinity else "false"
+    }
+    command = [
+        sys.executable, "-m", "benchmarks.bench_threads", "--child",
+        "--requests", str(args.requests),
+        "--batch-size", str(args.batch_size),
+        "--max-length", str(args.max_length),
+        "--min-length", str(args.min_length),
+        "--languages", args.languages,
+        "--seed", str(args.seed)
+    ]
+    result = {"workers": workers, "torch_num_threads": threads, "affinity": affinity}
+    try:
+        process = subprocess.run(
+            command, cwd=ROOT, env={**env, **mix}, capture_output=True, text=True, timeout=args.timeout
+        )
+    except subprocess.TimeoutExpired:
+        return {**result, "error": f"timed out after {args.timeout}s"}
+    lines = process.stdout.strip().splitlines()
+    if process.returncode != 0 or not lines:
+        return {**result, "error": (process.stderr.strip().splitlines() or ["no output"])[-1]}
+    return {**result, **json.loads(lines[-1])}
+
+
+def main():
+    args = parse_args()
+    if args.child:
+        print(json.dumps(asyncio.run(measure(args))))
+        return
+    
+    env = os.environ.copy()
+    env["SUMMARY_CACHE_ENABLED"] = "false"
+    env["JOBS_DB_PATH"] = ":memory:"
+    if not args.real:
+        from benchmarks.tiny_models import create_tiny_model
+        size = f"{args.d_model}x{args.layers}"
+        for language, seed in (("en", 0), ("th", 1)):
+            env[f"MODEL_NAME_{language.upper()}"] = create_tiny_model(
+                os.path.join(args.models_dir, f"tiny-{language}-{size}"), d_model=args.d_model, layers=args.layers, seed=seed
+            )
+    
+    from app.services.cpu import available_cores
+    cores = len(available_cores())
+    
+    results = []
+    for workers, threads, affinity in itertools.product(
+        _values(args.workers),
+        _values(args.threads),
+        [mode.strip() == "on" for mode in args.affinity.split(",")]
+    ):
+        total = workers * (threads or max(1, cores // workers))
+        if args.skip_oversubscribed and total > cores:
+            continue
+        result = run_mix(args, env, workers, threads, affinity)
+        print(
+            f"workers={workers} threads={threads} affinity={'on' if affinity else 'off'}: "
+            f"{result.get('docs_per_s', result.get('error'))}",
+            file=sys.stderr
+        )
+        results.append(result)
+    
+    measured = [result for result in results if "docs_per_s" in result]
+    best = max(measured, key=lambda result: result["docs_per_s"], default=None)
+    write_report({
+        "benchmark": "threads",
+        "environment": environment(),
+        "cores": cores,
+        "executor": args.executor,
+        "models": {"en": env.get("MODEL_NAME_EN"), "th": env.get("MODEL_NAME_TH")},
+        "requests": args.requests,
+        "batch_size": args.batch_size,
+        "results": results,
+        "best": best,
+        "recommended_env": {
+            "INFERENCE_EXECUTOR": args.executor,
+            "INFERENCE_WORKERS": best["workers"],
+            "TORCH_NUM_THREADS": best["torch_num_threads"],
+            "INFERENCE_CPU_AFFINITY": best["affinity"]
+        } if best else None
+    }, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Shared Benchmark Helpers
+Synthetic corpus, latency percentiles, memory readings and JSON reports
+"""
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+EN_SENTENCES = [
+    "Artificial intelligence has changed how modern software is built and operated.",
+    "Machine learning lets computers learn patterns from data without explicit rules.",
+    "Deep learning models reached new records in image recognition and speech processing.",
+    "The city council approved a new budget for public transport and road repairs.",
+    "Researchers found that regular exercise improves sleep quality in older adults.",
+    "The company reported higher quarterly revenue driven by strong cloud sales.",
+    "Heavy rain caused flooding in several districts and closed two major highways.",
+    "Scientists observed a distant galaxy that formed shortly after the big bang.",
+    "The new policy aims to reduce carbon emissions by half before the end of the decade.",
+    "Local farmers adopted drip irrigation to cope with the longest drought in years.",
+    "The football team won the championship after a dramatic penalty shoot-out.",
+    "Engineers tested a battery that charges fully in less than ten minutes.",
+    "The museum opened an exhibition of ancient pottery from the northern provinces.",
+    "Economists expect inflation to ease as energy prices continue to fall.",
+    "A new vaccine showed strong protection in a large clinical trial.",
+    "The startup raised funding to expand its delivery service to three new cities."
+]
+
+TH_SENTENCES = [
+    "ปัญญาประดิษฐ์ได้เปลี่ยนแปลงวิธีการพัฒนาซอฟต์แวร์สมัยใหม่อย่างมาก",
+    "การเรียนรู้ของเครื่องช่วยให้คอมพิวเตอร์เรียนรู้รูปแบบจากข้อมูลได้เอง",
+    "ทะเลบัวแดงที่หนองหารจังหวัดอุดรธานีเป็นแหล่งท่องเที่ยวที่มีชื่อเสียง",
+    "ดอกบัวสีแดงจะบานสะพรั่งเต็มผืนน้ำในช่วงเดือนธันวาคมถึงกุมภาพันธ์",
+    "รัฐบาลประกาศมาตรการใหม่เพื่อกระตุ้นเศรษฐกิจและการท่องเที่ยวภายในประเทศ",
+    "ฝนตกหนักทำให้เกิดน้ำท่วมในหลายพื้นที่และการจราจรติดขัดอย่างหนัก",
+    "นักวิจัยพบว่าการออกกำลังกายสม่ำเสมอช่วยให้นอนหลับได้ดีขึ้น",
+    "เกษตรกรในภาคเหนือหันมาใช้ระบบน้ำหยดเพื่อรับมือกับภัยแล้ง",
+    "บริษัทรายงานผลประกอบการที่เพิ่มขึ้นจากยอดขายบริการคลาวด์",
+    "พิพิธภัณฑ์เปิดนิทรรศการเครื่องปั้นดินเผาโบราณจากภาคอีสาน",
+    "ทีมฟุตบอลคว้าแชมป์หลังจากการดวลจุดโทษที่ตื่นเต้นเร้าใจ",
+    "วัคซีนชนิดใหม่แสดงประสิทธิภาพในการป้องกันโรคได้ดีในการทดลองทางคลินิก"
+]
+
+
+def make_corpus(
+    count: int,
+    seed: int = 0,
+    languages: tuple[str, ...] = ("en", "th"),
+    min_sentences: int = 3,
+    max_sentences: int = 12
+) -> list[dict]:
+    """
+    Build a reproducible set of synthetic documents
+    
+    Every document gets a unique numbered prefix so the summary cache
+    never short-circuits a benchmark run.
+    
+    Args:
+        count: Number of documents
+        seed: Random seed
+        languages: Languages to alternate between
+        min_sentences: Fewest sentences per document
+        max_sentences: Most sentences per document
+    
+    Returns:
+        List of {"text", "language"} dictionaries
+    """
+    rng = random.Random(seed)
+    corpus = []
+    for index in range(count):
+        language = languages[index % len(languages)]
+        pool = TH_SENTENCES if language == "th" else EN_SENTENCES
+        sentences = rng.choices(pool, k=rng.randint(min_sentences, max_sentences))
+        corpus.append({"text": f"{index}. " + " ".join(sentences), "language": language})
+    return corpus
+
+
+def percentiles(latencies: list[float]) -> dict:
+    """p50/p95/p99/mean/max of latencies given in seconds, reported in milliseconds"""
+    if not latencies:
+        return {"p50": None, "p95": None, "p99": None, "mean": None, "max": None}
+    ordered = sorted(latencies)
+    
+    def pick(q: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 2)
+    
+    return {
+        "p50": pick(0.50),
+        "p95": pick(0.95),
+        "p99": pick(0.99),
+        "mean": round(sum(ordered) / len(ordered) * 1000, 2),
+        "max": round(ordered[-1] * 1000, 2)
+    }
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MiB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes on Linux
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def environment() -> dict:
+    """Machine and code version the numbers were measured on"""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "python": sys.version.split()[0],
+        "cpus": os.cpu_count(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z")
+    }
+
+
+def write_report(report: dict, output: Optional[str] = None):
+    """Print the report as JSON and optionally save it to a file"""
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    print(text)
+    if output:
+        Path(output).parent.mkdir(parents=True, exist_ok=True)
+        Path(output).write_text(text + "\n", encoding="utf-8")
@@ -3,7 +3,8 @@ Streamlit Frontend for FastAPI Summarize
 """
 import streamlit as st
 import requests
-from typing import Optional
+from typing import Callable, Optional
+import json
 import time
 
 # Configuration
@@ -423,21 +424,45 @@ def check_api_health() -> bool:
         return False
 
 
-def summarize_text(text: str, max_length: int, min_length: int, language: str = None) -> Optional[dict]:
-    """Call summarization API"""
+def summarize_text(
+    text: str,
+    max_length: int,
+    min_length: int,
+    language: str = None,
+    on_token: Optional[Callable[[str], None]] = None
+) -> Optional[dict]:
+    """Call streaming summarization API (Server-Sent Events)"""
     try:
         response = requests.post(
-            f"{API_BASE_URL}{API_V1_PREFIX}/summarize/",
+            f"{API_BASE_URL}{API_V1_PREFIX}/summarize/stream",
             json={
                 "text": text,
                 "max_length": max_length,
                 "min_length": min_length,
                 "language": language
             },
-            timeout=30
+            stream=True,
+            timeout=(5, 120)  # (connect, time between streamed events)
         )
         response.raise_for_status()
-        return response.json()
+        
+        partial_summary = ""
+        event = None
+        for line in response.iter_lines(decode_unicode=True):
+            if line.startswith("event:"):
+                event = line[len("event:"):].strip()
+            elif line.startswith("data:"):
+                data = json.loads(line[len("data:"):])
+                if event == "token":
+                    partial_summary += data["text"]
+                    if on_token:
+                        on_token(partial_summary)
+                elif event == "done":
+                    return data
+                elif event == "error":
+                    st.error(f"❌ Error: {data['detail']}")
+                    return None
+        return None
     except requests.exceptions.Timeout:
         st.error("⏱️ Request timeout - โมเดลอาจกำลังโหลด กรุณารอสักครู่แล้วลองใหม่")
         return None
@@ -567,7 +592,13 @@ with col2:
         else:
             with st.spinner("🤖 กำลังสรุปข้อความ... รอแป๊บเดียวเด้อ!"):
                 start_time = time.time()
-                result = summarize_text(input_text, max_length, min_length, selected_language)
+                result = summarize_text(
+                    input_text,
+                    max_length,
+                    min_length,
+                    selected_language,
+                    on_token=lambda partial: summary_placeholder.info(partial)
+                )
                 elapsed_time = time.time() - start_time
                 
                 if result:
@@ -5,11 +5,19 @@ Main entry point
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+import asyncio
 import logging
 
 from app.core.config import settings
 from app.api.v1.router import api_router
-from app.services.summarizer import summarizer_service
+from app.api.v1.endpoints import metrics as metrics_endpoint
+from app.services.model_registry import model_registry
+from app.services.batcher import batch_scheduler
+from app.services.executor import inference_executor
+from app.services.jobs import job_manager
+from app.services.model_host import authkey
+from app.services.routing import model_router
+from app.services.warmup import startup_warmup
 
 # Configure logging
 logging.basicConfig(
@@ -24,15 +32,34 @@ async def lifespan(app: FastAPI):
     """Application lifespan events"""
     # Startup
     logger.info("Starting FastAPI Summarize Application...")
-    logger.info(f"Loading models: EN={settings.MODEL_NAME_EN}, TH={settings.MODEL_NAME_TH}")
+    logger.info(f"Models: EN={settings.MODEL_NAME_EN}, TH={settings.MODEL_NAME_TH}")
+    if model_router.rules:
+        logger.info(f"Model routes: {len(model_router.rules)} rules over {', '.join(model_router.model_names)}")
+    if settings.INFERENCE_EXECUTOR == "remote":
+        # Fail at startup rather than on every request
+        authkey()
     
-    # Pre-load model (optional - will load on first request if not loaded)
-    # summarizer_service  # Uncomment to pre-load
+    # Load and warm up models in the background; /ready reports when it is done
+    startup_warmup.start()
+    
+    # Unload models that stay idle longer than MODEL_IDLE_TIMEOUT_S
+    eviction_task = None
+    if settings.MODEL_IDLE_TIMEOUT_S > 0:
+        eviction_task = asyncio.create_task(model_registry.run_eviction_loop())
+    
+    # Background job workers (resume jobs left unfinished by the previous run)
+    await job_manager.start()
     
     yield
     
     # Shutdown
     logger.info("Shutting down FastAPI Summarize Application...")
+    await startup_warmup.stop()
+    if eviction_task is not None:
+        eviction_task.cancel()
+    await job_manager.stop()
+    await batch_scheduler.shutdown()
+    inference_executor.shutdown()
 
 
 # Create FastAPI app
@@ -58,6 +85,9 @@ app.add_middleware(
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_PREFIX)
 
+# Prometheus scrapes /metrics at the root
+app.include_router(metrics_endpoint.router)
+
 # Root endpoint
 @app.get("/")
 async def root():
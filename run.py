@@ -2,18 +2,39 @@
 Unified Runner for Backend and Frontend
 Run both API server and Streamlit frontend
 """
+import secrets
 import subprocess
 import sys
 import time
 import os
 from pathlib import Path
 
-def run_backend():
+def model_host_env() -> dict:
+    """Environment for the model host and backend, with a random MODEL_HOST_AUTHKEY unless one is configured"""
+    from app.core.config import settings
+    
+    env = os.environ.copy()
+    env["MODEL_HOST_AUTHKEY"] = settings.MODEL_HOST_AUTHKEY or secrets.token_hex(32)
+    return env
+
+def run_model_host(env: dict):
+    """Run the model host that serves every backend worker (INFERENCE_EXECUTOR=remote)"""
+    print("🧠 Starting model host...")
+    return subprocess.Popen(
+        [sys.executable, "-m", "app.services.model_host"],
+        cwd=Path(__file__).parent,
+        env=env
+    )
+
+def run_backend(workers: int = 1, env: dict | None = None):
     """Run FastAPI backend"""
     print("🚀 Starting FastAPI backend...")
+    # --reload cannot be combined with several workers
+    options = ["--workers", str(workers)] if workers > 1 else ["--reload"]
     return subprocess.Popen(
-        [sys.executable, "-m", "uvicorn", "main:app", "--reload", "--port", "8000"],
-        cwd=Path(__file__).parent
+        [sys.executable, "-m", "uvicorn", "main:app", *options, "--port", "8000"],
+        cwd=Path(__file__).parent,
+        env=env
     )
 
 def run_frontend():
@@ -47,12 +68,22 @@ def main():
     print("=" * 60)
     print()
     
+    from app.core.config import settings
+    
+    model_host_process = None
     backend_process = None
     frontend_process = None
     
     try:
+        # Start the shared model host first so backend workers can connect to it
+        backend_env = None
+        if settings.INFERENCE_EXECUTOR == "remote":
+            # Both sides get the same key; a generated one lives only in the children's environment
+            backend_env = model_host_env()
+            model_host_process = run_model_host(backend_env)
+        
         # Start backend
-        backend_process = run_backend()
+        backend_process = run_backend(settings.WEB_WORKERS, backend_env)
         
         # Start frontend
         frontend_process = run_frontend()
@@ -91,6 +122,10 @@ def main():
             frontend_process.terminate()
             print("   ✓ Frontend stopped")
         
+        if model_host_process:
+            model_host_process.terminate()
+            print("   ✓ Model host stopped")
+        
         print("\n👋 Goodbye!\n")
         
     except Exception as e:
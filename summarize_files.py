@@ -0,0 +1,433 @@
+"""
+Offline Bulk Summarizer
+Summarize JSONL, CSV or a directory of .txt files straight through SummarizerService, without the API
+
+Usage:
+    python summarize_files.py corpus.jsonl --output summaries.jsonl --workers 4
+    python summarize_files.py articles.csv --output summaries.parquet --text-field body
+    python summarize_files.py docs/ --output summaries.jsonl --long-document
+
+Records are read as a stream, detected, grouped by language, generation
+params and length in windows of --window records, and summarized by
+--workers processes that each hold their own models. Results are appended
+as they finish; running the same command again after a crash or Ctrl+C
+skips every id already in the output and continues with the rest.
+"""
+import argparse
+import csv
+import os
+import signal
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Optional
+
+import orjson
+
+LANGUAGES = ("en", "th")
+PARQUET_ROWS_PER_GROUP = 10_000
+
+
+@dataclass
+class Record:
+    """One input document (or a line that could not be read, with error set)"""
+    id: str
+    text: str = ""
+    language: Optional[str] = None
+    max_length: Optional[int] = None
+    min_length: Optional[int] = None
+    profile: Optional[str] = None
+    error: Optional[str] = None
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Summarize a corpus offline, without the HTTP API")
+    parser.add_argument("input", help="A .jsonl or .csv file, or a directory of .txt files")
+    parser.add_argument("--output", "-o", required=True, help="Result file, .jsonl or .parquet")
+    parser.add_argument("--format", choices=("jsonl", "csv", "txt"), help="Input format (default: from the path)")
+    parser.add_argument("--text-field", default="text", help="JSONL/CSV field holding the text")
+    parser.add_argument("--id-field", default="id", help="JSONL/CSV field holding the record id (default: line number)")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes, each loads its own models")
+    parser.add_argument("--threads", type=int, default=0, help="Torch threads per worker (default: cores / workers)")
+    parser.add_argument("--batch-size", type=int, help="Texts per forward pass (default: BATCH_SUB_BATCH_SIZE)")
+    parser.add_argument("--window", type=int, default=1024, help="Records grouped together before batching")
+    parser.add_argument("--max-length", type=int, help="Summary length when a record has none")
+    parser.add_argument("--min-length", type=int, help="Minimum summary length when a record has none")
+    parser.add_argument("--profile", help="Generation profile when a record has none")
+    parser.add_argument("--long-document", action="store_true", help="Map-reduce texts longer than the model input")
+    parser.add_argument("--overwrite", action="store_true", help="Start over instead of resuming")
+    return parser.parse_args()
+
+
+def _optional_int(value) -> Optional[int]:
+    if value is None or value == "":
+        return None
+    return int(value)
+
+
+def _record(record_id, data: dict, text_field: str) -> Record:
+    """Build a record from a JSONL object or CSV row"""
+    record_id = str(record_id)
+    text = data.get(text_field)
+    if not isinstance(text, str):
+        return Record(record_id, error=f"Field '{text_field}' is missing or not a string")
+    try:
+        return Record(
+            record_id,
+            text=text,
+            language=data.get("language") or None,
+            max_length=_optional_int(data.get("max_length")),
+            min_length=_optional_int(data.get("min_length")),
+            profile=data.get("profile") or None
+        )
+    except ValueError as e:
+        return Record(record_id, error=f"Invalid length: {e}")
+
+
+def read_jsonl(path: Path, text_field: str, id_field: str) -> Iterator[Record]:
+    with open(path, "rb") as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                data = orjson.loads(line)
+            except orjson.JSONDecodeError as e:
+                yield Record(str(line_number), error=f"Invalid JSON: {e}")
+                continue
+            if not isinstance(data, dict):
+                yield Record(str(line_number), error="Each line must be a JSON object")
+                continue
+            yield _record(data.get(id_field, line_number), data, text_field)
+
+
+def read_csv(path: Path, text_field: str, id_field: str) -> Iterator[Record]:
+    # Long documents easily exceed the default 128 kB field limit
+    csv.field_size_limit(2 ** 31 - 1)
+    with open(path, newline="", encoding="utf-8") as f:
+        for row_number, row in enumerate(csv.DictReader(f), start=1):
+            yield _record(row.get(id_field) or row_number, row, text_field)
+
+
+def read_txt_directory(path: Path) -> Iterator[Record]:
+    for file in sorted(path.rglob("*.txt")):
+        record_id = file.relative_to(path).as_posix()
+        try:
+            yield Record(record_id, text=file.read_text(encoding="utf-8"))
+        except (OSError, UnicodeDecodeError) as e:
+            yield Record(record_id, error=f"Cannot read file: {e}")
+
+
+def read_records(path: Path, input_format: Optional[str], text_field: str, id_field: str) -> Iterator[Record]:
+    """Stream the records of a corpus"""
+    if input_format is None:
+        input_format = "txt" if path.is_dir() else path.suffix.lower().lstrip(".")
+    if input_format in ("jsonl", "ndjson"):
+        return read_jsonl(path, text_field, id_field)
+    if input_format == "csv":
+        return read_csv(path, text_field, id_field)
+    if input_format == "txt":
+        return read_txt_directory(path)
+    raise ValueError(f"Cannot tell the input format of {path}, pass --format")
+
+
+def load_checkpoint(path: Path) -> set[str]:
+    """
+    Ids already written to a results file
+    
+    A line cut short by a killed run is removed so appending continues
+    on a clean line boundary.
+    """
+    done: set[str] = set()
+    if not path.exists():
+        return done
+    valid_bytes = 0
+    with open(path, "rb") as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                done.add(str(orjson.loads(line)["id"]))
+            except (orjson.JSONDecodeError, KeyError, TypeError):
+                break
+            valid_bytes += len(line)
+    if valid_bytes < path.stat().st_size:
+        print(f"⚠️  Dropping an incomplete last line of {path}")
+        with open(path, "r+b") as f:
+            f.truncate(valid_bytes)
+    return done
+
+
+def write_parquet(results_path: Path, output: Path):
+    """Convert the finished JSONL results into a Parquet file"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    
+    schema = pa.schema([
+        ("id", pa.string()),
+        ("language", pa.string()),
+        ("model", pa.string()),
+        ("summary", pa.string()),
+        ("profile", pa.string()),
+        ("input_tokens", pa.int64()),
+        ("output_tokens", pa.int64()),
+        ("truncated", pa.bool_()),
+        ("pruned_sentences", pa.int64()),
+        ("pruned_tokens", pa.int64()),
+        ("chunks", pa.int64()),
+        ("levels", pa.int64()),
+        ("error", pa.string())
+    ])
+    partial = output.with_name(output.name + ".tmp")
+    with open(results_path, "rb") as f, pq.ParquetWriter(partial, schema) as writer:
+        rows = []
+        for line in f:
+            row = orjson.loads(line)
+            rows.append({name: row.get(name) for name in schema.names})
+            if len(rows) >= PARQUET_ROWS_PER_GROUP:
+                writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+                rows = []
+        if rows:
+            writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+    os.replace(partial, output)
+
+
+def _init_worker(threads: int):
+    """Worker process setup - split the cores between workers before any model loads"""
+    from app.core.config import settings
+    # Ctrl+C is handled by the parent, which cancels the queued batches
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    if threads > 0:
+        settings.TORCH_NUM_THREADS = threads
+
+
+def summarize_batch(
+    texts: list[str],
+    max_length: int,
+    min_length: int,
+    language: str,
+    profile: str,
+    long_document: bool
+) -> list[dict]:
+    """
+    Summarize one sub-batch inside a worker
+    
+    Returns:
+        One result per text; a text that fails gets {"error": ...} instead
+        of failing its neighbours
+    """
+    from app.services.summarizer import summarizer_service
+    
+    results: list[Optional[dict]] = [None] * len(texts)
+    short = []
+    for index, text in enumerate(texts):
+        if long_document and summarizer_service.needs_long_document_mode(text, language):
+            try:
+                results[index] = summarizer_service.summarize_long(text, max_length, min_length, language, profile)
+            except Exception as e:
+                results[index] = {"error": f"Error summarizing text: {e}"}
+        else:
+            short.append(index)
+    
+    if short:
+        try:
+            outputs = summarizer_service.summarize_many(
+                [texts[index] for index in short], max_length, min_length, language, profile
+            )
+        except Exception:
+            # Retry one by one so a single bad text only fails itself
+            outputs = []
+            for index in short:
+                try:
+                    outputs.extend(summarizer_service.summarize_many(
+                        [texts[index]], max_length, min_length, language, profile
+                    ))
+                except Exception as e:
+                    outputs.append({"error": f"Error summarizing text: {e}"})
+        for index, output in zip(short, outputs):
+            results[index] = output
+    return results
+
+
+def windows(records: Iterator[Record], size: int) -> Iterator[list[Record]]:
+    window = []
+    for record in records:
+        window.append(record)
+        if len(window) >= size:
+            yield window
+            window = []
+    if window:
+        yield window
+
+
+class Progress:
+    """Prints throughput every few seconds"""
+    
+    def __init__(self, skipped: int, interval: float = 10.0):
+        self.skipped = skipped
+        self.interval = interval
+        self.done = 0
+        self.failed = 0
+        self.started = time.monotonic()
+        self._last = self.started
+    
+    def add(self, done: int, failed: int):
+        self.done += done
+        self.failed += failed
+        now = time.monotonic()
+        if now - self._last >= self.interval:
+            self._last = now
+            self.report()
+    
+    def report(self):
+        elapsed = time.monotonic() - self.started
+        rate = self.done / elapsed if elapsed > 0 else 0.0
+        print(f"   📝 {self.done} summarized ({self.failed} failed), {rate:.1f} records/s")
+
+
+def main():
+    args = parse_args()
+    
+    input_path = Path(args.input)
+    output = Path(args.output)
+    parquet = output.suffix.lower() == ".parquet"
+    if parquet:
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            print("❌ Parquet output needs pyarrow (pip install pyarrow), or write .jsonl instead")
+            sys.exit(1)
+        # Parquet cannot be appended to, so results collect in a JSONL checkpoint first
+        results_path = output.with_name(output.name + ".partial.jsonl")
+        if output.exists() and not results_path.exists() and not args.overwrite:
+            print(f"✅ {output} is already complete, pass --overwrite to redo it")
+            return
+    else:
+        results_path = output
+    
+    if args.overwrite:
+        results_path.unlink(missing_ok=True)
+    done_ids = load_checkpoint(results_path)
+    
+    from app.core.config import settings
+    from app.services.batcher import plan_sub_batches
+    from app.services.language import language_detector
+    
+    workers = max(1, args.workers)
+    threads = args.threads or settings.TORCH_NUM_THREADS or max(1, (os.cpu_count() or 1) // workers)
+    batch_size = args.batch_size or settings.BATCH_SUB_BATCH_SIZE
+    default_max_length = args.max_length or settings.MAX_OUTPUT_LENGTH
+    default_min_length = args.min_length or settings.MIN_OUTPUT_LENGTH
+    default_profile = args.profile or settings.GENERATION_PROFILE
+    
+    print("=" * 60)
+    print("📚 Offline summarization")
+    print(f"   • Input:   {input_path}")
+    print(f"   • Output:  {output}")
+    print(f"   • Workers: {workers} x {threads} threads, batches of {batch_size}")
+    if done_ids:
+        print(f"   • Resuming, {len(done_ids)} records already done")
+    print("=" * 60)
+    
+    progress = Progress(skipped=len(done_ids))
+    records = (record for record in read_records(input_path, args.format, args.text_field, args.id_field)
+               if record.id not in done_ids)
+    
+    # spawn avoids forking a process that already holds torch threads
+    import multiprocessing
+    pool = ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(threads,)
+    )
+    pending: dict = {}
+    max_pending = workers * 2  # keep every worker busy without reading the whole corpus
+    
+    with open(results_path, "ab") as results_file:
+        
+        def write(rows: list[dict]):
+            results_file.write(b"".join(orjson.dumps(row) + b"\n" for row in rows))
+            results_file.flush()
+            progress.add(len(rows), sum(1 for row in rows if row.get("error")))
+        
+        def collect(return_when):
+            finished, _ = wait(pending, return_when=return_when)
+            for future in finished:
+                batch = pending.pop(future)
+                try:
+                    outputs = future.result()
+                except Exception as e:
+                    outputs = [{"error": f"Error summarizing text: {e}"}] * len(batch)
+                write([
+                    {"id": record.id, "language": language, **output}
+                    for (record, language), output in zip(batch, outputs)
+                ])
+        
+        try:
+            for window in windows(records, max(1, args.window)):
+                invalid, valid, languages = [], [], []
+                for record in window:
+                    error = record.error
+                    language = record.language
+                    if error is None and not record.text.strip():
+                        error = "Text is empty"
+                    if error is None:
+                        language = language or language_detector.detect(record.text)
+                        if language not in LANGUAGES:
+                            error = f"Unsupported language: {language}"
+                    if error is not None:
+                        invalid.append({"id": record.id, "language": language, "error": error})
+                    else:
+                        valid.append(record)
+                        languages.append(language)
+                if invalid:
+                    write(invalid)
+                
+                params = [
+                    (
+                        record.max_length or default_max_length,
+                        record.min_length or default_min_length,
+                        record.profile or default_profile
+                    )
+                    for record in valid
+                ]
+                plan = plan_sub_batches(
+                    [record.text for record in valid], languages, params, batch_size, settings.BATCH_LENGTH_BUCKETS
+                )
+                for sub_batch in plan:
+                    while len(pending) >= max_pending:
+                        collect(FIRST_COMPLETED)
+                    future = pool.submit(
+                        summarize_batch,
+                        [valid[index].text for index in sub_batch.indices],
+                        sub_batch.max_length,
+                        min(sub_batch.min_length, sub_batch.max_length),
+                        sub_batch.language,
+                        sub_batch.profile,
+                        args.long_document
+                    )
+                    pending[future] = [(valid[index], sub_batch.language) for index in sub_batch.indices]
+            
+            while pending:
+                collect(FIRST_COMPLETED)
+        except KeyboardInterrupt:
+            pool.shutdown(wait=False, cancel_futures=True)
+            print(f"\n🛑 Stopped after {progress.done} records, run the same command again to resume")
+            sys.exit(130)
+    
+    pool.shutdown()
+    progress.report()
+    
+    if parquet:
+        write_parquet(results_path, output)
+        results_path.unlink()
+    
+    elapsed = time.monotonic() - progress.started
+    print(f"✅ Done in {elapsed:.1f}s: {progress.done} summarized ({progress.failed} failed), "
+          f"{progress.skipped} skipped from an earlier run")
+
+
+if __name__ == "__main__":
+    main()